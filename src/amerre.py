@@ -15,17 +15,27 @@ if hasattr(sys, 'frozen'):
 else:
     root_dir = os.path.dirname(os.path.abspath(__file__))
 
-from app.startup import Startup
+from app.utils.startupprofiler import StartupProfiler
+
+# Set up before the imports to record them
+startup_profiler = StartupProfiler().setup(enabled='--profile-startup' in sys.argv)
+
+with startup_profiler.phase('imports'):
+    from app.startup import Startup
 
 stopwatch = Stopwatch() # Start a stopwatch
 stopwatch.start()
 
+exit_code = 0
+
 try:
-    Startup().setup(root_dir).start()
+    exit_code = Startup().setup(root_dir, startup_profiler).start() or 0
 except KeyboardInterrupt as e:
     logging.debug(e)
 
 stopwatch.stop()
 
 logging.info(f'Running time: {stopwatch.elapsed}')
-logging.info('Exit')
\ No newline at end of file
+logging.info('Exit')
+
+sys.exit(exit_code)
\ No newline at end of file
@@ -0,0 +1,421 @@
+""" Headless benchmark """
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+
+import arcade
+import pyglet
+
+from app.constants.gameinfo import MAPS, DEFAULT_LOCALE
+from app.constants.input.keyboard import KEY_LEFT, KEY_RIGHT, KEY_JUMP, KEY_SPRINT
+from app.constants.settings import SETTINGS_DEFAULT_SIZE, SETTINGS_DEFAULT_UPDATE_RATE
+from app.gamewindow import GameWindow
+from app.utils.audiovolumes import AudioVolumes
+from app.utils.inputlog import InputLog
+from app.utils.localeservice import LocaleService
+from app.utils.string import label_value
+from app.utils.subtitles import Subtitles
+from app.views.game import Game
+
+DEFAULT_TICKS = 3600
+
+MOVE_LEFT = 'left'
+MOVE_RIGHT = 'right'
+
+TIMING_TICK = 'tick'
+
+# Wait for the player to land, then walk right and jump from time to time
+DEFAULT_SCRIPT = [
+    {'ticks': 60},
+    {'ticks': 1200, 'move': MOVE_RIGHT, 'jump_every': 90},
+    {'ticks': 600, 'move': MOVE_RIGHT, 'sprint': True, 'jump_every': 45},
+    {'ticks': 300, 'move': MOVE_LEFT, 'jump_every': 120},
+    {'ticks': 1500, 'move': MOVE_RIGHT, 'jump_every': 60},
+]
+
+
+class SilentPlayer:
+    """
+    Stand-in for a media player which plays nothing
+    Voiceovers are timed in ticks by the level, so it never ends on its own
+    """
+
+    def __init__(self, loop: bool = False, volume: float = 1.0):
+        """ Constructor """
+
+        self.playing = True
+        self.loop = loop
+        self.volume = volume
+        self._start = pyglet.clock.get_default().time()
+
+    @property
+    def time(self) -> float:
+        """ Seconds since playback started """
+
+        return pyglet.clock.get_default().time() - self._start
+
+    def play(self) -> None:
+        """ Resume playback """
+
+        return
+
+    def pause(self) -> None:
+        """ Pause playback """
+
+        return
+
+    def delete(self) -> None:
+        """ Delete player """
+
+        self.playing = False
+
+
+class SilentSound:
+    """ Stand-in for a sound which is never decoded """
+
+    def __init__(self, path: str, streaming: bool = False):
+        """ Constructor """
+
+        self.path = path
+        self.streaming = streaming
+
+    def play(self, volume: float = 1.0, pan: float = 0.0, loop: bool = False, speed: float = 1.0):
+        """ Play sound """
+
+        return SilentPlayer(loop=loop, volume=volume)
+
+
+class BenchmarkWindow(GameWindow):
+    """ Game window without intro, controllers and views """
+
+    def setup(
+            self,
+            root_dir: str,
+            audio_volumes: AudioVolumes,
+            show_intro: bool = False,
+            show_fps: bool = False,
+            locale: LocaleService | None = None
+    ):
+        """ Set up the benchmark window """
+
+        # The benchmark loop dispatches the updates of every tick itself
+        pyglet.clock.unschedule(self._dispatch_updates)
+
+        self._root_dir = root_dir
+        self._audio_volumes = audio_volumes
+        self._sounds.policy.setup(streaming=audio_volumes.streaming)
+        self._locale = locale or LocaleService().setup(root_dir, DEFAULT_LOCALE)
+        self.setup_fonts()
+        self._subtitles = Subtitles().setup(root_dir, self._locale.languages)
+
+
+class Benchmark:
+    """ Runs a level headless with scripted input and reports timings """
+
+    def __init__(self):
+        """ Constructor """
+
+        self.args = None
+        self._root_dir = None
+        self._locale = None
+        self._time = 0.0
+
+    def setup(self, root_dir: str):
+        """ Setup benchmark """
+
+        self._root_dir = root_dir
+
+        logging.basicConfig(
+            level=logging.WARNING,
+            format="%(asctime)s [%(levelname)s] %(message)s",
+            handlers=[logging.StreamHandler(stream=sys.stderr)]
+        )
+
+        self._locale = LocaleService().setup(root_dir, os.environ.get('LANG', DEFAULT_LOCALE)).install()
+
+        return self
+
+    @staticmethod
+    def stub_audio() -> None:
+        """ Replace sound loading by silent stand-ins """
+
+        arcade.load_sound = SilentSound
+        arcade.stop_sound = lambda player: player.delete()
+
+    def time(self) -> float:
+        """ Simulated time """
+
+        return self._time
+
+    @staticmethod
+    def load_script(path: str | None) -> list:
+        """
+        Load input script from JSON file
+        @raise ValueError: If the script doesn't advance by at least one tick
+        """
+
+        if not path:
+            return DEFAULT_SCRIPT
+
+        with open(path, 'r', encoding='utf-8') as f:
+            script = json.load(f)
+
+        if not isinstance(script, list) or not script:
+            raise ValueError('Script has no steps')
+
+        if any(not isinstance(step, dict) or step.get('ticks', 1) < 1 for step in script):
+            raise ValueError('Every step needs at least one tick')
+
+        return script
+
+    @staticmethod
+    def expand_script(script: list, ticks: int):
+        """
+        Expand the script into one input frame per tick
+        @return: Generator of (move, jump, sprint) tuples
+        """
+
+        tick = 0
+
+        while tick < ticks:
+            start = tick
+
+            for step in script:
+                jump_every = step.get('jump_every', 0)
+
+                for i in range(step.get('ticks', 1)):
+                    if tick >= ticks:
+                        return
+
+                    jump = step.get('jump', False) and i == 0
+
+                    if jump_every:
+                        jump = jump or i % jump_every == jump_every - 1
+
+                    yield step.get('move'), jump, step.get('sprint', False)
+                    tick += 1
+
+            # A script without ticks would never advance
+            if tick == start:
+                return
+
+    @staticmethod
+    def apply_input(view, previous: tuple, current: tuple) -> None:
+        """ Send key events for the changes between two input frames """
+
+        keys_move = {MOVE_LEFT: KEY_LEFT[0], MOVE_RIGHT: KEY_RIGHT[0]}
+        move_previous, _jump, sprint_previous = previous
+        move, jump, sprint = current
+
+        if move != move_previous:
+            if move_previous:
+                view.on_key_release(keys_move[move_previous], 0)
+            if move:
+                view.on_key_press(keys_move[move], 0)
+
+        if sprint != sprint_previous:
+            if sprint:
+                view.on_key_press(KEY_SPRINT[0], 0)
+            else:
+                view.on_key_release(KEY_SPRINT[0], 0)
+
+        if jump:
+            view.on_key_press(KEY_JUMP[0], 0)
+
+    def start(self) -> int:
+        """ Run benchmark """
+
+        args = self.get_args()
+        random.seed(args.seed)
+
+        replay = None
+        script = None
+
+        # A recorded session defines map, rate and length itself
+        if args.replay:
+            replay = InputLog.load(args.replay)
+            args.map = replay.map_name
+            args.update_rate = replay.update_rate
+            args.ticks = len(replay)
+        else:
+            try:
+                script = self.expand_script(self.load_script(args.script), args.ticks)
+            except (OSError, ValueError) as e:
+                logging.error(label_value('Script invalid', e))
+                return 1
+
+        width, height = map(int, args.size.lower().split('x'))
+        update_rate = 1 / args.update_rate
+
+        self.stub_audio()
+        pyglet.clock.set_default(pyglet.clock.Clock(time_function=self.time))
+
+        window = BenchmarkWindow(
+            width=width,
+            height=height,
+            fullscreen=False,
+            visible=False,
+            vsync=False,
+            antialiasing=False,
+            update_rate=update_rate,
+            fixed_rate=update_rate
+        )
+        window.setup(
+            self._root_dir,
+            audio_volumes=AudioVolumes(
+                volume_music=0,
+                volume_sound=0,
+                volume_master=0,
+                volume_speech=0,
+                streaming=False
+            ),
+            locale=self._locale
+        )
+
+        view = Game()
+        view.setup(self._root_dir)
+        view.setup_level(args.map, replay=replay)
+        window.show_view(view)
+
+        timings = window.timings
+        timings.max_samples = args.ticks
+        timings.clear()
+        timings.enabled = True
+
+        completed = False
+        ticks = 0
+        previous = (None, False, False)
+
+        for _tick in range(args.ticks):
+            if not replay:
+                current = next(script)
+                self.apply_input(view, previous, current)
+                previous = current
+
+            with timings.measure(TIMING_TICK):
+                self._time += update_rate
+                pyglet.clock.tick()
+                view.on_update(update_rate)
+                view.on_fixed_update(update_rate)
+
+                if args.draw:
+                    view.on_draw()
+
+            ticks += 1
+
+            if window.current_view is not view:
+                completed = True
+                break
+
+        report = {
+            'map': args.map,
+            'replay': args.replay,
+            'ticks': ticks,
+            'update_rate': args.update_rate,
+            'size': [width, height],
+            'draw': args.draw,
+            'completed': completed,
+            'renderer': window.ctx.info.RENDERER,
+            'timings': timings.report()
+        }
+
+        # A replay has to reach the recorded positions and complete at the same tick
+        if replay:
+            report['deterministic'] = replay.matches(view.input_log)
+            report['completed_tick'] = view.input_log.completed_tick
+
+            if not report['deterministic']:
+                logging.error(label_value('Replay diverged', args.replay))
+
+        output = json.dumps(report, indent=2)
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output)
+            logging.warning(label_value('Benchmark saved', args.output))
+        else:
+            print(output)
+
+        window.close()
+
+        return 1 if report.get('deterministic') is False else 0
+
+    @staticmethod
+    def get_args() -> argparse.Namespace:
+        """ Get args """
+
+        parser = argparse.ArgumentParser()
+
+        parser.add_argument(
+            '--map',
+            action='store',
+            type=str,
+            help='The map',
+            choices=MAPS,
+            default=MAPS[0]
+        )
+
+        parser.add_argument(
+            '--ticks',
+            action='store',
+            type=int,
+            help='The number of fixed-rate ticks',
+            default=DEFAULT_TICKS
+        )
+
+        parser.add_argument(
+            '--update-rate',
+            action='store',
+            type=int,
+            help='The update rate',
+            default=SETTINGS_DEFAULT_UPDATE_RATE
+        )
+
+        parser.add_argument(
+            '--size',
+            action='store',
+            default=SETTINGS_DEFAULT_SIZE,
+            help='Size of window'
+        )
+
+        parser.add_argument(
+            '--script',
+            action='store',
+            type=str,
+            help='JSON file with the input script'
+        )
+
+        parser.add_argument(
+            '--draw',
+            action='store_true',
+            default=False,
+            help='Also draw every tick'
+        )
+
+        parser.add_argument(
+            '--seed',
+            action='store',
+            type=int,
+            help='The random seed',
+            default=0
+        )
+
+        parser.add_argument(
+            '--replay',
+            action='store',
+            type=str,
+            help='Replay a recorded input log instead of the script'
+        )
+
+        parser.add_argument(
+            '--output',
+            action='store',
+            type=str,
+            help='Write the JSON report to a file'
+        )
+
+        return parser.parse_args()
@@ -0,0 +1,220 @@
+""" Frame budget check for release builds """
+
+import logging
+
+import pyglet
+from arcade import FACE_LEFT, FACE_RIGHT
+
+from app.benchmark import Benchmark, BenchmarkWindow
+from app.constants.settings import (
+    SETTINGS_DEFAULT_BUDGET_UPDATE,
+    SETTINGS_DEFAULT_BUDGET_DRAW,
+    SETTINGS_BUDGET_SCENARIOS
+)
+from app.utils.audiovolumes import AudioVolumes
+from app.utils.inputlog import InputFrame
+from app.utils.string import label_value
+from app.views.game import Game
+
+# Shader compilation and first uploads are not part of the budget
+BUDGET_WARMUP_TICKS = 60
+
+TIMING_BUDGET_UPDATE = 'budget.update'
+TIMING_BUDGET_DRAW = 'budget.draw'
+
+# Distance to the light where the walkthrough stops walking
+WALKTHROUGH_ARRIVED = 20
+
+# Jump if the player didn't move for this many ticks
+WALKTHROUGH_STUCK_TICKS = 5
+WALKTHROUGH_JUMP_INTERVAL = 50
+
+# Place the player at the light if it wasn't reached after this many ticks
+WALKTHROUGH_PATIENCE = 1800
+
+
+class Walkthrough:
+    """
+    Input frames walking the player to the nearest voiceover light
+    which wasn't triggered yet. Lights which can't be reached by
+    walking and jumping in time are reached by placing the player there.
+    """
+
+    def __init__(self, level):
+        """ Constructor """
+
+        self._level = level
+        self._target = None
+        self._ticks = 0
+        self._stuck = 0
+        self._last_x = None
+        self.placed = 0
+
+    def __iter__(self):
+        """ Iterator """
+
+        return self
+
+    def __next__(self) -> InputFrame:
+        """ Input frame for the next tick """
+
+        level = self._level
+        lights = level.lights
+
+        if not lights or not level.can_walk:
+            return InputFrame()
+
+        player = level.player
+        target = min(lights, key=lambda light: abs(light.center_x - player.center_x))
+
+        if target is not self._target:
+            self._target = target
+            self._ticks = 0
+
+        self._ticks += 1
+
+        if self._ticks > WALKTHROUGH_PATIENCE:
+            logging.warning(label_value('Walkthrough placed player at light', target.position))
+            player.position = target.position
+            player.change_y = 0
+            self._ticks = 0
+            self.placed += 1
+
+        if self._last_x is not None and abs(player.center_x - self._last_x) < 1:
+            self._stuck += 1
+        else:
+            self._stuck = 0
+
+        self._last_x = player.center_x
+
+        dx = target.center_x - player.center_x
+        move = None
+
+        if dx > WALKTHROUGH_ARRIVED:
+            move = FACE_RIGHT
+        elif dx < -WALKTHROUGH_ARRIVED:
+            move = FACE_LEFT
+
+        jump = self._stuck >= WALKTHROUGH_STUCK_TICKS or (
+                target.center_y > player.top and self._ticks % WALKTHROUGH_JUMP_INTERVAL == 0
+        )
+
+        return InputFrame(move, jump, True)
+
+
+class BudgetCheck(Benchmark):
+    """ Runs a walkthrough and checks every tick against the frame budget """
+
+    def run(
+            self,
+            root_dir: str,
+            scenario: str,
+            size: tuple,
+            update_rate: int,
+            budget_update: float = SETTINGS_DEFAULT_BUDGET_UPDATE,
+            budget_draw: float = SETTINGS_DEFAULT_BUDGET_DRAW
+    ) -> int:
+        """
+        Run budget check
+        @param root_dir: Root directory
+        @param scenario: Name of the scenario
+        @param size: Window size
+        @param update_rate: Ticks per second
+        @param budget_update: Milliseconds for update of a tick
+        @param budget_draw: Milliseconds for draw of a tick
+        @return: Exit code, 0 if the budget was kept
+        """
+
+        self._root_dir = root_dir
+        scenario = SETTINGS_BUDGET_SCENARIOS[scenario]
+        width, height = size
+        rate = 1 / update_rate
+
+        self.stub_audio()
+        pyglet.clock.set_default(pyglet.clock.Clock(time_function=self.time))
+
+        window = BenchmarkWindow(
+            width=width,
+            height=height,
+            fullscreen=False,
+            vsync=False,
+            update_rate=rate,
+            fixed_rate=rate
+        )
+        window.setup(
+            self._root_dir,
+            audio_volumes=AudioVolumes(
+                volume_music=0,
+                volume_sound=0,
+                volume_master=0,
+                volume_speech=0,
+                streaming=False
+            )
+        )
+
+        view = Game()
+        view.setup(self._root_dir)
+        view.setup_level(scenario['map'])
+        walkthrough = Walkthrough(view.level)
+        view.simulate(walkthrough)
+        window.show_view(view)
+
+        timings = window.timings
+        timings.max_samples = scenario['max_ticks']
+        timings.clear()
+        timings.enabled = True
+
+        completed = False
+        ticks = 0
+
+        while ticks < scenario['max_ticks']:
+            window.dispatch_events()
+
+            with timings.measure(TIMING_BUDGET_UPDATE):
+                self._time += rate
+                pyglet.clock.tick()
+                view.on_update(rate)
+                view.on_fixed_update(rate)
+
+            with timings.measure(TIMING_BUDGET_DRAW):
+                view.on_draw()
+                window.flip()
+
+            ticks += 1
+
+            if window.current_view is not view:
+                completed = True
+                break
+
+        over = {}
+
+        for name, budget in ((TIMING_BUDGET_UPDATE, budget_update), (TIMING_BUDGET_DRAW, budget_draw)):
+            samples = timings.samples(name)[BUDGET_WARMUP_TICKS:]
+            over[name] = [
+                (BUDGET_WARMUP_TICKS + i, seconds * 1000)
+                for i, seconds in enumerate(samples) if seconds * 1000 > budget
+            ]
+
+            for tick, milliseconds in over[name][:10]:
+                logging.error(f"Tick {tick}: {name} took {milliseconds:.2f} ms, budget is {budget} ms")
+
+        report = timings.report()
+        for name in (TIMING_BUDGET_UPDATE, TIMING_BUDGET_DRAW):
+            logging.warning(label_value(name, report.get(name)))
+
+        logging.warning(label_value('Ticks', ticks))
+        logging.warning(label_value('Lights placed by walkthrough', walkthrough.placed))
+
+        window.close()
+
+        if not completed:
+            logging.error('Scenario was not completed')
+            return 2
+
+        if any(over.values()):
+            logging.error(label_value('Ticks over budget', sum(len(ticks) for ticks in over.values())))
+            return 1
+
+        logging.warning('Budget kept')
+
+        return 0
@@ -0,0 +1,36 @@
+""" Audio categories and their loading policies """
+
+AUDIO_MUSIC = 'music'
+AUDIO_ATMO = 'atmo'
+AUDIO_SPEECH = 'speech'
+AUDIO_SFX = 'sfx'
+
+# Size of decoded 16 bit stereo PCM at 44.1 kHz
+AUDIO_DECODED_BYTES_PER_SECOND = 44100 * 2 * 2
+
+# If streaming is enabled, sounds which decode to more than max_decoded_per_sound bytes
+# are streamed and all others are decoded into memory once and replayed without latency.
+# Decoded sounds of a category are evicted when they exceed max_decoded bytes together.
+# Preload paths are relative to the resources directory and decoded while a level is loading.
+AUDIO_POLICIES = {
+    AUDIO_MUSIC: {
+        'max_decoded_per_sound': 0,
+        'max_decoded': 0,
+        'preload': [],
+    },
+    AUDIO_ATMO: {
+        'max_decoded_per_sound': 4 * 1024 * 1024,
+        'max_decoded': 8 * 1024 * 1024,
+        'preload': ['sounds/atmos/{map_name}.mp3'],
+    },
+    AUDIO_SPEECH: {
+        'max_decoded_per_sound': 4 * 1024 * 1024,
+        'max_decoded': 16 * 1024 * 1024,
+        'preload': [],
+    },
+    AUDIO_SFX: {
+        'max_decoded_per_sound': 1024 * 1024,
+        'max_decoded': 8 * 1024 * 1024,
+        'preload': ['sounds/lights/missle-launch-001.mp3'],
+    },
+}
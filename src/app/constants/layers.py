@@ -14,3 +14,18 @@ LAYERS_VOICEOVER = [
     LAYER_FIRST_VOICEOVER,
     LAYER_RANDOM_VOICEOVER,
 ]
+
+# Layers with moving sprites which are not split into chunks
+LAYERS_DYNAMIC = [
+    LAYER_PLAYER,
+    LAYER_CLOUD,
+    LAYER_PARTICLES,
+    LAYER_FADEOUT,
+    *LAYERS_VOICEOVER
+]
+
+# Layers which are only moved by the fixed rate simulation
+LAYERS_SIMULATED = [
+    LAYER_PLAYER,
+    *LAYERS_VOICEOVER
+]
@@ -9,6 +9,7 @@ SETTINGS_DEFAULT_ANTIALIASING = 4
 SETTINGS_DEFAULT_CENTER_WINDOW = False
 SETTINGS_DEFAULT_SHOW_LOGO = True
 SETTINGS_DEFAULT_SHOW_FPS = False
+SETTINGS_DEFAULT_STREAMING = True
 
 # Default draw rate matches monitor refresh rate
 SETTINGS_DEFAULT_DRAW_RATE = 0
@@ -20,6 +21,21 @@ SETTINGS_DEFAULT_VOLUME_MUSIC = 80
 SETTINGS_DEFAULT_VOLUME_SPEECH = 100
 SETTINGS_DEFAULT_VOLUME_MASTER = 100
 
+# Memory budget for decoded sounds in megabytes
+SETTINGS_DEFAULT_AUDIO_CACHE = 64
+
+# Frame budget of the budget check in milliseconds per tick
+SETTINGS_DEFAULT_BUDGET_UPDATE = 4.0
+SETTINGS_DEFAULT_BUDGET_DRAW = 12.0
+
+# Walkthrough of a map until every voiceover was played
+SETTINGS_BUDGET_SCENARIOS = {
+    'map01': {'map': 'map01', 'max_ticks': 36000},
+}
+
+SETTINGS_DEFAULT_SCREENSHOT_FORMAT = 'jpg'
+SETTINGS_SCREENSHOT_FORMAT_CHOICES = ('png', 'jpg', 'webp')
+
 SETTINGS_SIZE_MINIUM = (1280, 720)
 SETTINGS_ANTIALIASING_CHOICES = 0, 2, 4, 8, 16
 SETTINGS_WINDOW_STYLE_CHOICES = (
@@ -1,6 +1,6 @@
 """ Bush effect """
 
-import arcade
+import numpy
 
 from app.constants.layers import LAYER_BUSH, LAYER_PLAYER
 from app.effects.effect import Effect
@@ -13,7 +13,37 @@ MIN_DISTANCE = 64
 
 
 class Bushes(Effect):
-    """ Bushes effect """
+    """
+    Bushes near the player fade out
+    Positions and alpha are kept in arrays sorted by x,
+    so only bushes in reach of the player are checked
+    """
+
+    def __init__(self):
+        """ Constructor """
+
+        super().__init__()
+
+        self._sprites = []
+        self._x = numpy.zeros(0)
+        self._y = numpy.zeros(0)
+        self._alpha = numpy.zeros(0)
+        self._reach = 0
+
+    def setup(self, scene, tilemap, root_dir: str):
+        """ Setup animation """
+
+        super().setup(scene, tilemap, root_dir)
+
+        sprites = list(scene[LAYER_BUSH]) if LAYER_BUSH in scene else []
+        self._sprites = sorted(sprites, key=lambda sprite: sprite.center_x)
+
+        self._x = numpy.array([sprite.center_x for sprite in self._sprites], dtype=float)
+        self._y = numpy.array([sprite.center_y for sprite in self._sprites], dtype=float)
+        self._alpha = numpy.array([sprite.alpha for sprite in self._sprites], dtype=float)
+
+        # Bushes further away than this on the x-axis can't be near
+        self._reach = MIN_DISTANCE + max([sprite.width for sprite in self._sprites], default=0)
 
     def update(self, delta_time: float) -> None:
         """
@@ -21,18 +51,27 @@ class Bushes(Effect):
         @param delta_time: Float
         """
 
-        sprites = self._scene[LAYER_BUSH]
+        if not self._sprites:
+            return
 
-        collides = False
         player = self._scene[LAYER_PLAYER][0]
 
-        for sprite in sprites:
-            if arcade.get_distance_between_sprites(sprite, player) < MIN_DISTANCE:
-                collides = True
-                break
+        first, last = numpy.searchsorted(self._x, [player.center_x - self._reach, player.center_x + self._reach])
+
+        near = numpy.zeros(len(self._sprites), dtype=bool)
+        near[first:last] = numpy.hypot(
+            self._x[first:last] - player.center_x,
+            self._y[first:last] - player.center_y
+        ) < MIN_DISTANCE
+
+        alpha = numpy.where(
+            near,
+            numpy.maximum(ALPHA_MIN, self._alpha - FADE_SPEED),
+            numpy.minimum(ALPHA_MAX, self._alpha + FADE_SPEED)
+        )
+
+        # Only bushes which are fading are written back
+        for i in numpy.flatnonzero(alpha != self._alpha):
+            self._sprites[i].alpha = int(alpha[i])
 
-        for sprite in sprites:
-            if collides:
-                sprite.alpha = max(ALPHA_MIN, sprite.alpha - FADE_SPEED)
-            else:
-                sprite.alpha = min(ALPHA_MAX, sprite.alpha + FADE_SPEED)
+        self._alpha = alpha
@@ -7,17 +7,33 @@ CLOUD_SPEED = 0.25
 
 
 class CloudAnimation(Effect):
-    """ Move clouds """
+    """
+    Move clouds
+    All clouds move at the same speed, so the layer is scrolled
+    as a whole when drawing instead of moving every sprite
+    """
 
-    def update(self, delta_time: float):
-        """ Update animation"""
+    def __init__(self):
+        """ Constructor """
+
+        super().__init__()
+
+        self._offset = 0.0
+        self._width = None
 
-        clouds = self._scene[LAYER_CLOUD]
+    def setup(self, scene, tilemap, root_dir: str):
+        """ Setup animation """
 
-        width = self._tilemap.width * self._tilemap.tile_width
+        super().setup(scene, tilemap, root_dir)
+
+        self._offset = 0.0
+        self._width = tilemap.width * tilemap.tile_width
+
+    def update(self, delta_time: float):
+        """ Update animation"""
 
-        for cloud in clouds:
-            cloud.center_x -= CLOUD_SPEED
+        if LAYER_CLOUD not in self._scene:
+            return
 
-            if cloud.right <= 0:
-                cloud.right = width - abs(cloud.right)
+        self._offset = (self._offset + CLOUD_SPEED) % self._width
+        self._scene.scroll_layer(LAYER_CLOUD, self._offset, self._width)
@@ -2,7 +2,11 @@
 
 
 class Effect:
-    """ Effect """
+    """
+    Effect
+    Resources are loaded once by load(), setup() only resets the state,
+    so an instance can be reused by every view
+    """
 
     def __init__(self):
         """ Constructor """
@@ -10,6 +14,15 @@ class Effect:
         self._scene = None
         self._tilemap = None
         self._root_dir = None
+        self._loaded = False
+
+    def load(self, root_dir: str) -> None:
+        """
+        Load textures and create GPU resources
+        @param root_dir: Root directory
+        """
+
+        return
 
     def setup(self, scene, tilemap, root_dir: str):
         """ Setup animation """
@@ -18,6 +31,10 @@ class Effect:
         self._tilemap = tilemap
         self._root_dir = root_dir
 
+        if not self._loaded:
+            self.load(root_dir)
+            self._loaded = True
+
     def update(self, delta_time: float) -> None:
         """
         Update it
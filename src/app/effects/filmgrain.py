@@ -1,38 +1,132 @@
 """ Filmgrain effect """
 
+import logging
 import os
 
 import arcade
+from arcade.gl import ShaderException
+from arcade.gl.geometry import quad_2d_fs
 
 from app.effects.effect import Effect
+from app.utils.string import label_value
 
 FADE_SPEED = 1
 ALPHA = 20
 
+# Share of pixels which are grain, matches grain.gif
+GRAIN_DENSITY = 0.0527
+
+# Seconds until the grain pattern changes, matches grain.gif
+GRAIN_FRAME_DURATION = 0.01
+
+VERTEX_SHADER = """
+#version 330
+
+in vec2 in_vert;
+
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+uniform float seed;
+uniform float density;
+uniform float alpha;
+
+out vec4 f_color;
+
+float hash(vec3 p) {
+    p = fract(p * vec3(0.1031, 0.1030, 0.0973));
+    p += dot(p, p.yzx + 33.33);
+    return fract((p.x + p.y) * p.z);
+}
+
+void main() {
+    // Black speckles on random pixels, a new pattern per grain frame
+    if (hash(vec3(gl_FragCoord.xy, seed)) >= density) {
+        discard;
+    }
+
+    f_color = vec4(0.0, 0.0, 0.0, alpha);
+}
+"""
+
 
 class Filmgrain(Effect):
-    """ Filmgrain effect """
+    """
+    Filmgrain effect
+    Drawn by a fullscreen fragment shader, falls back to
+    the animated GIF if the shader can't be compiled
+    """
 
     def __init__(self):
         """ Constructor """
 
         super().__init__()
 
+        self._time = 0.0
+
+        # Shader
+        self._ctx = None
+        self._program = None
+        self._quad = None
+
+        # GIF fallback
         self._camera = None
         self._grain = None
         self._spritelist = None
 
+    def load(self, root_dir: str) -> None:
+        """ Compile the shader or load the GIF fallback """
+
+        if not self.setup_shader():
+            self.setup_gif(root_dir)
+
     def setup(self, scene, tilemap, root_dir):
         """ Setup animation """
 
         super().setup(scene, tilemap, root_dir)
 
+        self._time = 0.0
+
+        if self._grain:
+            self._grain.size = arcade.get_window().get_size()
+            self._grain.bottom = 0
+            self._grain.left = 0
+
+    def setup_shader(self) -> bool:
+        """
+        Compile the grain shader
+        @return: False if shaders are unavailable
+        """
+
+        self._ctx = arcade.get_window().ctx
+
+        try:
+            self._program = self._ctx.program(
+                vertex_shader=VERTEX_SHADER,
+                fragment_shader=FRAGMENT_SHADER
+            )
+        except ShaderException as e:
+            logging.error(label_value('Filmgrain shader', e))
+            self._program = None
+            return False
+
+        self._program['density'] = GRAIN_DENSITY
+        self._program['alpha'] = ALPHA / 255
+        self._quad = quad_2d_fs()
+
+        return True
+
+    def setup_gif(self, root_dir: str) -> None:
+        """ Setup the animated GIF """
+
         self._camera = arcade.camera.Camera2D()
 
         self._grain = arcade.load_animated_gif(os.path.join(root_dir, 'resources', 'animations', 'grain.gif'))
-        self._grain.size = arcade.get_window().get_size()
-        self._grain.bottom = 0
-        self._grain.left = 0
         self._spritelist = arcade.sprite_list.SpriteList()
         self._spritelist.append(self._grain)
 
@@ -44,10 +138,20 @@ class Filmgrain(Effect):
         @param delta_time: Float
         """
 
-        self._grain.update_animation(delta_time=delta_time)
+        self._time += delta_time
+
+        if self._grain:
+            self._grain.update_animation(delta_time=delta_time)
 
     def draw(self) -> None:
         """ Draw it """
 
+        if self._program:
+            self._program['seed'] = float(int(self._time / GRAIN_FRAME_DURATION) % 1024)
+
+            with self._ctx.enabled(self._ctx.BLEND):
+                self._quad.render(self._program)
+            return
+
         self._camera.use()
         self._spritelist.draw()
@@ -1,10 +1,7 @@
 """ Particles """
-import random
 
-import arcade.sprite
-
-from app.constants.layers import LAYER_PARTICLES
 from app.effects.effect import Effect
+from app.utils.particlesystem import ParticleSystem
 
 PARTICLES_COUNT = 300
 PARTICLES_RADIUS = 6
@@ -13,33 +10,41 @@ PARTICLES_Y_MAX = 800
 PARTICLE_SPEED = 0.2
 
 PARTICLES_COLOR = (255, 255, 255)
+PARTICLES_ALPHA_MIN = 80
+PARTICLES_ALPHA_MAX = 180
 
 
 class Particles(Effect):
     """ Effect """
 
+    def __init__(self):
+        """ Constructor """
+
+        super().__init__()
+
+        self._particles = None
+
+    def load(self, root_dir: str) -> None:
+        """ Create the particle system """
+
+        self._particles = ParticleSystem()
+
     def setup(self, scene, tilemap, root_dir: str):
         """ Setup animation """
         super().setup(scene, tilemap, root_dir)
 
         width = tilemap.width * tilemap.tile_width
-        for i in range(0, PARTICLES_COUNT):
-            r, g, b = PARTICLES_COLOR
-            a = random.randint(80, 180)
-            color = r, g, b, a
-
-            sprite = arcade.sprite.SpriteCircle(
-                radius=random.randint(1, PARTICLES_RADIUS),
-                color=color,
-                soft=True
-            )
-
-            sprite.center_x = random.randint(1, width)
-            sprite.center_y = random.randint(PARTICLES_Y_MIN, PARTICLES_Y_MAX)
-
-            # sprite.change_y -= random.uniform(-PARTICLE_SPEED, PARTICLE_SPEED)
 
-            scene.add_sprite(LAYER_PARTICLES, sprite)
+        self._particles.setup(
+            count=PARTICLES_COUNT,
+            area=(1, width, PARTICLES_Y_MIN, PARTICLES_Y_MAX),
+            radius=(1, PARTICLES_RADIUS),
+            colors=[
+                (*PARTICLES_COLOR, alpha)
+                for alpha in range(PARTICLES_ALPHA_MIN, PARTICLES_ALPHA_MAX + 1)
+            ],
+            velocity=(-PARTICLE_SPEED, 0)
+        )
 
     def update(self, delta_time: float) -> None:
         """
@@ -47,13 +52,9 @@ class Particles(Effect):
         @param delta_time: float
         """
 
-        for sprite in self._scene[LAYER_PARTICLES]:
-            sprite.center_x -= PARTICLE_SPEED
-            if sprite.right < 0:
-                sprite.center_x = self._tilemap.width * self._tilemap.tile_width
-                sprite.center_y = random.randint(PARTICLES_Y_MIN, PARTICLES_Y_MAX)
+        self._particles.update()
 
     def draw(self) -> None:
         """ Draw effect """
 
-        return
+        self._particles.draw()
@@ -4,20 +4,33 @@
 
 import logging
 import os
-import time
 
 import arcade
 import pyglet
 import userpaths
 
-from app.constants.gameinfo import DIRECTORY_GAME_NAME
-from app.constants.input.keyboard import KEY_SCREENSHOT, KEY_TOGGLE_FULLSCREEN, KEY_TOGGLE_FPS
-from app.constants.settings import SETTINGS_SIZE_MINIUM
+from app.constants.gameinfo import DIRECTORY_GAME_NAME, DEFAULT_LOCALE
+from app.constants.input.keyboard import (
+    KEY_SCREENSHOT,
+    KEY_TOGGLE_FULLSCREEN,
+    KEY_TOGGLE_FPS,
+    KEY_PROFILER_DUMP
+)
+from app.constants.settings import (
+    SETTINGS_SIZE_MINIUM,
+    SETTINGS_DEFAULT_SCREENSHOT_FORMAT,
+    SETTINGS_DEFAULT_AUDIO_CACHE
+)
 from app.utils.audiovolumes import AudioVolumes
-from app.utils.fpscounter import FPSCounter
+from app.utils.effectregistry import EffectRegistry
+from app.utils.localeservice import LocaleService
+from app.utils.screenshots import Screenshots
+from app.utils.soundcache import SoundCache, MEGABYTE
+from app.utils.startupprofiler import StartupProfiler
 from app.utils.string import label_value
+from app.utils.subtitles import Subtitles
+from app.utils.timings import Timings
 from app.views.logo import Logo
-from app.views.mainmenu import MainMenu
 
 MARGIN = 10
 
@@ -50,8 +63,16 @@ class GameWindow(arcade.Window):
         self._screen = None
         self._controller_manager = None
         self._controllers = []
-        self._fps_counter = None
+        self._profiler = None
         self._audio_volumes = None
+        self._record_input = False
+        self._startup_profiler = None
+        self._locale = None
+        self._subtitles = None
+        self._timings = Timings()
+        self._screenshots = Screenshots()
+        self._sounds = SoundCache(SETTINGS_DEFAULT_AUDIO_CACHE * MEGABYTE)
+        self._effects = EffectRegistry()
 
         # Call the parent class and set up the window
         super().__init__(
@@ -78,18 +99,41 @@ class GameWindow(arcade.Window):
             audio_volumes: AudioVolumes,
             show_intro: bool = True,
             show_fps: bool = False,
+            screenshot_format: str = SETTINGS_DEFAULT_SCREENSHOT_FORMAT,
+            audio_cache: int = SETTINGS_DEFAULT_AUDIO_CACHE,
+            record_input: bool = False,
+            startup_profiler: StartupProfiler | None = None,
+            locale: LocaleService | None = None
     ):
         """ Set up the main window here"""
 
         self._root_dir = root_dir
+        self._locale = locale or LocaleService().setup(root_dir, DEFAULT_LOCALE)
+        self._startup_profiler = startup_profiler or StartupProfiler()
+        profiler = self._startup_profiler
         self._audio_volumes = audio_volumes
-
-        icon = pyglet.image.load(
-            os.path.join(root_dir, 'resources', 'images', 'ui', 'icon.ico')
+        self._record_input = record_input
+        self._sounds.budget = audio_cache * MEGABYTE
+        self._sounds.policy.setup(streaming=audio_volumes.streaming)
+        self._screenshots = Screenshots().setup(
+            str(os.path.join(userpaths.get_my_pictures(), DIRECTORY_GAME_NAME)),
+            image_format=screenshot_format
         )
-        self.set_icon(icon)
-        self.setup_fonts()
-        self.setup_controllers()
+
+        with profiler.phase('icon'):
+            icon = pyglet.image.load(
+                os.path.join(root_dir, 'resources', 'images', 'ui', 'icon.ico')
+            )
+            self.set_icon(icon)
+
+        with profiler.phase('fonts'):
+            self.setup_fonts()
+
+        with profiler.phase('subtitles'):
+            self._subtitles = Subtitles().setup(root_dir, self._locale.languages)
+
+        with profiler.phase('controllers'):
+            self.setup_controllers()
 
         w, h = SETTINGS_SIZE_MINIUM
         self.set_minimum_size(w, h)
@@ -97,13 +141,14 @@ class GameWindow(arcade.Window):
         if show_intro:
             view = Logo
         else:
+            from app.views.mainmenu import MainMenu
             view = MainMenu
 
         if show_fps:
-            arcade.enable_timings()
-            self._fps_counter = FPSCounter().setup(self)
+            self.on_toggle_fps()
 
-        self.show_view(view().setup(root_dir))
+        with profiler.phase('view'):
+            self.show_view(view().setup(root_dir))
 
     @property
     def size(self):
@@ -224,57 +269,101 @@ class GameWindow(arcade.Window):
         """ On keyboard key presssed """
 
         if symbol in KEY_SCREENSHOT:
-            self.on_screenshot()
+            if modifiers & arcade.key.MOD_SHIFT:
+                self.on_toggle_burst()
+            else:
+                self.on_screenshot()
         if symbol in KEY_TOGGLE_FULLSCREEN:
             self.set_fullscreen(not self.fullscreen)
         if symbol in KEY_TOGGLE_FPS:
             self.on_toggle_fps()
+        if symbol in KEY_PROFILER_DUMP and self._profiler:
+            self._profiler.dump()
 
     def on_screenshot(self):
         """ Save a screenshot """
 
-        screenshot_dir = str(os.path.join(userpaths.get_my_pictures(), DIRECTORY_GAME_NAME))
+        # Only the framebuffer is read here, encoding happens in the background
+        filename = self._screenshots.capture(self)
+
+        if not filename:
+            return None
+
+        self.play_screenshot_sound()
+
+        return filename
 
-        if not os.path.exists(screenshot_dir):
-            os.makedirs(screenshot_dir)
+    def on_toggle_burst(self):
+        """ Toggle capturing a screenshot on every frame """
 
-        filename = os.path.join(screenshot_dir, time.strftime("%Y%m%d-%H%M%S") + '.jpg')
+        self._screenshots.burst = not self._screenshots.burst
+        logging.info(label_value('Screenshot burst', self._screenshots.burst))
 
-        start = time.time()
-        image = arcade.get_image().convert('RGB')
-        image.save(filename, subsampling=0, quality=100)
-        end = time.time() - start
+        if self._screenshots.burst:
+            self.play_screenshot_sound()
 
-        logging.info(f"Screenshot saved as {filename} in {end} seconds")
+    def play_screenshot_sound(self):
+        """ Play screenshot sound """
 
-        sound = arcade.load_sound(
+        sound = self._sounds.load(
             os.path.join(self._root_dir, 'resources', 'sounds', 'common', 'screenshot.mp3')
         )
         sound.play(volume=self._audio_volumes.volume_sound)
 
-        return filename
-
     def on_toggle_fps(self):
-        """ Toggle fps counter """
+        """ Toggle fps counter and profiler """
 
-        if self._fps_counter:
+        if self._profiler:
             arcade.disable_timings()
-            self._fps_counter = None
+            self._profiler.unsetup()
+            self._profiler = None
         else:
+            from app.utils.profiler import Profiler
             arcade.enable_timings()
-            self._fps_counter = FPSCounter().setup(self)
+            self._profiler = Profiler().setup(self)
+
+    def on_resize(self, width: int, height: int):
+        """ Re-anchor the overlays """
+
+        if self._subtitles:
+            self._subtitles.on_resize(width, height)
+
+        if self._profiler:
+            self._profiler.on_resize(width, height)
 
     def on_update(self, delta_time: float):
         """ On update """
 
-        if self._fps_counter:
-            self._fps_counter.update()
+        if self._profiler:
+            self._profiler.update()
 
     def draw_after(self):
         """ Draw after view """
 
-        if self._fps_counter:
-            self._fps_counter.draw()
+        if self._startup_profiler:
+            self.on_first_frame()
+
+        if self._screenshots.burst:
+            self._screenshots.capture(self)
+
+        if self._profiler:
+            self._profiler.draw()
+
+    def on_first_frame(self):
+        """ Report the startup time when the first frame was drawn """
+
+        report = self._startup_profiler.finish()
+
+        if report and self._startup_profiler.enabled:
+            StartupProfiler.save(report, str(os.path.join(userpaths.get_my_documents(), DIRECTORY_GAME_NAME)))
+
+        self._startup_profiler = None
+
+    def close(self):
+        """ Write pending screenshots before closing """
+
+        self._screenshots.unsetup()
+        super().close()
 
     @property
     def audio_volumes(self):
@@ -282,6 +371,42 @@ class GameWindow(arcade.Window):
 
         return self._audio_volumes
 
+    @property
+    def locale(self) -> LocaleService:
+        """ Language and localized resources """
+
+        return self._locale
+
+    @property
+    def subtitles(self) -> Subtitles:
+        """ Subtitles of the voiceovers """
+
+        return self._subtitles
+
+    @property
+    def record_input(self) -> bool:
+        """ Record the input of played levels """
+
+        return self._record_input
+
+    @property
+    def sounds(self) -> SoundCache:
+        """ Sound cache """
+
+        return self._sounds
+
+    @property
+    def effects(self) -> EffectRegistry:
+        """ Effects shared by all views """
+
+        return self._effects
+
+    @property
+    def timings(self) -> Timings:
+        """ Subsystem timings """
+
+        return self._timings
+
     @property
     def root_dir(self):
         """ Root directory """
@@ -1,15 +1,12 @@
 """ Game startup """
 
 import argparse
-import gettext
 import locale
 import logging
-import os
 import platform
 import sys
 
 import arcade
-import psutil
 import pyglet
 
 from app.constants.gameinfo import VERSION_STRING, DEFAULT_LOCALE
@@ -20,18 +17,21 @@ from app.constants.settings import (
     SETTINGS_ANTIALIASING_CHOICES,
     SETTINGS_DEFAULT_ANTIALIASING, SETTINGS_DEFAULT_DRAW_RATE, SETTINGS_DEFAULT_UPDATE_RATE,
     SETTINGS_DEFAULT_VOLUME_MUSIC, SETTINGS_DEFAULT_VOLUME_SOUND, SETTINGS_DEFAULT_VOLUME_MASTER,
-    SETTINGS_DEFAULT_VOLUME_SPEECH, SETTINGS_WINDOW_STYLE_CHOICES, SETTINGS_DEFAULT_WINDOW_STYLE
+    SETTINGS_DEFAULT_VOLUME_SPEECH, SETTINGS_WINDOW_STYLE_CHOICES, SETTINGS_DEFAULT_WINDOW_STYLE,
+    SETTINGS_DEFAULT_SCREENSHOT_FORMAT, SETTINGS_SCREENSHOT_FORMAT_CHOICES,
+    SETTINGS_DEFAULT_AUDIO_CACHE, SETTINGS_DEFAULT_BUDGET_UPDATE, SETTINGS_DEFAULT_BUDGET_DRAW,
+    SETTINGS_DEFAULT_SHOW_LOGO, SETTINGS_DEFAULT_SHOW_FPS, SETTINGS_DEFAULT_STREAMING,
+    SETTINGS_BUDGET_SCENARIOS
 )
 from app.gamewindow import GameWindow
 from app.utils.audiovolumes import AudioVolumes
+from app.utils.localeservice import LocaleService
+from app.utils.settingsstore import SettingsStore
+from app.utils.startupprofiler import StartupProfiler
 from app.utils.string import label_value
 
-try:
-    import sounddevice
-except OSError:
-    sounddevice = None
-except ImportError:
-    sounddevice = None
+# Settings with an enable and a disable flag, these are resolved in start()
+SETTINGS_SWITCHES = ('fullscreen', 'vsync', 'show_intro', 'streaming')
 
 
 class Startup:
@@ -44,12 +44,19 @@ class Startup:
 
         self.args = None
         self._root_dir = None
-        self.args = None
+        self._settings = None
+        self._startup_profiler = None
+        self._locale = None
 
-    def setup(self, root_dir: str):
-        """ Setup game startup """
+    def setup(self, root_dir: str, startup_profiler: StartupProfiler | None = None):
+        """
+        Setup game startup
+        @param root_dir: Root directory
+        @param startup_profiler: Measures the time to the first frame
+        """
 
         self._root_dir = root_dir
+        self._startup_profiler = startup_profiler or StartupProfiler()
         self.setup_logging()
 
         return self
@@ -69,10 +76,8 @@ class Startup:
     def setup_locale(self, lang) -> None:
         """ setup locale """
 
-        locale_path = os.path.join(self._root_dir, 'resources', 'locales')
-        os.environ['LANG'] = lang[0]
         logging.info(label_value('Language', lang[0]))
-        gettext.install('messages', locale_path)
+        self._locale = LocaleService().setup(self._root_dir, lang[0]).install()
 
     @staticmethod
     def log_version_info():
@@ -90,52 +95,124 @@ class Startup:
         logging.info(label_value('GIL', gil))
 
     @staticmethod
-    def log_system_info(window: arcade.Window) -> None:
+    def fingerprint() -> str:
+        """ Identifies the system and libraries cached probes were made with """
+
+        # The processor isn't part of it, querying it is slow on some systems
+        uname = platform.uname()
+
+        return ' '.join([uname.system, uname.node, uname.release, uname.machine, pyglet.version, arcade.VERSION])
+
+    @staticmethod
+    def probe_screen() -> dict:
+        """ Query the mode of the default screen """
+
+        mode = pyglet.display.get_display().get_default_screen().get_mode()
+
+        # Not available without a display server
+        if not mode:
+            return {'width': None, 'height': None, 'rate': None}
+
+        return {'width': mode.width, 'height': mode.height, 'rate': mode.rate}
+
+    @staticmethod
+    def probe_system(window: arcade.Window) -> dict:
+        """ Query hardware info """
+
+        # Only needed if the probes aren't cached
+        import psutil
+
+        try:
+            import sounddevice
+        except (OSError, ImportError):
+            sounddevice = None
+
+        uname = platform.uname()
+        audio = None
+
+        if sounddevice:
+            audio = [device['name'] for device in sounddevice.query_devices()]
+
+        return {
+            'os': f"{uname.system} {uname.version}",
+            'cpu': uname.processor,
+            'ram': round(psutil.virtual_memory().total / 1024 / 1024 / 1024),
+            'gpu_vendor': window.ctx.info.VENDOR,
+            'gpu_renderer': window.ctx.info.RENDERER,
+            'gpu_max_texture_size': window.ctx.info.MAX_TEXTURE_SIZE,
+            'opengl': pyglet.gl.gl_info.get_version_string(),
+            'audio': audio
+        }
+
+    @staticmethod
+    def log_system_info(system: dict) -> None:
         """
         Log hardware info
+        @param system: Probed or cached hardware info
         """
 
-        # Log OS info
-        uname = platform.uname()
-        logging.info(label_value('OS', f"{uname.system} {uname.version}"))
+        logging.info(label_value('OS', system['os']))
+        logging.info(label_value('CPU', system['cpu']))
+        logging.info(label_value('RAM', f"{system['ram']} GB"))
 
-        # Log CPU model
-        logging.info(label_value('CPU', uname.processor))
+        # Renderer is the GPU
+        logging.info(label_value('GPU VENDOR', system['gpu_vendor']))
+        logging.info(label_value('GPU RENDERER', system['gpu_renderer']))
+        logging.info(label_value('GPU MAX_TEXTURE_SIZE', system['gpu_max_texture_size']))
 
-        # Log the ram size
-        ram_size = round(psutil.virtual_memory().total / 1024 / 1024 / 1024)
-        logging.info(label_value('RAM', f"{ram_size} GB"))
+        logging.info(label_value('OpenGL version', system['opengl']))
 
-        # Renderer is the GPU
-        logging.info(label_value('GPU VENDOR', window.ctx.info.VENDOR))
-        logging.info(label_value('GPU RENDERER', window.ctx.info.RENDERER))
-        logging.info(label_value('GPU MAX_TEXTURE_SIZE', window.ctx.info.MAX_TEXTURE_SIZE))
-
-        logging.info(label_value('OpenGL version', pyglet.gl.gl_info.get_version_string()))
-        logging.info(
-            label_value(
-                'Screen resolution',
-                pyglet.display.get_display().get_default_screen().get_mode()
-            )
-        )
+        screen = system['screen']
+        logging.info(label_value('Screen resolution', f"{screen['width']}x{screen['height']} @ {screen['rate']} Hz"))
 
-        if not sounddevice:
+        if system['audio'] is None:
             logging.info(label_value('Audio', 'Unknown'))
-            return
-
-        # Log the audio devices
-        for audio in sounddevice.query_devices():
-            logging.info(label_value('Audio', audio['name']))
+        else:
+            # Log the audio devices
+            for audio in system['audio']:
+                logging.info(label_value('Audio', audio))
 
         logging.info(label_value('Locale', locale.getlocale()))
 
-    def start(self) -> None:
-        """ Start game """
+    @staticmethod
+    def default_settings() -> dict:
+        """ Settings which are stored in the settings file """
+
+        return {
+            'fullscreen': SETTINGS_DEFAULT_FULLSCREEN,
+            'vsync': SETTINGS_DEFAULT_VSYNC,
+            'show_intro': SETTINGS_DEFAULT_SHOW_LOGO,
+            'show_fps': SETTINGS_DEFAULT_SHOW_FPS,
+            'window_style': SETTINGS_DEFAULT_WINDOW_STYLE,
+            'size': SETTINGS_DEFAULT_SIZE,
+            'antialiasing': SETTINGS_DEFAULT_ANTIALIASING,
+            'draw_rate': SETTINGS_DEFAULT_DRAW_RATE,
+            'update_rate': SETTINGS_DEFAULT_UPDATE_RATE,
+            'volume_music': SETTINGS_DEFAULT_VOLUME_MUSIC,
+            'volume_speech': SETTINGS_DEFAULT_VOLUME_SPEECH,
+            'volume_sound': SETTINGS_DEFAULT_VOLUME_SOUND,
+            'volume_master': SETTINGS_DEFAULT_VOLUME_MASTER,
+            'streaming': SETTINGS_DEFAULT_STREAMING,
+            'audio_cache': SETTINGS_DEFAULT_AUDIO_CACHE,
+            'screenshot_format': SETTINGS_DEFAULT_SCREENSHOT_FORMAT,
+        }
+
+    def start(self) -> int | None:
+        """
+        Start game
+        @return: Exit code
+        """
+
+        profiler = self._startup_profiler
+
+        with profiler.phase('settings'):
+            self._settings = SettingsStore().setup(fingerprint=self.fingerprint())
+            settings = self._settings.defaults(self.default_settings())
 
-        fullscreen = SETTINGS_DEFAULT_FULLSCREEN
-        vsync = SETTINGS_DEFAULT_VSYNC
+        fullscreen = settings['fullscreen']
+        vsync = settings['vsync']
 
-        args = self.get_args()
+        args = self.get_args(settings)
         logging.info(args)
 
         if args.fullscreen:
@@ -148,7 +225,7 @@ class Startup:
         elif args.no_vsync:
             vsync = False
 
-        show_intro = True
+        show_intro = settings['show_intro']
 
         if args.intro:
             show_intro = True
@@ -180,16 +257,39 @@ class Startup:
 
         self.setup_locale(lang)
 
+        # Runs without vsync and draw rate limit
+        if args.budget_check:
+            from app.budgetcheck import BudgetCheck
+
+            return BudgetCheck().run(
+                self._root_dir,
+                args.budget_check,
+                size=(width, height),
+                update_rate=args.update_rate if args.update_rate > 0 else SETTINGS_DEFAULT_UPDATE_RATE,
+                budget_update=args.budget_update,
+                budget_draw=args.budget_draw
+            )
+
         samples = args.antialiasing
+
+        if samples not in SETTINGS_ANTIALIASING_CHOICES:
+            samples = SETTINGS_DEFAULT_ANTIALIASING
+
         antialiasing = samples > 0
 
+        # Probes are cached in the settings file, --probe queries them again
+        system = {} if args.probe else dict(self._settings.probes)
+
+        if 'screen' not in system:
+            system['screen'] = self.probe_screen()
+
         # Draw rate
         draw_rate = 1 / 99999
 
         if args.draw_rate > 0:
             draw_rate = 1 / args.draw_rate
-        elif vsync:
-            draw_rate = 1 / pyglet.display.get_display().get_default_screen().get_mode().rate
+        elif vsync and system['screen']['rate']:
+            draw_rate = 1 / system['screen']['rate']
 
         # Update rate
 
@@ -201,20 +301,21 @@ class Startup:
         if str(args.window_style).lower() == 'none':
             args.window_style = None
 
-        window = GameWindow(
-            fullscreen=fullscreen,
-            visible=False,
-            style=args.window_style,
-            vsync=vsync,
-            width=width,
-            height=height,
-            antialiasing=antialiasing,
-            samples=samples,
-            center_window=args.center_window,
-            draw_rate=draw_rate,
-            update_rate=update_rate,
-            fixed_rate=update_rate
-        )
+        with profiler.phase('window'):
+            window = GameWindow(
+                fullscreen=fullscreen,
+                visible=False,
+                style=args.window_style,
+                vsync=vsync,
+                width=width,
+                height=height,
+                antialiasing=antialiasing,
+                samples=samples,
+                center_window=args.center_window,
+                draw_rate=draw_rate,
+                update_rate=update_rate,
+                fixed_rate=update_rate
+            )
 
         # Set window location based on arguments
         x, y = window.get_location()
@@ -228,15 +329,22 @@ class Startup:
         window.set_location(x, y)
         window.set_visible(True)
 
-        self.log_version_info()
-        self.log_system_info(window)
+        with profiler.phase('system info'):
+            self.log_version_info()
+
+            if 'gpu_renderer' not in system:
+                system.update(self.probe_system(window))
+
+            self.log_system_info(system)
+            self._settings.probes = system
+            self._settings.save()
 
         volume_music = args.volume_music
         volume_sound = args.volume_sound
         volume_speech = args.volume_speech
         volume_master = args.volume_master
 
-        streaming = True
+        streaming = settings['streaming']
 
         if args.streaming:
             streaming = True
@@ -248,6 +356,11 @@ class Startup:
             self._root_dir,
             show_intro=show_intro,
             show_fps=args.show_fps,
+            screenshot_format=args.screenshot_format,
+            audio_cache=args.audio_cache,
+            record_input=args.record,
+            startup_profiler=profiler,
+            locale=self._locale,
             audio_volumes=AudioVolumes(
                 volume_music=volume_music,
                 volume_sound=volume_sound,
@@ -259,8 +372,11 @@ class Startup:
         arcade.run()
 
     @staticmethod
-    def get_args() -> argparse.Namespace:
-        """ Get args """
+    def get_args(settings: dict | None = None) -> argparse.Namespace:
+        """
+        Get args
+        @param settings: Stored settings used as defaults
+        """
 
         parser = argparse.ArgumentParser()
 
@@ -413,14 +529,76 @@ class Startup:
             '--streaming',
             action='store_true',
             default=False,
-            help='Enable audio streaming'
+            help='Stream long sounds like music, atmo and speech'
         )
 
         parser.add_argument(
             '--no-streaming',
             action='store_true',
             default=False,
-            help='Disable audio streaming'
+            help='Decode all sounds into memory'
+        )
+
+        parser.add_argument(
+            '--audio-cache',
+            action='store',
+            type=int,
+            help='Memory budget for decoded sounds in megabytes',
+            default=SETTINGS_DEFAULT_AUDIO_CACHE
+        )
+
+        parser.add_argument(
+            '--screenshot-format',
+            action='store',
+            type=str,
+            help='The screenshot image format',
+            choices=SETTINGS_SCREENSHOT_FORMAT_CHOICES,
+            default=SETTINGS_DEFAULT_SCREENSHOT_FORMAT
+        )
+
+        parser.add_argument(
+            '--record',
+            action='store_true',
+            default=False,
+            help='Record the input of played levels for replay'
+        )
+
+        parser.add_argument(
+            '--budget-check',
+            action='store',
+            type=str,
+            help='Run a scenario and exit non-zero if a tick exceeds the frame budget',
+            choices=SETTINGS_BUDGET_SCENARIOS.keys()
+        )
+
+        parser.add_argument(
+            '--budget-update',
+            action='store',
+            type=float,
+            help='Frame budget for update in milliseconds',
+            default=SETTINGS_DEFAULT_BUDGET_UPDATE
+        )
+
+        parser.add_argument(
+            '--budget-draw',
+            action='store',
+            type=float,
+            help='Frame budget for draw in milliseconds',
+            default=SETTINGS_DEFAULT_BUDGET_DRAW
+        )
+
+        parser.add_argument(
+            '--profile-startup',
+            action='store_true',
+            default=False,
+            help='Save a report of import and startup phase times at the first frame'
+        )
+
+        parser.add_argument(
+            '--probe',
+            action='store_true',
+            default=False,
+            help='Query display, GPU and audio devices again instead of using the cached info'
         )
 
         parser.add_argument(
@@ -429,4 +607,10 @@ class Startup:
             type=str
         )
 
+        # Options which aren't given fall back to the settings file
+        parser.set_defaults(**{
+            key: value for key, value in (settings or {}).items()
+            if key not in SETTINGS_SWITCHES
+        })
+
         return parser.parse_args()
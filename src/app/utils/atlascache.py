@@ -0,0 +1,256 @@
+""" Prepacked texture atlas pages for map tilesets """
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import arcade
+import PIL.Image
+import pytiled_parser
+
+from app.utils.mapcache import MapCache
+from app.utils.string import label_value
+
+ATLAS_EXTENSION = '.atlas.json'
+ATLAS_PAGE_EXTENSION = '.png'
+ATLAS_VERSION = 3
+ATLAS_PAGE_SIZE = 2048
+
+KEY_CHECKSUM = 'checksum'
+KEY_VERSION = 'version'
+KEY_TIER = 'tier'
+KEY_PAGES = 'pages'
+KEY_IMAGES = 'images'
+KEY_SOURCES = 'sources'
+
+
+class AtlasCache:
+    """
+    Packs the tileset images of a map into a few atlas pages.
+    At runtime the pages are decoded once and sliced into the
+    texture cache, so the tilemap doesn't decode every image itself.
+    Images larger than a page (e.g. the backdrop) are left out.
+    Each texture tier has its own pages, holding the image variants
+    of the tier instead of the full size images they replace.
+    Pages are only used while the map and all packed images are unchanged.
+    """
+
+    @staticmethod
+    def tier_name(path: str, tier: float = 1.0) -> str:
+        """ Path of the TMX file without extension, e.g. map01@50 for a tier """
+
+        name = os.path.splitext(path)[0]
+
+        return name if tier == 1.0 else f"{name}@{round(tier * 100)}"
+
+    @staticmethod
+    def cache_path(path: str, tier: float = 1.0) -> str:
+        """ Path of the atlas manifest of a tier next to the TMX file """
+
+        return AtlasCache.tier_name(path, tier) + ATLAS_EXTENSION
+
+    @staticmethod
+    def page_path(path: str, page: int, tier: float = 1.0) -> str:
+        """ Path of an atlas page of a tier next to the TMX file """
+
+        return f"{AtlasCache.tier_name(path, tier)}.atlas{page}{ATLAS_PAGE_EXTENSION}"
+
+    @staticmethod
+    def images(tiled_map: pytiled_parser.TiledMap) -> list:
+        """
+        Collect the image files of the tilesets
+        @return: List of image paths relative to the map
+        """
+
+        images = []
+
+        for tileset in tiled_map.tilesets.values():
+            if tileset.image:
+                images.append(tileset.image)
+
+            for tile in (tileset.tiles or {}).values():
+                if tile.image:
+                    images.append(tile.image)
+
+        return sorted(set(str(image) for image in images))
+
+    @staticmethod
+    def stamp(path: str) -> list:
+        """
+        Identify the content of an image file
+        @param path: Path to image file
+        @return: [size, SHA-256 checksum]
+        """
+
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        return [len(data), hashlib.sha256(data).hexdigest()]
+
+    @staticmethod
+    def pack(sizes: dict, page_size: int = ATLAS_PAGE_SIZE) -> dict:
+        """
+        Pack images into pages row by row, tallest images first
+        @param sizes: Image sizes by name
+        @param page_size: Width and height of a page
+        @return: (page, x, y, width, height) by name
+        """
+
+        regions = {}
+        page, x, y, row_height = 0, 0, 0, 0
+
+        for name in sorted(sizes, key=lambda name: (-sizes[name][1], name)):
+            width, height = sizes[name]
+
+            if width > page_size or height > page_size:
+                continue
+
+            if x + width > page_size:
+                x, y, row_height = 0, y + row_height, 0
+
+            if y + height > page_size:
+                page, x, y, row_height = page + 1, 0, 0, 0
+
+            regions[name] = (page, x, y, width, height)
+            x += width
+            row_height = max(row_height, height)
+
+        return regions
+
+    @staticmethod
+    def build(path: str, tier: float = 1.0, page_size: int = ATLAS_PAGE_SIZE) -> str | None:
+        """
+        Build the atlas pages of a TMX map
+        @param path: Path to TMX file
+        @param tier: Texture tier
+        @return: Path to atlas manifest, None if the tier has no image variants
+        """
+
+        from app.utils.texturevariants import TextureVariants
+
+        map_dir = os.path.dirname(path)
+
+        # A zoom equal to a tier selects the variants of that tier
+        tiled_map, variants = TextureVariants.select(MapCache.read(path), tier)
+
+        if tier != 1.0 and not variants:
+            return None
+
+        images = {}
+        for name in AtlasCache.images(tiled_map):
+            images[name] = PIL.Image.open(os.path.join(map_dir, name)).convert('RGBA')
+
+        regions = AtlasCache.pack({name: image.size for name, image in images.items()}, page_size)
+        page_count = max([region[0] for region in regions.values()], default=-1) + 1
+
+        pages = []
+        for page in range(page_count):
+            page_image = PIL.Image.new('RGBA', (page_size, page_size), (0, 0, 0, 0))
+
+            for name, (image_page, x, y, _width, _height) in regions.items():
+                if image_page == page:
+                    page_image.paste(images[name], (x, y))
+
+            page_file = AtlasCache.page_path(path, page, tier)
+            page_image.save(page_file, optimize=True)
+            pages.append(os.path.basename(page_file))
+
+        cache_file = AtlasCache.cache_path(path, tier)
+
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                KEY_CHECKSUM: MapCache.checksum(path),
+                KEY_VERSION: ATLAS_VERSION,
+                KEY_TIER: tier,
+                KEY_PAGES: pages,
+                KEY_IMAGES: regions,
+                KEY_SOURCES: {name: AtlasCache.stamp(os.path.join(map_dir, name)) for name in regions}
+            }, f, indent=1, sort_keys=True)
+
+        logging.info(label_value('Atlas built', cache_file))
+
+        return cache_file
+
+    @staticmethod
+    def build_all(maps_dir: str) -> list:
+        """ Build the atlas pages of all tiers of all TMX maps in a directory, after the image variants """
+
+        from app.utils.texturevariants import VARIANT_TIERS
+
+        built = []
+
+        for file in sorted(os.listdir(maps_dir)):
+            if not file.endswith('.tmx'):
+                continue
+
+            for tier in (1.0, *VARIANT_TIERS):
+                cache_file = AtlasCache.build(os.path.join(maps_dir, file), tier)
+
+                if cache_file:
+                    built.append(cache_file)
+
+        return built
+
+    @staticmethod
+    def load(tiled_map: pytiled_parser.TiledMap, tier: float = 1.0, checksum: str | None = None) -> int:
+        """
+        Put the prepacked images of a map into the texture cache
+        @param tiled_map: The parsed map with the image variants of the tier
+        @param tier: Texture tier, only its pages are decoded
+        @param checksum: Checksum of the TMX if already known
+        @return: Count of images taken from the atlas pages
+        """
+
+        path = str(tiled_map.map_file)
+        cache_file = AtlasCache.cache_path(path, tier)
+
+        if not os.path.isfile(cache_file):
+            return 0
+
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+
+            if manifest[KEY_VERSION] != ATLAS_VERSION or manifest[KEY_CHECKSUM] != (checksum or MapCache.checksum(path)):
+                logging.info(label_value('Atlas outdated', cache_file))
+                return 0
+
+            map_dir = os.path.dirname(path)
+
+            # Images may be edited without changing the map
+            for name, stamp in manifest[KEY_SOURCES].items():
+                if AtlasCache.stamp(os.path.join(map_dir, name)) != stamp:
+                    logging.warning(label_value('Atlas outdated', f"{cache_file} {name} changed"))
+                    return 0
+            pages = [
+                PIL.Image.open(os.path.join(map_dir, page)).convert('RGBA')
+                for page in manifest[KEY_PAGES]
+            ]
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(label_value('Atlas invalid', e))
+            return 0
+
+        image_data_cache = arcade.texture.default_texture_cache.image_data_cache
+        images = AtlasCache.images(tiled_map)
+        loaded = 0
+
+        for name, (page, x, y, width, height) in manifest[KEY_IMAGES].items():
+            # Pages built before the variants changed may hold images the map doesn't use
+            if name not in images:
+                continue
+
+            # Same cache name as the tilemap uses when loading the image file
+            cache_name = arcade.Texture.create_image_cache_name(Path(map_dir, name))
+
+            if image_data_cache.get(cache_name):
+                continue
+
+            image = pages[page].crop((x, y, x + width, y + height))
+            image_data_cache.put(cache_name, arcade.texture.ImageData(image))
+            loaded += 1
+
+        logging.info(label_value('Atlas loaded', cache_file))
+
+        return loaded
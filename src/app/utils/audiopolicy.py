@@ -0,0 +1,115 @@
+""" Streaming policy per sound category """
+
+import logging
+import os
+
+from app.constants.audio import AUDIO_POLICIES, AUDIO_DECODED_BYTES_PER_SECOND
+from app.utils.mp3 import mp3_duration
+from app.utils.string import label_value
+
+
+class AudioPolicy:
+    """
+    Decides per sound category whether a sound is streamed or decoded into memory.
+    The decoded size is estimated from the MP3 frame headers before loading,
+    so short sounds play without latency and long tracks keep memory small.
+    """
+
+    def __init__(self):
+        """ Constructor """
+
+        self._streaming = True
+        self._policies = AUDIO_POLICIES
+        self._sizes = {}
+
+    def setup(self, streaming: bool = True, policies: dict | None = None):
+        """
+        Setup policy
+        @param streaming: If disabled all sounds are decoded into memory
+        @param policies: Policy by category
+        @return: self
+        """
+
+        self._streaming = streaming
+        self._policies = policies or AUDIO_POLICIES
+
+        return self
+
+    def decoded_size(self, path: str) -> int | None:
+        """
+        Estimated decoded size of a sound
+        @param path: Path to sound file
+        @return: Bytes, None if the file isn't readable
+        """
+
+        if path in self._sizes:
+            return self._sizes[path]
+
+        try:
+            if path.lower().endswith('.mp3'):
+                size = int(mp3_duration(path) * AUDIO_DECODED_BYTES_PER_SECOND)
+            else:
+                size = os.path.getsize(path)
+        except OSError:
+            size = None
+
+        self._sizes[path] = size
+
+        return size
+
+    def streaming(self, path: str, category: str) -> bool:
+        """
+        Check if a sound should be streamed
+        @param path: Path to sound file
+        @param category: Sound category
+        @return: True if streamed
+        """
+
+        if not self._streaming:
+            return False
+
+        # Sounds of unknown size are never preloaded
+        size = self.decoded_size(path)
+        streaming = size is None or size > self._policies[category]['max_decoded_per_sound']
+
+        logging.debug(label_value(f"Streaming {category}", f"{os.path.basename(path)} {streaming}"))
+
+        return streaming
+
+    def budget(self, category: str) -> int | None:
+        """
+        Maximum decoded size of the cached sounds of a category
+        @param category: Sound category
+        @return: Bytes, None if only the budget of the whole cache applies
+        """
+
+        # Without streaming every sound is decoded, so only the cache budget applies
+        if not self._streaming:
+            return None
+
+        return self._policies[category]['max_decoded']
+
+    def preload(self, root_dir: str, **kwargs) -> list:
+        """
+        Sounds to decode while a level is loading
+        @param root_dir: Root directory
+        @param kwargs: Placeholders in the preload paths like map_name
+        @return: List of (path, category) of sounds which are not streamed
+        """
+
+        sounds = []
+
+        for category, policy in self._policies.items():
+            for file in policy['preload']:
+                path = os.path.join(root_dir, 'resources', *file.format(**kwargs).split('/'))
+
+                if not self.streaming(path, category):
+                    sounds.append((path, category))
+
+        return sounds
+
+    @property
+    def enabled(self) -> bool:
+        """ Streaming is enabled """
+
+        return self._streaming
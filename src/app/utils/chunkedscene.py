@@ -0,0 +1,198 @@
+""" Chunked scene with camera culling """
+
+import math
+
+import arcade
+import pytiled_parser
+from pyglet.math import Mat4, Vec3
+
+CHUNK_COLUMNS = 16
+
+
+class Chunk:
+    """ A fixed-width column chunk of a layer """
+
+    def __init__(self, sprite_list: arcade.SpriteList):
+        """ Constructor """
+
+        self.sprite_list = sprite_list
+        self.left = math.inf
+        self.right = -math.inf
+
+    def append(self, sprite: arcade.Sprite) -> None:
+        """ Add a sprite and extend the chunk bounds """
+
+        self.sprite_list.append(sprite)
+        self.left = min(self.left, sprite.left)
+        self.right = max(self.right, sprite.right)
+
+    def overlaps(self, left: float, right: float) -> bool:
+        """ Check if chunk overlaps the horizontal range """
+
+        return self.right >= left and self.left <= right
+
+
+class ChunkedScene(arcade.Scene):
+    """
+    Scene which splits static tile layers into column chunks.
+    Only chunks overlapping the camera are drawn and updated.
+    The original sprite lists stay intact for physics and effects.
+    """
+
+    def __init__(self) -> None:
+        """ Constructor """
+
+        super().__init__()
+
+        self._chunk_width = None
+        self._chunks = {}
+        self._overhang = {}
+        self._visible = {}
+        self._scroll = {}
+
+    @classmethod
+    def from_tilemap(
+            cls,
+            tilemap: arcade.TileMap,
+            exclude: list | None = None,
+            chunk_columns: int = CHUNK_COLUMNS
+    ) -> "ChunkedScene":
+        """
+        Create a chunked scene from a tilemap
+        @param tilemap: The tilemap
+        @param exclude: Names of dynamic layers which are not chunked
+        @param chunk_columns: Width of a chunk in tiles
+        """
+
+        scene = super().from_tilemap(tilemap)
+        scene._chunk_width = cls.chunk_width(tilemap, chunk_columns)
+
+        exclude = exclude or []
+
+        for layer in tilemap.tiled_map.layers:
+            if not isinstance(layer, pytiled_parser.TileLayer):
+                continue
+
+            if layer.name in exclude or layer.name not in scene:
+                continue
+
+            scene.chunk_layer(layer.name)
+
+        return scene
+
+    @staticmethod
+    def chunk_width(tilemap: arcade.TileMap, chunk_columns: int = CHUNK_COLUMNS) -> float:
+        """ Width of a chunk in pixels """
+
+        return chunk_columns * tilemap.tile_width * tilemap.scaling
+
+    def chunk_layer(self, name: str) -> None:
+        """ Split a layer into column chunks """
+
+        sprite_list = self[name]
+        chunks = {}
+        overhang = 0
+
+        for sprite in sprite_list:
+            index = int(sprite.left // self._chunk_width)
+
+            if index not in chunks:
+                chunks[index] = Chunk(
+                    arcade.SpriteList(atlas=sprite_list.atlas, lazy=True)
+                )
+
+            chunks[index].append(sprite)
+            overhang = max(overhang, sprite.width)
+
+        self._chunks[name] = chunks
+        self._overhang[name] = overhang
+        self._visible[name] = list(chunks.values())
+
+    def cull(self, camera: arcade.camera.Camera2D) -> None:
+        """ Select chunks which are visible to the camera """
+
+        x, _y = camera.position
+        left, right = x + camera.left, x + camera.right
+
+        for name, chunks in self._chunks.items():
+            first = int((left - self._overhang[name]) // self._chunk_width)
+            last = int(right // self._chunk_width)
+
+            self._visible[name] = [
+                chunks[index]
+                for index in range(first, last + 1)
+                if index in chunks and chunks[index].overlaps(left, right)
+            ]
+
+    def scroll_layer(self, name: str, offset: float, period: float) -> None:
+        """
+        Scroll a whole layer to the left when drawing it
+        @param name: The layer
+        @param offset: Horizontal scroll offset
+        @param period: Width after which the layer wraps around
+        """
+
+        self._scroll[name] = (offset % period, period)
+
+    def draw_scrolled(self, sprite_list: arcade.SpriteList, offset: float, period: float, **kwargs) -> None:
+        """ Draw a layer shifted by the offset and once more wrapped around """
+
+        ctx = sprite_list.ctx
+        view = ctx.view_matrix
+
+        for shift in (-offset, period - offset):
+            ctx.view_matrix = view @ Mat4.from_translation(Vec3(shift, 0, 0))
+            sprite_list.draw(**kwargs)
+
+        ctx.view_matrix = view
+
+    @property
+    def names(self) -> list:
+        """ Layer names in draw order """
+
+        names = {id(sprite_list): name for name, sprite_list in self._name_mapping.items()}
+
+        return [names[id(sprite_list)] for sprite_list in self._sprite_lists]
+
+    def update(self, delta_time: float, names=None, *args, **kwargs) -> None:
+        """ Update sprite lists and visible chunks only """
+
+        for name in names or self.names:
+            if name in self._chunks:
+                for chunk in self._visible[name]:
+                    chunk.sprite_list.update(delta_time, *args, **kwargs)
+                continue
+
+            self._name_mapping[name].update(delta_time, *args, **kwargs)
+
+    def update_animation(self, delta_time: float, names=None, *args, **kwargs) -> None:
+        """ Update animations of sprite lists and visible chunks only """
+
+        for name in names or self.names:
+            if name in self._chunks:
+                for chunk in self._visible[name]:
+                    chunk.sprite_list.update_animation(delta_time, *args, **kwargs)
+                continue
+
+            self._name_mapping[name].update_animation(delta_time, *args, **kwargs)
+
+    def draw(self, names=None, **kwargs) -> None:
+        """ Draw sprite lists and visible chunks only """
+
+        for name in names or self.names:
+            sprite_list = self._name_mapping[name]
+
+            if name in self._scroll:
+                self.draw_scrolled(sprite_list, *self._scroll[name], **kwargs)
+                continue
+
+            if name not in self._chunks:
+                sprite_list.draw(**kwargs)
+                continue
+
+            if not sprite_list.visible:
+                continue
+
+            for chunk in self._visible[name]:
+                chunk.sprite_list.alpha = sprite_list.alpha
+                chunk.sprite_list.draw(**kwargs)
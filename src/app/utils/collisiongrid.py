@@ -0,0 +1,202 @@
+""" Static collision grid of a tile layer """
+
+import logging
+import math
+
+import arcade
+import numpy
+import pytiled_parser
+
+from app.utils.string import label_value
+
+# Tiled stores flip flags in the upper bits of a GID
+GID_MASK = 0x0FFFFFFF
+
+
+class CollisionGrid:
+    """
+    Solid cells of a tile layer read from the raw tile data.
+    Answers point and area queries with cell lookups and merges
+    adjacent solid cells into larger rectangles for the physics engine.
+    Tiles which don't fill their cell keep their own sprite as collider.
+    Infinite maps store their tiles in chunks, all their sprites are colliders.
+    """
+
+    def __init__(self):
+        """ Constructor """
+
+        self._solid = numpy.zeros((0, 0), dtype=bool)
+        self._cell_size = 0
+        self._rectangles = []
+        self._walls = None
+
+    def setup(self, tilemap: arcade.TileMap, layer_name: str, sprite_list: arcade.SpriteList | None = None):
+        """
+        Build the grid
+        @param tilemap: The tilemap
+        @param layer_name: Name of the tile layer
+        @param sprite_list: Sprites of the layer
+        """
+
+        self._cell_size = tilemap.tile_width * tilemap.scaling
+
+        layer = self.find_layer(tilemap.tiled_map.layers, layer_name)
+
+        if layer and layer.data is None:
+            logging.warning(label_value(f"Collision grid {layer_name}", 'No tile data, using the tile sprites'))
+
+        data = numpy.array(layer.data if layer and layer.data is not None else [], dtype=numpy.uint32) & GID_MASK
+
+        full = numpy.array(sorted(self.full_cell_gids(tilemap.tiled_map)), dtype=numpy.uint32)
+        self._solid = numpy.isin(data, full) if data.size else numpy.zeros((0, 0), dtype=bool)
+        self._rectangles = self.merge(self._solid)
+
+        self._walls = arcade.SpriteList(use_spatial_hash=True)
+
+        for column, row, width, height in self._rectangles:
+            self._walls.append(self.rectangle_sprite(column, row, width, height))
+
+        # Irregular tiles like stools collide with their own hit box
+        for sprite in sprite_list or []:
+            if not self.is_full_cell(sprite):
+                self._walls.append(sprite)
+
+        logging.info(label_value(
+            f"Collision grid {layer_name}",
+            f"{int(self._solid.sum())} cells merged into {len(self._rectangles)} rectangles"
+        ))
+
+        return self
+
+    @staticmethod
+    def find_layer(layers: list, name: str) -> pytiled_parser.TileLayer | None:
+        """ Find a tile layer by name, also in layer groups """
+
+        for layer in layers:
+            if isinstance(layer, pytiled_parser.TileLayer) and layer.name == name:
+                return layer
+
+            if isinstance(layer, pytiled_parser.LayerGroup) and layer.layers:
+                found = CollisionGrid.find_layer(layer.layers, name)
+
+                if found:
+                    return found
+
+        return None
+
+    @staticmethod
+    def full_cell_gids(tiled_map: pytiled_parser.TiledMap) -> set:
+        """ GIDs of tiles which fill a whole cell """
+
+        tile_width, tile_height = tiled_map.tile_size
+        gids = set()
+
+        for firstgid, tileset in tiled_map.tilesets.items():
+            if tileset.image:
+                if (tileset.tile_width, tileset.tile_height) == (tile_width, tile_height):
+                    gids.update(range(firstgid, firstgid + tileset.tile_count))
+                continue
+
+            for tile_id, tile in (tileset.tiles or {}).items():
+                if (tile.width, tile.height) == (tile_width, tile_height):
+                    gids.add(firstgid + tile_id)
+
+        return gids
+
+    @staticmethod
+    def merge(solid: numpy.ndarray) -> list:
+        """
+        Merge solid cells into rectangles
+        Runs of a row are joined with equal runs of the rows below
+        @param solid: Grid of solid cells, row 0 is the top row
+        @return: List of (column, row, width, height) in cells
+        """
+
+        rectangles = []
+        open_runs = {}
+
+        for row in range(solid.shape[0] + 1):
+            runs = set()
+
+            if row < solid.shape[0]:
+                padded = numpy.concatenate(([False], solid[row], [False])).astype(numpy.int8)
+                edges = numpy.flatnonzero(numpy.diff(padded))
+                runs = set(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+
+            for run in list(open_runs):
+                if run not in runs:
+                    start_row = open_runs.pop(run)
+                    rectangles.append((run[0], start_row, run[1] - run[0], row - start_row))
+
+            for run in runs:
+                open_runs.setdefault(run, row)
+
+        return rectangles
+
+    def rectangle_sprite(self, column: int, row: int, width: int, height: int) -> arcade.Sprite:
+        """ Invisible sprite covering a rectangle of cells """
+
+        rows = self._solid.shape[0]
+        sprite = arcade.SpriteSolidColor(
+            width=round(width * self._cell_size),
+            height=round(height * self._cell_size),
+            color=arcade.color.TRANSPARENT_BLACK
+        )
+        sprite.left = column * self._cell_size
+        sprite.bottom = (rows - row - height) * self._cell_size
+
+        return sprite
+
+    def cell(self, x: float, y: float) -> tuple:
+        """ Column and row of a world position """
+
+        return int(x // self._cell_size), self._solid.shape[0] - 1 - int(y // self._cell_size)
+
+    def is_solid(self, x: float, y: float) -> bool:
+        """ Check if the cell at a world position is solid """
+
+        column, row = self.cell(x, y)
+        rows, columns = self._solid.shape
+
+        if not (0 <= row < rows and 0 <= column < columns):
+            return False
+
+        return bool(self._solid[row, column])
+
+    def any_solid(self, left: float, bottom: float, right: float, top: float) -> bool:
+        """
+        Check if any cell overlapping a world rectangle is solid
+        Cells which only touch its edges don't count, like colliders touching a sprite
+        """
+
+        if not self._solid.size:
+            return False
+
+        rows, columns = self._solid.shape
+        first_column = math.floor(left / self._cell_size)
+        last_column = math.ceil(right / self._cell_size) - 1
+        first_row = rows - math.ceil(top / self._cell_size)
+        last_row = rows - 1 - math.floor(bottom / self._cell_size)
+
+        cells = self._solid[
+            max(first_row, 0):max(min(last_row + 1, rows), 0),
+            max(first_column, 0):max(min(last_column + 1, columns), 0)
+        ]
+
+        return bool(cells.any())
+
+    def is_full_cell(self, sprite: arcade.Sprite) -> bool:
+        """ Check if a layer sprite is covered by the merged rectangles """
+
+        size = round(self._cell_size)
+
+        if (round(sprite.width), round(sprite.height)) != (size, size):
+            return False
+
+        return self.is_solid(sprite.center_x, sprite.center_y)
+
+    @property
+    def walls(self) -> arcade.SpriteList:
+        """ Colliders for the physics engine """
+
+        return self._walls
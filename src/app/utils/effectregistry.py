@@ -0,0 +1,59 @@
+""" Effect registry """
+
+import logging
+
+from app.effects.effect import Effect
+from app.utils.string import label_value
+
+
+class EffectRegistry:
+    """
+    One instance of each effect, shared by all views.
+    The resources of an effect are loaded when it's first lent,
+    later views only reset its state in setup.
+    """
+
+    def __init__(self):
+        """ Constructor """
+
+        self._effects = {}
+
+    def get(self, effect_class: type) -> Effect:
+        """
+        Lend the shared instance of an effect
+        @param effect_class: Effect subclass
+        @return: The effect
+        """
+
+        if effect_class not in self._effects:
+            logging.info(label_value('Effect created', effect_class.__name__))
+            self._effects[effect_class] = effect_class()
+
+        return self._effects[effect_class]
+
+    def lend(self, effect_classes: list, scene, tilemap, root_dir: str) -> list:
+        """
+        Lend and setup effects for a view
+        @param effect_classes: Effect subclasses
+        @param scene: The scene
+        @param tilemap: The tilemap
+        @param root_dir: Root directory
+        @return: List of effects
+        """
+
+        effects = [self.get(effect_class) for effect_class in effect_classes]
+
+        for effect in effects:
+            effect.setup(scene, tilemap, root_dir)
+
+        return effects
+
+    def clear(self) -> None:
+        """ Drop all effects """
+
+        self._effects = {}
+
+    def __len__(self) -> int:
+        """ Count of created effects """
+
+        return len(self._effects)
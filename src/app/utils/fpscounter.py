@@ -1,78 +1,76 @@
 """ FPSCounter """
-import logging
 
 import arcade
 
 from app.constants.fonts import FONT_CONSOLA_MONO
+from app.utils.hudtext import HudText
+from app.utils.timings import TIMING_FRAME
 
 FONT_SIZE_FPS = 14
 FONT_COLOR_FPS = arcade.csscolor.WHITE
-MAX_FPS_COUNT = 5000
 MARGIN = 10
 
+FPS_LENGTH = 4
+FRAME_TIME_LENGTH = 8
+
 
 class FPSCounter:
-    """ FPSCounter """
+    """ FPS and frame time counter """
 
     def __init__(self):
         """ Constructor """
-        self._fps_text = {}
+
         self._window = None
-        self._current_fps = None
-        self._fps_camera = None
+        self._hud = None
+        self._fps = None
+        self._frame_time = None
 
     def setup(self, window: arcade.Window):
         """ Setup FPSCounter """
 
-        self._fps_text = {}
         self._window = window
-        self._fps_camera = arcade.camera.Camera2D()
-        return self
+        self._hud = HudText().setup(
+            font_name=FONT_CONSOLA_MONO,
+            font_size=FONT_SIZE_FPS,
+            color=FONT_COLOR_FPS
+        )
 
-    def update(self) -> None:
-        """ Update fps counter """
+        self._fps = self._hud.add(0, 0, FPS_LENGTH)
+        self._frame_time = self._hud.add(0, 0, FRAME_TIME_LENGTH)
+        self.layout(window.height)
 
-        if not arcade.timings_enabled():
-            self._current_fps = None
-            return
+        return self
 
-        fps = round(arcade.get_fps())
+    def layout(self, height: int) -> None:
+        """ Place the counters at the top left """
 
-        # if current_fps is unchanged return here
-        if str(fps) == self._current_fps:
-            return
+        bottom = height - MARGIN - self._hud.height
 
-        self._current_fps = str(fps)
+        self._hud.move(self._fps, MARGIN, bottom)
+        self._hud.move(self._frame_time, MARGIN + self._hud.advance * (FPS_LENGTH + 1), bottom)
 
-        fps_text = arcade.Text(
-            self._current_fps,
-            font_name=FONT_CONSOLA_MONO,
-            font_size=FONT_SIZE_FPS,
-            color=FONT_COLOR_FPS,
-            x=0,
-            y=0
-        )
+    def on_resize(self, width: int, height: int) -> None:
+        """ Place the counters again after a resize """
 
-        fps_text.x = MARGIN
-        fps_text.y = self._window.height - MARGIN - fps_text.content_height / 2
+        self._hud.on_resize(width, height)
+        self.layout(height)
 
-        self._fps_text[self._current_fps] = fps_text
+    def update(self) -> None:
+        """ Update fps counter """
 
-        fps_text_len = len(self._fps_text)
-        if fps_text_len >= MAX_FPS_COUNT:
-            keys = list(self._fps_text.keys())[-MAX_FPS_COUNT:]
+        if not arcade.timings_enabled():
+            self._hud.set(self._fps, '')
+            self._hud.set(self._frame_time, '')
+            return
 
-            new_dict = {}
+        self._hud.set(self._fps, str(round(arcade.get_fps())))
 
-            for key in keys:
-                new_dict[key] = self._fps_text[key]
+        frame_time = self._window.timings.last(TIMING_FRAME)
 
-            self._fps_text = new_dict
-            logging.info('More than MAX_FPS_COUNT')
+        if frame_time is not None:
+            self._hud.set(self._frame_time, f"{frame_time * 1000:.1f} ms")
 
     def draw(self):
         """ Draw fps counter text """
 
-        self._fps_camera.use()
-        if self._current_fps and self._current_fps in self._fps_text:
-            self._fps_text[self._current_fps].draw()
+        self._hud.draw()
@@ -0,0 +1,192 @@
+""" HUD text drawn from pre-rendered glyphs """
+
+import string
+
+import arcade
+
+from app.constants.fonts import FONT_CONSOLA_MONO
+
+HUD_GLYPHS = string.digits + string.ascii_letters + ' .,:;-+/%()'
+HUD_GLYPH_PREFIX = 'hud'
+
+
+class HudText:
+    """
+    Counters and short labels for overlays.
+    Every glyph is rendered into the texture atlas once at setup.
+    A field is a fixed row of sprites, changing its text only swaps
+    their textures, so no text or texture is created afterwards
+    and all fields are drawn in one batch.
+    """
+
+    def __init__(self):
+        """ Constructor """
+
+        self._camera = None
+        self._sprites = None
+        self._glyphs = {}
+        self._fields = []
+        self._texts = []
+
+    def setup(
+            self,
+            font_name: str = FONT_CONSOLA_MONO,
+            font_size: float = 14,
+            color=arcade.csscolor.WHITE,
+            glyphs: str = HUD_GLYPHS
+    ):
+        """
+        Render the glyphs
+        @param font_name: Font name
+        @param font_size: Font size
+        @param color: Text color
+        @param glyphs: Characters which can be shown
+        @return: self
+        """
+
+        atlas = arcade.get_window().ctx.default_atlas
+
+        self._camera = arcade.camera.Camera2D()
+        self._sprites = arcade.SpriteList(atlas=atlas)
+        self._fields = []
+        self._texts = []
+
+        self._glyphs = {
+            glyph: self.render_glyph(glyph, font_name, font_size, color, atlas)
+            for glyph in dict.fromkeys(' ' + glyphs)
+        }
+
+        return self
+
+    @staticmethod
+    def render_glyph(glyph: str, font_name: str, font_size: float, color, atlas) -> arcade.Texture:
+        """
+        Render a glyph into the atlas
+        @param glyph: Character
+        @param font_name: Font name
+        @param font_size: Font size
+        @param color: Text color
+        @param atlas: Texture atlas
+        @return: Texture as wide as the advance of the glyph
+        """
+
+        text = arcade.Text(
+            glyph,
+            x=0,
+            y=0,
+            color=color,
+            font_name=font_name,
+            font_size=font_size,
+            anchor_y='baseline'
+        )
+
+        size = (max(int(text.right - text.left), 1), max(int(text.top - text.bottom), 1))
+        text.y = -text.bottom
+
+        # Named by font, so setting up again reuses the atlas region
+        name = '-'.join(map(str, [HUD_GLYPH_PREFIX, font_name, font_size, tuple(color), glyph]))
+        texture = arcade.Texture.create_empty(name, size)
+
+        atlas.add(texture)
+        with atlas.render_into(texture) as fbo:
+            fbo.clear(color=arcade.color.TRANSPARENT_BLACK)
+            text.draw()
+
+        return texture
+
+    def add(self, x: float, y: float, length: int) -> int:
+        """
+        Add a field
+        @param x: Left
+        @param y: Bottom
+        @param length: Maximum count of characters
+        @return: Index of the field
+        """
+
+        sprites = []
+
+        for _ in range(length):
+            sprite = arcade.Sprite(self._glyphs[' '])
+            sprite.visible = False
+
+            sprites.append(sprite)
+            self._sprites.append(sprite)
+
+        self._fields.append([x, y, sprites])
+        self._texts.append('')
+
+        return len(self._fields) - 1
+
+    def move(self, field: int, x: float, y: float) -> None:
+        """ Move a field """
+
+        self._fields[field][0] = x
+        self._fields[field][1] = y
+
+        text = self._texts[field]
+        self._texts[field] = None
+        self.set(field, text)
+
+    def set(self, field: int, text: str) -> None:
+        """
+        Change the text of a field
+        @param field: Index of the field
+        @param text: Text, unknown characters are skipped and it is cut to the length of the field
+        """
+
+        if text == self._texts[field]:
+            return
+
+        self._texts[field] = text
+        x, y, sprites = self._fields[field]
+
+        i = 0
+
+        for glyph in text:
+            texture = self._glyphs.get(glyph)
+
+            if texture is None:
+                continue
+
+            if i == len(sprites):
+                break
+
+            sprite = sprites[i]
+            sprite.texture = texture
+            sprite.left = x
+            sprite.bottom = y
+            sprite.visible = True
+
+            x += texture.width
+            i += 1
+
+        for sprite in sprites[i:]:
+            sprite.visible = False
+
+    def text(self, field: int) -> str:
+        """ Current text of a field """
+
+        return self._texts[field]
+
+    @property
+    def height(self) -> int:
+        """ Line height """
+
+        return max((glyph.height for glyph in self._glyphs.values()), default=0)
+
+    @property
+    def advance(self) -> int:
+        """ Width of a digit """
+
+        return self._glyphs['0'].width if '0' in self._glyphs else 0
+
+    def on_resize(self, width: int, height: int) -> None:
+        """ Match the camera to the resized window """
+
+        self._camera.match_screen(and_position=True)
+
+    def draw(self) -> None:
+        """ Draw all fields """
+
+        self._camera.use()
+        self._sprites.draw()
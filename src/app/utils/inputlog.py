@@ -0,0 +1,243 @@
+""" Per-tick input frames and their binary log """
+
+import logging
+import os
+import struct
+import time
+from typing import NamedTuple
+
+import userpaths
+from arcade import FACE_LEFT, FACE_RIGHT
+
+from app.constants.gameinfo import DIRECTORY_GAME_NAME
+from app.utils.string import label_value
+
+INPUT_LOG_MAGIC = b'AMRI'
+INPUT_LOG_VERSION = 2
+INPUT_LOG_EXTENSION = '.input'
+
+# Magic, version, update rate, random seed, map name
+HEADER = struct.Struct('<4sBHI32s')
+
+# Tick the level was completed at or -1, count of checkpoints
+RESULT = struct.Struct('<iI')
+
+# Player position every CHECKPOINT_INTERVAL ticks
+CHECKPOINT = struct.Struct('<ff')
+CHECKPOINT_INTERVAL = 60
+
+# Run length encoded: count of ticks, input flags
+RUN = struct.Struct('<HB')
+RUN_MAX = 0xFFFF
+
+FLAG_LEFT = 1
+FLAG_RIGHT = 2
+FLAG_JUMP = 4
+FLAG_SPRINT = 8
+
+
+class InputFrame(NamedTuple):
+    """ The input state of one fixed update tick """
+
+    move_horizontal: int | None = None
+    jump: bool = False
+    sprint: bool = False
+
+    def to_flags(self) -> int:
+        """ Encode as bit flags """
+
+        flags = 0
+
+        if self.move_horizontal == FACE_LEFT:
+            flags |= FLAG_LEFT
+        elif self.move_horizontal == FACE_RIGHT:
+            flags |= FLAG_RIGHT
+
+        if self.jump:
+            flags |= FLAG_JUMP
+
+        if self.sprint:
+            flags |= FLAG_SPRINT
+
+        return flags
+
+    @staticmethod
+    def from_flags(flags: int):
+        """ Decode from bit flags """
+
+        move_horizontal = None
+
+        if flags & FLAG_LEFT:
+            move_horizontal = FACE_LEFT
+        elif flags & FLAG_RIGHT:
+            move_horizontal = FACE_RIGHT
+
+        return InputFrame(move_horizontal, bool(flags & FLAG_JUMP), bool(flags & FLAG_SPRINT))
+
+
+class InputLog:
+    """
+    Input frames of a play session, one per fixed update tick.
+    Together with the map, update rate and random seed it's
+    enough to simulate the session again. The player positions
+    at checkpoints and the tick the level was completed at
+    are recorded too, to check that a replay reaches the same states.
+    """
+
+    def __init__(self, map_name: str = '', update_rate: int = 0, seed: int = 0):
+        """
+        Constructor
+        @param map_name: The map
+        @param update_rate: Fixed updates per second
+        @param seed: The random seed
+        """
+
+        self.map_name = map_name
+        self.update_rate = update_rate
+        self.seed = seed
+        self.checkpoints = []
+        self.completed_tick = None
+        self._flags = bytearray()
+
+    def record(self, frame: InputFrame) -> None:
+        """ Append the input frame of a tick """
+
+        self._flags.append(frame.to_flags())
+
+    def record_state(self, position: tuple, completed: bool) -> None:
+        """
+        Record the state after the latest tick
+        @param position: Player position
+        @param completed: The level is completed
+        """
+
+        tick = len(self._flags)
+
+        if completed and self.completed_tick is None:
+            self.completed_tick = tick
+
+        if tick % CHECKPOINT_INTERVAL == 0:
+            # Stored as in the file, so it compares equal after saving
+            self.checkpoints.append(CHECKPOINT.unpack(CHECKPOINT.pack(*position)))
+
+    def matches(self, other) -> bool:
+        """
+        Check if a simulation of the same input reached the same states
+        @param other: InputLog recorded while replaying this one
+        @return: Same positions at all common checkpoints and same completion tick
+        """
+
+        count = min(len(self.checkpoints), len(other.checkpoints))
+
+        return (
+            self.checkpoints[:count] == other.checkpoints[:count]
+            and self.completed_tick == other.completed_tick
+        )
+
+    def encode(self) -> bytes:
+        """ Encode as binary log """
+
+        data = bytearray(HEADER.pack(
+            INPUT_LOG_MAGIC,
+            INPUT_LOG_VERSION,
+            self.update_rate,
+            self.seed,
+            self.map_name.encode('utf-8')
+        ))
+
+        data += RESULT.pack(-1 if self.completed_tick is None else self.completed_tick, len(self.checkpoints))
+
+        for position in self.checkpoints:
+            data += CHECKPOINT.pack(*position)
+
+        i = 0
+        while i < len(self._flags):
+            flags = self._flags[i]
+            count = 1
+
+            while i + count < len(self._flags) and self._flags[i + count] == flags and count < RUN_MAX:
+                count += 1
+
+            data += RUN.pack(count, flags)
+            i += count
+
+        return bytes(data)
+
+    @staticmethod
+    def decode(data: bytes):
+        """
+        Decode a binary log
+        @param data: The binary log
+        @return: InputLog
+        """
+
+        magic, version, update_rate, seed, map_name = HEADER.unpack_from(data)
+
+        if magic != INPUT_LOG_MAGIC or version not in (1, INPUT_LOG_VERSION):
+            raise ValueError('Unsupported input log')
+
+        log = InputLog(map_name.rstrip(b'\0').decode('utf-8'), update_rate, seed)
+        offset = HEADER.size
+
+        # Logs of version 1 have no states
+        if version >= 2:
+            completed_tick, count = RESULT.unpack_from(data, offset)
+            offset += RESULT.size
+
+            log.completed_tick = None if completed_tick < 0 else completed_tick
+            log.checkpoints = list(CHECKPOINT.iter_unpack(data[offset:offset + count * CHECKPOINT.size]))
+            offset += count * CHECKPOINT.size
+
+        for count, flags in RUN.iter_unpack(data[offset:]):
+            log._flags += bytes([flags]) * count
+
+        return log
+
+    @staticmethod
+    def recording_path() -> str:
+        """ New timestamped path in the recordings directory """
+
+        recordings_dir = os.path.join(userpaths.get_my_documents(), DIRECTORY_GAME_NAME, 'recordings')
+
+        if not os.path.exists(recordings_dir):
+            os.makedirs(recordings_dir)
+
+        return os.path.join(recordings_dir, time.strftime("%Y%m%d-%H%M%S") + INPUT_LOG_EXTENSION)
+
+    def save(self, path: str | None = None) -> str:
+        """
+        Save the binary log
+        @param path: Path to file, defaults to a new file in the recordings directory
+        @return: Path to file
+        """
+
+        if not path:
+            path = self.recording_path()
+
+        with open(path, 'wb') as f:
+            f.write(self.encode())
+
+        logging.info(label_value('Input saved', path))
+
+        return path
+
+    @staticmethod
+    def load(path: str):
+        """
+        Load a binary log
+        @param path: Path to file
+        @return: InputLog
+        """
+
+        with open(path, 'rb') as f:
+            return InputLog.decode(f.read())
+
+    def __iter__(self):
+        """ Iterate input frames """
+
+        return (InputFrame.from_flags(flags) for flags in self._flags)
+
+    def __len__(self) -> int:
+        """ Count of ticks """
+
+        return len(self._flags)
@@ -0,0 +1,84 @@
+""" Anchored layout of static sprites """
+
+ANCHOR_LEFT = 'left'
+ANCHOR_RIGHT = 'right'
+ANCHOR_BOTTOM = 'bottom'
+ANCHOR_TOP = 'top'
+ANCHOR_CENTER = 'center'
+
+
+class Layout:
+    """
+    Sprites anchored to the edges or the center of the window.
+    They are only positioned again if the window was resized
+    or their content changed, not on every frame.
+    """
+
+    def __init__(self):
+        """ Constructor """
+
+        self._anchors = []
+        self._size = None
+        self._dirty = True
+
+    def add(self, sprite, x: str = ANCHOR_CENTER, y: str = ANCHOR_CENTER, margin: float = 0):
+        """
+        Anchor a sprite
+        @param sprite: The sprite
+        @param x: ANCHOR_LEFT, ANCHOR_CENTER or ANCHOR_RIGHT
+        @param y: ANCHOR_BOTTOM, ANCHOR_CENTER or ANCHOR_TOP
+        @param margin: Distance to the edges
+        @return: The sprite
+        """
+
+        self._anchors.append((sprite, x, y, margin))
+        self._dirty = True
+
+        return sprite
+
+    def remove(self, sprite) -> None:
+        """ Remove the anchor of a sprite """
+
+        self._anchors = [anchor for anchor in self._anchors if anchor[0] is not sprite]
+
+    def invalidate(self) -> None:
+        """ Position all sprites on the next update, call it if a sprite's size changed """
+
+        self._dirty = True
+
+    def update(self, width: int, height: int) -> bool:
+        """
+        Position the sprites if anything changed
+        @param width: Window width
+        @param height: Window height
+        @return: True if the sprites were positioned
+        """
+
+        if not self._dirty and self._size == (width, height):
+            return False
+
+        self._size = (width, height)
+        self._dirty = False
+
+        for sprite, x, y, margin in self._anchors:
+            self.apply(sprite, x, y, margin, width, height)
+
+        return True
+
+    @staticmethod
+    def apply(sprite, x: str, y: str, margin: float, width: int, height: int) -> None:
+        """ Position a sprite by its anchors """
+
+        if x == ANCHOR_LEFT:
+            sprite.left = margin
+        elif x == ANCHOR_RIGHT:
+            sprite.right = width - margin
+        else:
+            sprite.center_x = width / 2
+
+        if y == ANCHOR_BOTTOM:
+            sprite.bottom = margin
+        elif y == ANCHOR_TOP:
+            sprite.top = height - margin
+        else:
+            sprite.center_y = height / 2
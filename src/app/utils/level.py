@@ -4,36 +4,57 @@ import logging
 import os
 
 import arcade
-import pyglet
 from arcade import FACE_RIGHT, FACE_LEFT
 
+from app.constants.audio import AUDIO_MUSIC, AUDIO_ATMO
 from app.constants.layers import (
     LAYER_PLAYER,
     LAYER_WALL,
+    LAYER_BUSH,
     LAYERS_VOICEOVER,
-    LAYER_FIRST_VOICEOVER, LAYER_FADEOUT
+    LAYER_FIRST_VOICEOVER, LAYER_FADEOUT,
+    LAYERS_DYNAMIC,
+    LAYERS_SIMULATED
 )
 from app.effects.bushes import Bushes
 from app.effects.cloudanimation import CloudAnimation
 from app.effects.filmgrain import Filmgrain
 from app.effects.particles import Particles
+from app.utils.atlascache import AtlasCache
 from app.utils.audiovolumes import AudioVolumes
 from app.utils.callbacks import Callbacks
+from app.utils.chunkedscene import ChunkedScene
+from app.utils.collisiongrid import CollisionGrid
+from app.utils.mapcache import MapCache
+from app.utils.texturevariants import TextureVariants
+from app.utils.tileclassifier import TileClassifier
+from app.utils.timings import (
+    TIMING_PHYSICS,
+    TIMING_SCENE_UPDATE,
+    TIMING_SCENE_DRAW,
+    TIMING_COLLISIONS,
+    TIMING_FADES,
+    TIMING_SUBTITLES
+)
+from app.utils.triggerindex import TriggerIndex
 from app.utils.voiceovertriggers import VoiceOverTiggers
 
 from app.views.tobecontinued import ToBeContinued
 
 VIEWPORT_BASE_H = 1440
-PLAYER_MOVE_SPEED = 4
-PLAYER_JUMP_SPEED = 14
+
+# Speeds and gravity per tick. The player used to be moved by its velocity
+# once more on every frame, so they are doubled to keep the movement the same.
+PLAYER_MOVE_SPEED = 8
+PLAYER_JUMP_SPEED = 28
 PLAYER_MOVE_ANGLE = 2
 
 MODIFIER_WALK = 1.0
 MODIFIER_SPRINT = 1.0
 MODIFIER_SPEECH = MODIFIER_WALK
 
-GRAVITY_SLOWMO = 0.001
-GRAVITY_DEFAULT = 0.8
+GRAVITY_SLOWMO = 0.002
+GRAVITY_DEFAULT = 1.6
 
 ALPHA_SPEED = 2
 ALPHA_MAX = 255
@@ -42,6 +63,9 @@ LIGHT_LAUNCHING_MOVEMENT_SPEED = 10
 LIGHT_LAUNCHING_ROTATING_SPEED = 5
 LIGHT_COLLISION_CHECK_THRESHOLD = 100
 
+# Distance below the player in which a wall counts as ground
+GROUND_DISTANCE = 5
+
 VOLUME_MUSIC_MODIFIER = 0.4
 VOLUME_ATMO_MODIFIER = 0.1
 
@@ -57,12 +81,19 @@ class Level:
         self.tilemap = None
         self._camera = None
         self._physics_engine = None
+        self._collision_grid = None
+        self._tiles = None
         self._can_walk = False
         self._launching_sprite = None
         self._voiceover_triggers = None
+        self._subtitles = None
+        self._trigger_index = None
         self._music = None
         self._atmo = None
         self._animations = []
+        self._update_layers = []
+        self._timings = None
+        self._completed = False
 
         self._root_dir = None
 
@@ -71,67 +102,174 @@ class Level:
         """ Setup level """
 
         self._root_dir = root_dir
-        path = os.path.join(root_dir, 'resources', 'maps', f"{map_name}.tmx")
+        self._timings = arcade.get_window().timings
 
-        self.load_tilemap(path)
+        self.load_tilemap(self.map_path(root_dir, map_name))
 
         self._camera = arcade.camera.Camera2D()
+        self._trigger_index = TriggerIndex(LIGHT_COLLISION_CHECK_THRESHOLD).setup(
+            self._scene,
+            LAYERS_VOICEOVER
+        )
 
         self.setup_physics_engine()
         self.wait_for_begin()
 
         # TODO: play music by map triggers
         music_file = os.path.join(root_dir, 'resources', 'music', 'BeforeDawn.mp3')
-        music = arcade.load_sound(music_file, streaming=audio_volumes.streaming)
+        sounds = arcade.get_window().sounds
+
+        music = sounds.load(music_file, AUDIO_MUSIC)
         self._music = music.play(volume=audio_volumes.volume_music * VOLUME_MUSIC_MODIFIER)
 
         atmo_file = os.path.join(root_dir, 'resources', 'sounds', 'atmos', f"{map_name}.mp3")
-        atmo = arcade.load_sound(atmo_file, streaming=audio_volumes.streaming)
+        atmo = sounds.load(atmo_file, AUDIO_ATMO)
         self._atmo = atmo.play(volume=audio_volumes.volume_sound * VOLUME_ATMO_MODIFIER, loop=True)
 
         callbacks = Callbacks(on_level_completed=self.on_level_completed)
-        self._voiceover_triggers = VoiceOverTiggers().setup(callbacks=callbacks)
+        self._voiceover_triggers = VoiceOverTiggers().setup(
+            callbacks=callbacks,
+            tick_rate=round(1 / arcade.get_window().fixed_delta_time)
+        )
+        self._subtitles = arcade.get_window().subtitles
+        self._subtitles.update(None, 0)
         self.scroll_to_player()
-        self._animations = [
-            Particles(),
-            CloudAnimation(),
-            Bushes(),
-            Filmgrain()
-        ]
-
-        for animation in self._animations:
-            animation.setup(self._scene, self.tilemap, root_dir)
+        self._animations = arcade.get_window().effects.lend(
+            [Particles, CloudAnimation, Bushes, Filmgrain],
+            self._scene,
+            self.tilemap,
+            root_dir
+        )
 
     def setup_physics_engine(self):
         """ Setup physics engine """
 
+        # Wall queries use merged rectangles of the tile grid
+        self._collision_grid = CollisionGrid().setup(
+            self.tilemap,
+            LAYER_WALL,
+            [*self._scene[LAYER_WALL], *self._tiles.collide_only.get(LAYER_WALL, [])]
+        )
+
         self._physics_engine = arcade.PhysicsEnginePlatformer(
             self.player,
             ladders=None,
-            walls=self._scene[LAYER_WALL],
+            walls=self._collision_grid.walls,
             gravity_constant=GRAVITY_SLOWMO
         )
 
-    def load_tilemap(self, path):
-        """ Load tilemap """
+    def preload(self, root_dir: str, map_name: str) -> list:
+        """
+        Decode map, textures and sounds on a worker thread
+        @return: List of OpenGL upload steps for the main thread
+        """
+
+        self.tilemap = self.read_tilemap(self.map_path(root_dir, map_name), lazy=True)
+
+        sounds = arcade.get_window().sounds
+
+        # Short sounds are decoded now to play without latency
+        for path, category in sounds.policy.preload(root_dir, map_name=map_name):
+            sounds.load(path, category)
+
+        atlas = arcade.get_window().ctx.default_atlas
+
+        textures = {}
+        for sprite_list in self.tilemap.sprite_lists.values():
+            for sprite in sprite_list:
+                textures[id(sprite.texture)] = sprite.texture
+
+        uploads = [lambda texture=texture: atlas.add(texture) for texture in textures.values()]
+        uploads += [sprite_list.initialize for sprite_list in self.tilemap.sprite_lists.values()]
+
+        return uploads
+
+    @staticmethod
+    def map_path(root_dir: str, map_name: str) -> str:
+        """ Path to map file """
+
+        return os.path.join(root_dir, 'resources', 'maps', f"{map_name}.tmx")
+
+    @staticmethod
+    def read_tilemap(path: str, lazy: bool = False) -> arcade.TileMap:
+        """ Read tilemap scaled to the window height """
 
         w, h = arcade.get_window().get_size()
         zoom = h / VIEWPORT_BASE_H
 
-        self.tilemap = arcade.load_tilemap(path, scaling=zoom)
-        self._scene = arcade.Scene.from_tilemap(self.tilemap)
+        # Use the precompiled map and atlas pages if available
+        checksum = MapCache.checksum(path)
+        tiled_map = MapCache.read(path, checksum)
+
+        # Large images are loaded at the size closest to the zoom
+        tiled_map, variants = TextureVariants.select(tiled_map, zoom)
+        AtlasCache.load(tiled_map, TextureVariants.tier(zoom) if variants else 1.0, checksum)
+
+        tilemap = arcade.TileMap(tiled_map=tiled_map, scaling=zoom, lazy=lazy)
+        TextureVariants.apply(tilemap, variants, zoom)
+
+        return tilemap
+
+    def load_tilemap(self, path):
+        """ Load tilemap """
+
+        # The tilemap may already be preloaded
+        if not self.tilemap:
+            self.tilemap = self.read_tilemap(path)
+
+        # Tiles which are never rendered don't enter the drawn sprite lists.
+        # Hidden bushes are kept since the bushes effect fades them in.
+        self._tiles = TileClassifier().strip(
+            self.tilemap,
+            collide_layers=[LAYER_WALL],
+            exclude=[*LAYERS_DYNAMIC, LAYER_BUSH]
+        )
+        self._scene = ChunkedScene.from_tilemap(self.tilemap, exclude=LAYERS_DYNAMIC)
+
+        # Sprite.update would move the player by its velocity once more on every frame
+        self._update_layers = [name for name in self._scene.names if name not in LAYERS_SIMULATED]
         self.player.alpha = 0
         self._music = None
 
-    def update(
+    def update(self, delta_time: float, window):
+        """ Update everything which doesn't affect the simulation """
+
+        self.player.alpha = min(self.player.alpha + ALPHA_SPEED, 255)
+        self.scroll_to_player()
+
+        with self._timings.measure(TIMING_SCENE_UPDATE):
+            # Only chunks visible to the camera are updated and drawn
+            self._scene.cull(self._camera)
+            self._scene.update(delta_time, names=self._update_layers)
+            self._scene.update_animation(delta_time)
+
+        with self._timings.measure(TIMING_FADES):
+            self.update_fade()
+
+        for animation in self._animations:
+            with self._timings.measure(f"effect.{animation.__class__.__name__}.update"):
+                animation.update(delta_time)
+
+        with self._timings.measure(TIMING_SUBTITLES):
+            self.update_subtitles()
+
+        if self._music and not self._music.playing:
+            self._music.delete()
+
+    def update_fixed(
             self,
-            delta_time: float,
-            window,
             move_horizontal: int = None,
             jump: bool = False,
             sprint: bool = False
     ):
-        """ Update """
+        """
+        Simulate one tick
+        Input and physics only run at the fixed rate, so a tick has
+        the same result regardless of the draw rate
+        """
+
+        if not self._can_walk:
+            self.wait_for_begin()
 
         if jump:
             self.jump()
@@ -143,25 +281,15 @@ class Level:
         else:
             self.move_stop()
 
-        self.player.alpha = min(self.player.alpha + ALPHA_SPEED, 255)
-        self.scroll_to_player()
-
-        self._scene.update(delta_time)
-        self._scene.update_animation(delta_time)
-        self.check_collision_lights(window.root_dir, window.audio_volumes)
-        self.update_collision_light()
-        self.update_fade()
-
-        for animation in self._animations:
-            animation.update(delta_time)
-
-        if self._music and not self._music.playing:
-            self._music.delete()
+        with self._timings.measure(TIMING_PHYSICS):
+            self._physics_engine.update()
 
-    def update_fixed(self):
-        """ On Fixed update """
+        self._voiceover_triggers.update_fixed()
 
-        self._physics_engine.update()
+        with self._timings.measure(TIMING_COLLISIONS):
+            window = arcade.get_window()
+            self.check_collision_lights(window.root_dir, window.audio_volumes)
+            self.update_collision_light()
 
     def scroll_to_player(self, camera_speed=1):
         """ Scroll the window to the player. """
@@ -178,10 +306,26 @@ class Level:
         """ Draw level """
 
         self._camera.use()
-        self._scene.draw()
+
+        with self._timings.measure(TIMING_SCENE_DRAW):
+            self._scene.draw()
 
         for animation in self._animations:
-            animation.draw()
+            with self._timings.measure(f"effect.{animation.__class__.__name__}.draw"):
+                animation.draw()
+
+        self._subtitles.draw()
+
+    def update_subtitles(self):
+        """ Show the subtitle at the media time of the playing voiceover """
+
+        media = self._voiceover_triggers.media
+
+        if not media:
+            self._subtitles.update(None, 0)
+            return
+
+        self._subtitles.update(self._voiceover_triggers.voiceover, media.time)
 
     def move_left(self, sprint: bool = False):
         """ Move left """
@@ -236,7 +380,7 @@ class Level:
         if not self._can_walk:
             return
 
-        if not self._physics_engine.can_jump():
+        if not self.on_ground():
             return
 
         speed = PLAYER_JUMP_SPEED
@@ -246,21 +390,53 @@ class Level:
 
         self._physics_engine.jump(speed)
 
+    def on_ground(self) -> bool:
+        """ Check if the player stands on a wall """
+
+        player = self.player
+
+        # Full cells are looked up in the grid, only irregular tiles need a collision check
+        if self._collision_grid.any_solid(player.left, player.bottom - GROUND_DISTANCE, player.right, player.bottom):
+            return True
+
+        return self._physics_engine.can_jump(GROUND_DISTANCE)
+
     @property
     def player(self):
         """ The player sprite """
 
         return self._scene[LAYER_PLAYER][0]
 
-    def wait_for_begin(self, dt: float = 0.0):
-        """ Wait for begin of level """
+    @property
+    def completed(self) -> bool:
+        """ All voiceovers were played """
+
+        return self._completed
+
+    @property
+    def can_walk(self) -> bool:
+        """ The player has landed and can walk """
+
+        return self._can_walk
+
+    @property
+    def lights(self) -> list:
+        """ Voiceover lights which weren't triggered yet """
+
+        return [
+            sprite
+            for layer in LAYERS_VOICEOVER if layer in self._scene
+            for sprite in self._scene[layer] if sprite is not self._launching_sprite
+        ]
 
-        if self._physics_engine.can_jump():
-            self._can_walk = True
-            self._physics_engine.gravity_constant = GRAVITY_DEFAULT
+    def wait_for_begin(self):
+        """ Wait until the player has landed """
+
+        if not self.on_ground():
             return
 
-        pyglet.clock.schedule_once(self.wait_for_begin, 1 / 4)
+        self._can_walk = True
+        self._physics_engine.gravity_constant = GRAVITY_DEFAULT
 
     def check_collision_lights(self, root_dir: str, volumes: AudioVolumes):
         """ Check for collisions with lights """
@@ -270,24 +446,24 @@ class Level:
 
         found = None
 
-        for layer in LAYERS_VOICEOVER:
-            if layer in self._scene:
-                for sprite in self._scene[layer]:
-                    if arcade.get_distance_between_sprites(
-                            self.player,
-                            sprite
-                    ) < LIGHT_COLLISION_CHECK_THRESHOLD:
-                        logging.info(f'Collided with {layer}')
-                        self._launching_sprite = sprite
-                        found = layer
-                        break
+        # Only check the lights next to the player
+        for layer, sprite in self._trigger_index.nearby(self.player):
+            if arcade.get_distance_between_sprites(
+                    self.player,
+                    sprite
+            ) < LIGHT_COLLISION_CHECK_THRESHOLD:
+                logging.info(f'Collided with {layer}')
+                self._trigger_index.remove(sprite)
+                self._launching_sprite = sprite
+                found = layer
+                break
 
         if not found:
             return
 
-        arcade.load_sound(
-            os.path.join(root_dir, 'resources', 'sounds', 'lights', 'missle-launch-001.mp3'),
-            streaming=volumes.streaming
+        # Short sound effect, decoded once and replayed from memory
+        arcade.get_window().sounds.load(
+            os.path.join(root_dir, 'resources', 'sounds', 'lights', 'missle-launch-001.mp3')
         ).play(volume=volumes.volume_sound)
 
         self._voiceover_triggers.playing = True
@@ -300,13 +476,7 @@ class Level:
             logging.error('No voiceovers left')
             return
 
-        pyglet.clock.schedule_once(
-            self._voiceover_triggers.play_voiceover,
-            2,
-            root_dir,
-            voiceover,
-            volumes
-        )
+        self._voiceover_triggers.schedule(voiceover, volumes)
 
     def update_collision_light(self):
         """ Update voiceover light """
@@ -373,6 +543,7 @@ class Level:
     def on_level_completed(self):
         """ Called when a level is completed """
 
+        self._completed = True
         w, h = arcade.get_window().get_size()
 
         # Add fade sprite to scene
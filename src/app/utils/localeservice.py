@@ -0,0 +1,162 @@
+""" Language, translations and localized resources """
+
+import gettext
+import logging
+import os
+
+from app.constants.gameinfo import DEFAULT_LOCALE
+from app.utils.mp3 import mp3_duration
+from app.utils.string import label_value
+
+VOICEOVER_EXTENSION = '.mp3'
+
+
+class LocaleService:
+    """
+    The language fallback chain, the translation catalog and the
+    voiceover files of every locale, resolved once at startup.
+    Looking up a voiceover or its length during gameplay is a dictionary access.
+    """
+
+    def __init__(self):
+        """ Constructor """
+
+        self._languages = []
+        self._translation = None
+        self._voiceovers = {}
+        self._durations = {}
+        self._paths = {}
+
+    def setup(self, root_dir: str, language: str):
+        """
+        Resolve a language
+        @param root_dir: Root directory
+        @param language: Language like de, de_DE.UTF-8 or a colon separated list
+        @return: self
+        """
+
+        self._languages = self.fallback_chain(language)
+
+        # Untranslated messages fall back to the English source text,
+        # not to the default locale
+        self._translation = gettext.translation(
+            'messages',
+            os.path.join(root_dir, 'resources', 'locales'),
+            languages=self.fallback_chain(language, default=False),
+            fallback=True
+        )
+
+        speech_dir = os.path.join(root_dir, 'resources', 'speech')
+        available = {
+            entry.name: self.scan(entry.path)
+            for entry in os.scandir(speech_dir) if entry.is_dir()
+        } if os.path.isdir(speech_dir) else {}
+
+        # Every locale falls back to the default locale for missing voiceovers
+        self._paths = {
+            locale: self.resolve(available, self.fallback_chain(locale))
+            for locale in available
+        }
+        self._voiceovers = self.resolve(available, self._languages)
+        self._durations = {voiceover: mp3_duration(path) for voiceover, path in self._voiceovers.items()}
+
+        logging.info(label_value('Languages', self._languages))
+
+        return self
+
+    @staticmethod
+    def fallback_chain(language: str, default: bool = True) -> list:
+        """
+        Languages to try in order
+        @param language: Language like de, de_DE.UTF-8 or a colon separated list
+        @param default: Append the default locale
+        @return: List like ['de_DE', 'de', DEFAULT_LOCALE]
+        """
+
+        chain = []
+
+        for entry in (language or '').split(':'):
+            code = entry.split('.')[0].split('@')[0]
+
+            if not code:
+                continue
+
+            chain += [code, code.split('_')[0]]
+
+        if default or not chain:
+            chain.append(DEFAULT_LOCALE)
+
+        return list(dict.fromkeys(chain))
+
+    @staticmethod
+    def scan(directory: str) -> dict:
+        """ Voiceover files of a locale by id """
+
+        return {
+            os.path.splitext(entry.name)[0]: entry.path
+            for entry in os.scandir(directory)
+            if entry.is_file() and entry.name.endswith(VOICEOVER_EXTENSION)
+        }
+
+    @staticmethod
+    def resolve(available: dict, languages: list) -> dict:
+        """
+        Merge the voiceovers of a fallback chain
+        @param available: Voiceover files by locale and id
+        @param languages: Fallback chain
+        @return: Path by voiceover id, the first language wins
+        """
+
+        paths = {}
+
+        for language in reversed(languages):
+            paths.update(available.get(language, {}))
+
+        return paths
+
+    def install(self):
+        """ Install the catalog as _() """
+
+        self._translation.install()
+
+        return self
+
+    def voiceover_path(self, voiceover: str, locale: str | None = None) -> str | None:
+        """
+        Path to a voiceover
+        @param voiceover: Voiceover id like text01
+        @param locale: Locale, defaults to the current language
+        @return: Path or None if there is none in any fallback language
+        """
+
+        if locale:
+            return self._paths.get(locale, {}).get(voiceover)
+
+        return self._voiceovers.get(voiceover)
+
+    def voiceover_duration(self, voiceover: str) -> float | None:
+        """
+        Length of a voiceover of the current language
+        @param voiceover: Voiceover id like text01
+        @return: Seconds or None if there is no voiceover
+        """
+
+        return self._durations.get(voiceover)
+
+    @property
+    def language(self) -> str:
+        """ Current language """
+
+        return self._languages[0]
+
+    @property
+    def languages(self) -> list:
+        """ Fallback chain of the current language """
+
+        return self._languages
+
+    @property
+    def voiceovers(self) -> dict:
+        """ Path by voiceover id for the current language """
+
+        return self._voiceovers
@@ -0,0 +1,192 @@
+""" Precompiled binary map cache """
+
+import hashlib
+import importlib.metadata
+import logging
+import os
+import pickle
+from pathlib import Path
+
+import attr
+import numpy
+import pytiled_parser
+
+from app.utils.string import label_value
+
+MAP_CACHE_EXTENSION = '.npz'
+MAP_CACHE_VERSION = 2
+
+KEY_CHECKSUM = 'checksum'
+KEY_VERSION = 'version'
+KEY_PARSER = 'parser'
+KEY_META = 'meta'
+KEY_LAYER = 'layer_'
+
+
+class MapCache:
+    """
+    Compiles Tiled TMX maps into a compact binary form.
+    Tile layers are stored as NumPy arrays, the remaining map data
+    (object groups, tileset references) is stored pickled.
+    Pickles are only read by the pytiled_parser version which wrote them.
+    """
+
+    @staticmethod
+    def cache_path(path: str) -> str:
+        """ Path of the compiled map next to the TMX file """
+
+        return os.path.splitext(path)[0] + MAP_CACHE_EXTENSION
+
+    @staticmethod
+    def checksum(path: str) -> str:
+        """ SHA-256 checksum of the source TMX """
+
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    @staticmethod
+    def parser_version() -> str:
+        """ Version of pytiled_parser whose classes are pickled """
+
+        return importlib.metadata.version('pytiled_parser')
+
+    @staticmethod
+    def compile(path: str) -> str:
+        """
+        Compile a TMX map
+        @param path: Path to TMX file
+        @return: Path to compiled map
+        """
+
+        tiled_map = pytiled_parser.parse_map(Path(path).resolve())
+        arrays = {}
+
+        tiled_map = attr.evolve(
+            tiled_map,
+            layers=MapCache._strip_layers(tiled_map.layers, arrays)
+        )
+
+        meta = pickle.dumps(tiled_map, protocol=pickle.HIGHEST_PROTOCOL)
+
+        cache_file = MapCache.cache_path(path)
+
+        with open(cache_file, 'wb') as f:
+            numpy.savez_compressed(
+                f,
+                **{
+                    KEY_CHECKSUM: numpy.array(MapCache.checksum(path)),
+                    KEY_VERSION: numpy.array(MAP_CACHE_VERSION),
+                    KEY_PARSER: numpy.array(MapCache.parser_version()),
+                    KEY_META: numpy.frombuffer(meta, dtype=numpy.uint8),
+                },
+                **arrays
+            )
+
+        logging.info(label_value('Map compiled', cache_file))
+
+        return cache_file
+
+    @staticmethod
+    def compile_all(maps_dir: str) -> list:
+        """ Compile all TMX maps in a directory """
+
+        compiled = []
+
+        for file in sorted(os.listdir(maps_dir)):
+            if file.endswith('.tmx'):
+                compiled.append(MapCache.compile(os.path.join(maps_dir, file)))
+
+        return compiled
+
+    @staticmethod
+    def load(path: str, checksum: str | None = None) -> pytiled_parser.TiledMap | None:
+        """
+        Load the compiled map if it matches the source TMX
+        @param path: Path to TMX file
+        @param checksum: Checksum of the TMX if already known
+        @return: The parsed map or None if there is no valid cache
+        """
+
+        cache_file = MapCache.cache_path(path)
+
+        if not os.path.isfile(cache_file):
+            return None
+
+        try:
+            with numpy.load(cache_file) as data:
+                if int(data[KEY_VERSION]) != MAP_CACHE_VERSION or str(data[KEY_PARSER]) != MapCache.parser_version():
+                    logging.info(label_value('Map cache outdated', cache_file))
+                    return None
+
+                if str(data[KEY_CHECKSUM]) != (checksum or MapCache.checksum(path)):
+                    logging.info(label_value('Map cache checksum mismatch', cache_file))
+                    return None
+
+                tiled_map = pickle.loads(data[KEY_META].tobytes())
+                layers = MapCache._restore_layers(tiled_map.layers, data)
+        except (
+                OSError,
+                ValueError,
+                KeyError,
+                EOFError,
+                AttributeError,
+                TypeError,
+                ImportError,
+                pickle.UnpicklingError
+        ) as e:
+            # Pickles of other library versions may not match the current classes
+            logging.error(label_value('Map cache invalid', e))
+            return None
+
+        return attr.evolve(tiled_map, map_file=Path(path).resolve(), layers=layers)
+
+    @staticmethod
+    def read(path: str, checksum: str | None = None) -> pytiled_parser.TiledMap:
+        """
+        Read a map from cache and fall back to the TMX file
+        @param path: Path to TMX file
+        @param checksum: Checksum of the TMX if already known
+        """
+
+        tiled_map = MapCache.load(path, checksum)
+
+        if tiled_map:
+            logging.info(label_value('Map loaded from cache', MapCache.cache_path(path)))
+            return tiled_map
+
+        return pytiled_parser.parse_map(Path(path).resolve())
+
+    @staticmethod
+    def _strip_layers(layers: list, arrays: dict) -> list:
+        """ Move tile data of layers into arrays """
+
+        stripped = []
+
+        for layer in layers:
+            if isinstance(layer, pytiled_parser.TileLayer) and layer.data is not None:
+                arrays[f"{KEY_LAYER}{layer.id}"] = numpy.array(layer.data, dtype=numpy.uint32)
+                layer = attr.evolve(layer, data=None)
+            elif isinstance(layer, pytiled_parser.LayerGroup) and layer.layers:
+                layer = attr.evolve(layer, layers=MapCache._strip_layers(layer.layers, arrays))
+
+            stripped.append(layer)
+
+        return stripped
+
+    @staticmethod
+    def _restore_layers(layers: list, data) -> list:
+        """ Restore tile data of layers from arrays """
+
+        restored = []
+
+        for layer in layers:
+            key = f"{KEY_LAYER}{layer.id}"
+
+            if isinstance(layer, pytiled_parser.TileLayer) and key in data:
+                layer = attr.evolve(layer, data=data[key].tolist())
+            elif isinstance(layer, pytiled_parser.LayerGroup) and layer.layers:
+                layer = attr.evolve(layer, layers=MapCache._restore_layers(layer.layers, data))
+
+            restored.append(layer)
+
+        return restored
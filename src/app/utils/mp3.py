@@ -0,0 +1,58 @@
+""" MP3 utils """
+
+# MPEG audio frame header tables for layer III
+MPEG_VERSION_1 = 3
+MPEG_BITRATES = {
+    MPEG_VERSION_1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    'lsf': [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MPEG_SAMPLE_RATES = {
+    MPEG_VERSION_1: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    0: [11025, 12000, 8000],
+}
+MPEG_LAYER_3 = 1
+
+
+def mp3_duration(path: str) -> float:
+    """
+    Length of an MP3 file from its frame headers
+    @param path: Path to MP3 file
+    @return: Seconds
+    """
+
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    offset = 0
+
+    # Skip ID3v2 tag
+    if data[:3] == b'ID3':
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        offset = 10 + size + (10 if data[5] & 0x10 else 0)
+
+    duration = 0.0
+
+    while offset + 4 <= len(data):
+        b1, b2 = data[offset + 1], data[offset + 2]
+
+        if data[offset] != 0xFF or b1 & 0xE0 != 0xE0:
+            break
+
+        version = (b1 >> 3) & 3
+        layer = (b1 >> 1) & 3
+        bitrate_index = b2 >> 4
+        sample_rate_index = (b2 >> 2) & 3
+
+        if layer != MPEG_LAYER_3 or version == 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+            break
+
+        bitrates = MPEG_BITRATES[MPEG_VERSION_1 if version == MPEG_VERSION_1 else 'lsf']
+        bitrate = bitrates[bitrate_index] * 1000
+        sample_rate = MPEG_SAMPLE_RATES[version][sample_rate_index]
+        samples = 1152 if version == MPEG_VERSION_1 else 576
+
+        offset += samples // 8 * bitrate // sample_rate + ((b2 >> 1) & 1)
+        duration += samples / sample_rate
+
+    return duration
@@ -0,0 +1,177 @@
+""" Vectorized particle system """
+
+import arcade
+import numpy
+
+VERTEX_SHADER = """
+#version 330
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+in vec2 in_position;
+in float in_radius;
+in vec4 in_color;
+
+out vec4 v_color;
+
+void main() {
+    gl_Position = window.projection * window.view * vec4(in_position, 0.0, 1.0);
+    gl_PointSize = in_radius * 2.0;
+    v_color = in_color;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+in vec4 v_color;
+
+out vec4 f_color;
+
+void main() {
+    // Soft circle
+    float distance = length(gl_PointCoord * 2.0 - 1.0);
+
+    if (distance > 1.0) {
+        discard;
+    }
+
+    f_color = vec4(v_color.rgb, v_color.a * (1.0 - distance));
+}
+"""
+
+# x, y, radius, r, g, b, a
+PARTICLE_FLOATS = 7
+COLUMN_X = 0
+COLUMN_Y = 1
+COLUMN_RADIUS = 2
+COLUMNS_COLOR = slice(3, 7)
+
+
+class ParticleSystem:
+    """
+    Particles stored in a NumPy array.
+    All particles are moved in one vectorized step and
+    uploaded to one buffer which is drawn as point sprites.
+    """
+
+    def __init__(self):
+        """ Constructor """
+
+        self._data = None
+        self._velocity = (0.0, 0.0)
+        self._respawn_x = 0
+        self._respawn_y = (0, 0)
+        self._rng = numpy.random.default_rng()
+
+        self._ctx = None
+        self._program = None
+        self._buffer = None
+        self._geometry = None
+
+    def setup(
+            self,
+            count: int,
+            area: tuple,
+            radius: tuple,
+            colors: list,
+            velocity: tuple = (0.0, 0.0),
+            respawn_y: tuple | None = None
+    ):
+        """
+        Setup particles
+        @param count: Count of particles
+        @param area: Spawn area as (left, right, bottom, top)
+        @param radius: Radius range as (min, max)
+        @param colors: List of RGBA colors to choose from
+        @param velocity: Movement per update as (x, y)
+        @param respawn_y: Y range for particles wrapped to the right
+        """
+
+        left, right, bottom, top = area
+
+        self._data = numpy.empty((count, PARTICLE_FLOATS), dtype=numpy.float32)
+        self._data[:, COLUMN_X] = self._rng.integers(left, right, count, endpoint=True)
+        self._data[:, COLUMN_Y] = self._rng.integers(bottom, top, count, endpoint=True)
+        self._data[:, COLUMN_RADIUS] = self._rng.integers(radius[0], radius[1], count, endpoint=True)
+
+        colors = numpy.array(colors, dtype=numpy.float32) / 255
+        self._data[:, COLUMNS_COLOR] = colors[self._rng.integers(0, len(colors), count)]
+
+        self._velocity = velocity
+        self._respawn_x = right
+        self._respawn_y = respawn_y or (bottom, top)
+
+        self.setup_gl()
+
+        return self
+
+    def setup_gl(self) -> None:
+        """ Create the GPU buffer and program, kept when set up again """
+
+        if self._buffer and self._buffer.size == self._data.nbytes:
+            return
+
+        self._ctx = arcade.get_window().ctx
+        self._program = self._ctx.program(
+            vertex_shader=VERTEX_SHADER,
+            fragment_shader=FRAGMENT_SHADER
+        )
+        self._buffer = self._ctx.buffer(reserve=self._data.nbytes)
+        self._geometry = self._ctx.geometry(
+            [
+                arcade.gl.BufferDescription(
+                    self._buffer,
+                    '2f 1f 4f',
+                    ['in_position', 'in_radius', 'in_color']
+                )
+            ],
+            mode=self._ctx.POINTS
+        )
+
+    def update(self) -> None:
+        """ Move and wrap all particles """
+
+        dx, dy = self._velocity
+        self._data[:, COLUMN_X] += dx
+        self._data[:, COLUMN_Y] += dy
+
+        # Particles leaving on the left side reappear on the right side
+        wrapped = self._data[:, COLUMN_X] + self._data[:, COLUMN_RADIUS] < 0
+        count = numpy.count_nonzero(wrapped)
+
+        if count:
+            bottom, top = self._respawn_y
+            self._data[wrapped, COLUMN_X] = self._respawn_x + self._data[wrapped, COLUMN_RADIUS]
+            self._data[wrapped, COLUMN_Y] = self._rng.integers(bottom, top, count, endpoint=True)
+
+    def draw(self) -> None:
+        """
+        Upload particles and draw them in one call.
+        The cameras drawing particles are unzoomed, so the radius is in pixels.
+        """
+
+        self._buffer.write(self._data)
+
+        with self._ctx.enabled(self._ctx.BLEND, self._ctx.PROGRAM_POINT_SIZE):
+            self._geometry.render(self._program, vertices=len(self._data))
+
+    @property
+    def respawn_x(self) -> float:
+        """ X position where wrapped particles reappear """
+
+        return self._respawn_x
+
+    @respawn_x.setter
+    def respawn_x(self, value: float) -> None:
+        """ Set X position where wrapped particles reappear """
+
+        self._respawn_x = value
+
+    def __len__(self) -> int:
+        """ Count of particles """
+
+        return len(self._data)
@@ -0,0 +1,103 @@
+""" Background asset preloading """
+
+import logging
+import threading
+import time
+
+import arcade
+
+from app.utils.string import label_value
+
+UPLOADS_PER_FRAME = 1
+
+
+class Preloader:
+    """
+    Runs a preload task on a worker thread.
+    The task must not touch OpenGL, it returns a list of upload steps
+    which are run on the main thread, a few per frame.
+    """
+
+    def __init__(self):
+        """ Constructor """
+
+        self._worker = None
+        self._uploads = None
+        self._start = None
+
+    def start(self, task, *args):
+        """
+        Start preloading
+        @param task: Callable returning a list of upload steps
+        @param args: Arguments for the task
+        """
+
+        self._start = time.time()
+        self._worker = threading.Thread(
+            target=self.work,
+            args=(task, *args),
+            name='Preloader',
+            daemon=True
+        )
+        self._worker.start()
+
+        return self
+
+    def work(self, task, *args) -> None:
+        """ Run the preload task """
+
+        uploads = []
+
+        try:
+            uploads = task(*args)
+        except (OSError, ValueError, AttributeError) as e:
+            # The next view loads everything itself then
+            logging.error(label_value('Preloading failed', e))
+        finally:
+            # Never keep the view waiting
+            self._uploads = list(uploads or [])
+
+        logging.info(label_value('Preloaded in', time.time() - self._start))
+
+    @property
+    def loaded(self) -> bool:
+        """ Worker is finished """
+
+        return self._uploads is not None
+
+    def update(self, uploads_per_frame: int = UPLOADS_PER_FRAME) -> bool:
+        """
+        Run the next upload steps
+        @return: True if preloading is completed
+        """
+
+        if not self._worker:
+            return True
+
+        if not self.loaded:
+            return False
+
+        for _i in range(uploads_per_frame):
+            if not self._uploads:
+                break
+
+            self._uploads.pop(0)()
+
+        return not self._uploads
+
+    @staticmethod
+    def textures(paths: list) -> list:
+        """
+        Decode textures and return their atlas upload steps
+        @param paths: Image files
+        @return: List of upload steps
+        """
+
+        atlas = arcade.get_window().ctx.default_atlas
+        uploads = []
+
+        for path in paths:
+            texture = arcade.texture.default_texture_cache.load_or_get_texture(path)
+            uploads.append(lambda texture=texture: atlas.add(texture))
+
+        return uploads
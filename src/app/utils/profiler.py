@@ -0,0 +1,186 @@
+""" Frame profiler overlay """
+
+import csv
+import logging
+import os
+import time
+
+import arcade
+import numpy
+import userpaths
+
+from app.constants.fonts import FONT_CONSOLA_MONO
+from app.constants.gameinfo import DIRECTORY_GAME_NAME
+from app.utils.fpscounter import FPSCounter, MARGIN
+from app.utils.timings import PERCENTILES, TIMING_FRAME
+
+FONT_SIZE_PROFILER = 10
+FONT_COLOR_PROFILER = arcade.csscolor.WHITE
+REFRESH_INTERVAL = 0.5
+
+TEXT_WIDTH = 460
+TEXT_OFFSET_Y = 32
+
+GRAPH_SAMPLES = 240
+GRAPH_WIDTH = 240
+GRAPH_HEIGHT = 80
+GRAPH_MAX_MS = 50
+GRAPH_BUDGET_MS = 1000 / 60
+GRAPH_COLOR = arcade.csscolor.LIME
+GRAPH_COLOR_BUDGET = arcade.csscolor.ORANGE
+GRAPH_BACKGROUND = (0, 0, 0, 160)
+
+
+class Profiler:
+    """ Frame profiler overlay """
+
+    def __init__(self):
+        """ Constructor """
+
+        self._window = None
+        self._fps_counter = None
+        self._camera = None
+        self._text = None
+        self._graph_left = 0
+        self._graph_bottom = 0
+        self._last_frame = None
+        self._last_refresh = 0
+
+    def setup(self, window):
+        """ Setup profiler """
+
+        self._window = window
+        self._fps_counter = FPSCounter().setup(window)
+        self._camera = arcade.camera.Camera2D()
+
+        self._text = arcade.Text(
+            '',
+            font_name=FONT_CONSOLA_MONO,
+            font_size=FONT_SIZE_PROFILER,
+            color=FONT_COLOR_PROFILER,
+            x=MARGIN,
+            y=0,
+            width=TEXT_WIDTH,
+            multiline=True,
+            anchor_y='top'
+        )
+        self.layout(window.width, window.height)
+
+        window.timings.clear()
+        window.timings.enabled = True
+
+        return self
+
+    def unsetup(self) -> None:
+        """ Stop profiling """
+
+        self._window.timings.enabled = False
+        self._window.timings.clear()
+
+    def layout(self, width: int, height: int) -> None:
+        """ Place the report at the top left and the graph at the top right """
+
+        self._text.y = height - MARGIN - TEXT_OFFSET_Y
+        self._graph_left = width - MARGIN - GRAPH_WIDTH
+        self._graph_bottom = height - MARGIN - GRAPH_HEIGHT
+
+    def on_resize(self, width: int, height: int) -> None:
+        """ Re-anchor the overlay to the resized window """
+
+        self._camera.match_screen(and_position=True)
+        self._fps_counter.on_resize(width, height)
+        self.layout(width, height)
+
+    def update(self) -> None:
+        """ Update profiler """
+
+        self._fps_counter.update()
+
+        now = time.perf_counter()
+
+        if now - self._last_refresh < REFRESH_INTERVAL:
+            return
+
+        self._last_refresh = now
+        self._text.text = self.format_report(self._window.timings.report())
+
+    @staticmethod
+    def format_report(report: dict) -> str:
+        """ Format timings report as text lines """
+
+        percentiles = [f"p{percentile}" for percentile in PERCENTILES]
+        lines = [' '.join([f"{'':<30}", *[f"{name:>7}" for name in percentiles]])]
+
+        # Frame time first
+        names = sorted(report, key=lambda name: name != TIMING_FRAME)
+
+        for name in names:
+            values = [f"{report[name][percentile]:7.2f}" for percentile in percentiles]
+            lines.append(' '.join([f"{name:<30}", *values]))
+
+        return '\n'.join(lines)
+
+    def draw(self) -> None:
+        """ Draw profiler """
+
+        now = time.perf_counter()
+
+        if self._last_frame is not None:
+            self._window.timings.record(TIMING_FRAME, now - self._last_frame)
+
+        self._last_frame = now
+
+        self._fps_counter.draw()
+        self._camera.use()
+
+        self.draw_graph()
+        self._text.draw()
+
+    def draw_graph(self) -> None:
+        """ Draw frame time graph """
+
+        samples = self._window.timings.samples(TIMING_FRAME)[-GRAPH_SAMPLES:]
+
+        left = self._graph_left
+        bottom = self._graph_bottom
+
+        arcade.draw_lbwh_rectangle_filled(left, bottom, GRAPH_WIDTH, GRAPH_HEIGHT, GRAPH_BACKGROUND)
+
+        budget_y = bottom + GRAPH_BUDGET_MS / GRAPH_MAX_MS * GRAPH_HEIGHT
+        arcade.draw_line(left, budget_y, left + GRAPH_WIDTH, budget_y, GRAPH_COLOR_BUDGET)
+
+        if len(samples) < 2:
+            return
+
+        values = numpy.minimum(numpy.array(samples) * 1000, GRAPH_MAX_MS)
+        xs = left + numpy.arange(len(values)) * (GRAPH_WIDTH / GRAPH_SAMPLES)
+        ys = bottom + values / GRAPH_MAX_MS * GRAPH_HEIGHT
+
+        arcade.draw_line_strip(list(zip(xs.tolist(), ys.tolist())), GRAPH_COLOR)
+
+    def dump(self) -> str:
+        """
+        Save the samples as CSV
+        @return: The filename
+        """
+
+        profiles_dir = str(os.path.join(userpaths.get_my_documents(), DIRECTORY_GAME_NAME))
+
+        if not os.path.exists(profiles_dir):
+            os.makedirs(profiles_dir)
+
+        filename = os.path.join(profiles_dir, 'profile-' + time.strftime("%Y%m%d-%H%M%S") + '.csv')
+
+        timings = self._window.timings
+
+        with open(filename, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['subsystem', 'sample', 'milliseconds'])
+
+            for name in timings.names:
+                for i, seconds in enumerate(timings.samples(name)):
+                    writer.writerow([name, i, round(seconds * 1000, 4)])
+
+        logging.info(f"Profile saved as {filename}")
+
+        return filename
@@ -0,0 +1,127 @@
+""" Screenshot capture and background encoding """
+
+import logging
+import os
+import queue
+import threading
+import time
+
+import arcade
+import PIL.Image
+import PIL.ImageOps
+
+from app.constants.settings import SETTINGS_DEFAULT_SCREENSHOT_FORMAT
+from app.utils.string import label_value
+
+SCREENSHOT_QUEUE_SIZE = 8
+
+# Seconds to wait for pending screenshots on shutdown
+SCREENSHOT_SHUTDOWN_TIMEOUT = 10
+
+SAVE_OPTIONS = {
+    'jpg': {'format': 'JPEG', 'subsampling': 0, 'quality': 100},
+    'png': {'format': 'PNG', 'compress_level': 1},
+    'webp': {'format': 'WEBP', 'quality': 100},
+}
+
+
+class Screenshots:
+    """
+    Reads the framebuffer on the main thread and encodes
+    and writes the images on a background worker
+    """
+
+    def __init__(self):
+        """ Constructor """
+
+        self._directory = None
+        self._image_format = None
+        self._queue = None
+        self._worker = None
+        self._counter = 0
+        self.burst = False
+
+    def setup(self, directory: str, image_format: str = SETTINGS_DEFAULT_SCREENSHOT_FORMAT, queue_size: int = SCREENSHOT_QUEUE_SIZE):
+        """
+        Setup screenshots
+        @param directory: The screenshot directory
+        @param image_format: png, jpg or webp
+        @param queue_size: Maximum count of captures waiting for encoding
+        """
+
+        if image_format not in SAVE_OPTIONS:
+            logging.warning(label_value('Unknown screenshot format', image_format))
+            image_format = SETTINGS_DEFAULT_SCREENSHOT_FORMAT
+
+        self._directory = directory
+        self._image_format = image_format
+        self._queue = queue.Queue(maxsize=queue_size)
+
+        self._worker = threading.Thread(target=self.work, name='Screenshots', daemon=True)
+        self._worker.start()
+
+        return self
+
+    def unsetup(self) -> None:
+        """ Write pending screenshots and stop worker """
+
+        if not self._worker:
+            return
+
+        if self._worker.is_alive():
+            try:
+                self._queue.put(None, timeout=SCREENSHOT_SHUTDOWN_TIMEOUT)
+                self._worker.join(timeout=SCREENSHOT_SHUTDOWN_TIMEOUT)
+            except queue.Full:
+                logging.error('Screenshot worker is stuck, pending screenshots are lost')
+
+        self._worker = None
+
+    def capture(self, window: arcade.Window) -> str | None:
+        """
+        Read the framebuffer and queue it for encoding
+        @param window: The window
+        @return: The filename or None if the queue is full
+        """
+
+        width, height = window.get_framebuffer_size()
+        data = window.ctx.screen.read(viewport=(0, 0, width, height), components=3)
+
+        self._counter += 1
+        filename = os.path.join(
+            self._directory,
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{self._counter:04d}.{self._image_format}"
+        )
+
+        try:
+            self._queue.put_nowait((filename, (width, height), data, time.time()))
+        except queue.Full:
+            logging.warning(f"Screenshot skipped, {self._queue.maxsize} screenshots are pending")
+            return None
+
+        return filename
+
+    def work(self) -> None:
+        """ Encode and write queued screenshots """
+
+        while True:
+            item = self._queue.get()
+
+            if item is None:
+                return
+
+            filename, size, data, start = item
+
+            try:
+                if not os.path.exists(self._directory):
+                    os.makedirs(self._directory)
+
+                image = PIL.ImageOps.flip(PIL.Image.frombytes('RGB', size, data))
+                image.save(filename, **SAVE_OPTIONS[self._image_format])
+            except Exception as e:
+                # A broken job must not stop the worker, else the queue fills up
+                logging.error(label_value('Screenshot failed', filename))
+                logging.error(e)
+                continue
+
+            logging.info(f"Screenshot saved as {filename} in {time.time() - start} seconds")
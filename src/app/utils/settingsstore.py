@@ -0,0 +1,170 @@
+""" Persistent settings """
+
+import json
+import logging
+import os
+import tempfile
+
+import userpaths
+
+from app.constants.gameinfo import DIRECTORY_GAME_NAME
+from app.utils.string import label_value
+
+SETTINGS_STORE_FILE = 'settings.json'
+SETTINGS_STORE_VERSION = 1
+
+
+class SettingsStore:
+    """
+    Settings and cached system probes in the user config directory.
+    The file is read once at startup and replaced atomically on save,
+    so a crash while saving never leaves a truncated file behind.
+    Probes are only valid for the system fingerprint they were made on.
+    """
+
+    def __init__(self):
+        """ Constructor """
+
+        self._path = None
+        self._settings = {}
+        self._probes = {}
+        self._fingerprint = None
+        self._changed = False
+
+    def setup(self, path: str | None = None, fingerprint: str = ''):
+        """
+        Load the settings file
+        @param path: Path to file, defaults to the user config directory
+        @param fingerprint: Identifies the system the probes were made on
+        @return: self
+        """
+
+        self._path = path or os.path.join(userpaths.get_appdata(), DIRECTORY_GAME_NAME, SETTINGS_STORE_FILE)
+        self._fingerprint = fingerprint
+
+        try:
+            with open(self._path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+            self._changed = True
+        except (OSError, ValueError) as e:
+            logging.error(label_value('Settings not readable', e))
+            data = {}
+
+        if not isinstance(data, dict) or data.get('version') != SETTINGS_STORE_VERSION:
+            data = {}
+            self._changed = True
+
+        self._settings = data.get('settings') or {}
+
+        probes = data.get('probes') or {}
+        if probes.get('fingerprint') == fingerprint:
+            self._probes = probes.get('values') or {}
+
+        logging.info(label_value('Settings', self._path))
+
+        return self
+
+    def get(self, key: str, default=None):
+        """
+        Get a setting
+        @param key: Name of the setting
+        @param default: Value if not set or of another type than default
+        @return: The value
+        """
+
+        value = self._settings.get(key, default)
+
+        if default is not None and not isinstance(value, type(default)):
+            logging.warning(label_value(f"Setting {key} has invalid type", value))
+            return default
+
+        return value
+
+    def set(self, key: str, value) -> None:
+        """ Set a setting """
+
+        if key not in self._settings or self._settings[key] != value:
+            self._settings[key] = value
+            self._changed = True
+
+    def defaults(self, defaults: dict) -> dict:
+        """
+        Stored settings with defaults for missing ones, missing ones are stored
+        @param defaults: Default values by name
+        @return: Values by name
+        """
+
+        values = {}
+
+        for key, default in defaults.items():
+            values[key] = self.get(key, default)
+
+            if key not in self._settings:
+                self.set(key, default)
+
+        return values
+
+    @property
+    def probes(self) -> dict:
+        """ Cached probes, empty if missing or made on another system """
+
+        return self._probes
+
+    @probes.setter
+    def probes(self, value: dict) -> None:
+        """ Set cached probes """
+
+        if self._probes != value:
+            self._probes = value
+            self._changed = True
+
+    def save(self) -> bool:
+        """
+        Write the settings file atomically if anything changed
+        @return: Success
+        """
+
+        if not self._changed:
+            return True
+
+        data = {
+            'version': SETTINGS_STORE_VERSION,
+            'settings': self._settings,
+            'probes': {
+                'fingerprint': self._fingerprint,
+                'values': self._probes
+            }
+        }
+
+        directory = os.path.dirname(self._path)
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+
+            with tempfile.NamedTemporaryFile(
+                    'w',
+                    encoding='utf-8',
+                    dir=directory,
+                    prefix=SETTINGS_STORE_FILE,
+                    suffix='.tmp',
+                    delete=False
+            ) as f:
+                json.dump(data, f, indent=4)
+
+            os.replace(f.name, self._path)
+        except OSError as e:
+            logging.error(label_value('Settings not saved', e))
+            return False
+
+        self._changed = False
+        logging.info(label_value('Settings saved', self._path))
+
+        return True
+
+    @property
+    def path(self) -> str:
+        """ Path to the settings file """
+
+        return self._path
@@ -0,0 +1,131 @@
+""" Sound cache """
+
+import logging
+import threading
+from collections import OrderedDict
+
+import arcade
+
+from app.constants.audio import AUDIO_SFX
+from app.utils.audiopolicy import AudioPolicy
+from app.utils.string import label_value
+
+MEGABYTE = 1024 * 1024
+
+
+class SoundCache:
+    """
+    Keeps decoded sounds in memory keyed by path and streaming mode.
+    The least recently used sounds are evicted when the memory budget
+    of the cache or of their category is exceeded. Streaming sounds can't be shared between players,
+    so they are opened on every load and never cached.
+    Whether a sound is streamed is decided by the policy of its category.
+    """
+
+    def __init__(self, budget: int = 64 * MEGABYTE):
+        """
+        Constructor
+        @param budget: Maximum decoded size of cached sounds in bytes
+        """
+
+        self.budget = budget
+        self.policy = AudioPolicy()
+        self._sounds = OrderedDict()
+        self._sizes = {}
+        self._size = 0
+        self._categories = {}
+        self._category_sizes = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def decoded_size(sound: arcade.Sound) -> int:
+        """ Decoded size of a sound in bytes """
+
+        source = getattr(sound, 'source', None)
+
+        if not source or not source.audio_format:
+            return 0
+
+        return int(source.duration * source.audio_format.bytes_per_second)
+
+    def load(self, path: str, category: str = AUDIO_SFX, streaming: bool | None = None) -> arcade.Sound:
+        """
+        Load a sound or get it from cache
+        @param path: Path to sound file
+        @param category: Sound category like AUDIO_MUSIC
+        @param streaming: Stream instead of decoding into memory, defaults to the policy of the category
+        @return: The sound
+        """
+
+        if streaming is None:
+            streaming = self.policy.streaming(path, category)
+
+        if streaming:
+            return arcade.load_sound(path, streaming=True)
+
+        key = (path, streaming)
+
+        # Sounds may be preloaded on a worker thread
+        with self._lock:
+            if key in self._sounds:
+                self._sounds.move_to_end(key)
+                return self._sounds[key]
+
+            sound = arcade.load_sound(path, streaming=False)
+            size = self.decoded_size(sound)
+
+            self._sounds[key] = sound
+            self._sizes[key] = size
+            self._size += size
+            self._categories[key] = category
+            self._category_sizes[category] = self._category_sizes.get(category, 0) + size
+
+            self.evict(keep=key)
+
+        return sound
+
+    def evict(self, keep: tuple | None = None) -> None:
+        """ Remove least recently used sounds until the cache and every category fit their budgets """
+
+        for key in list(self._sounds.keys()):
+            if key == keep:
+                continue
+
+            category = self._categories[key]
+            budget = self.policy.budget(category)
+
+            if self._size <= self.budget and (budget is None or self._category_sizes[category] <= budget):
+                continue
+
+            logging.debug(label_value('Sound evicted', key[0]))
+
+            size = self._sizes.pop(key)
+            del self._sounds[key]
+            del self._categories[key]
+            self._size -= size
+            self._category_sizes[category] -= size
+
+    def clear(self) -> None:
+        """ Clear cache """
+
+        self._sounds.clear()
+        self._sizes.clear()
+        self._size = 0
+        self._categories.clear()
+        self._category_sizes.clear()
+
+    @property
+    def size(self) -> int:
+        """ Decoded size of cached sounds in bytes """
+
+        return self._size
+
+    def category_size(self, category: str) -> int:
+        """ Decoded size of the cached sounds of a category in bytes """
+
+        return self._category_sizes.get(category, 0)
+
+    def __len__(self) -> int:
+        """ Count of cached sounds """
+
+        return len(self._sounds)
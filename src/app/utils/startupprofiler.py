@@ -0,0 +1,181 @@
+""" Startup time profiler """
+
+import builtins
+import contextlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+# Only the standard library is imported here,
+# so the profiler can be set up before any other import
+
+IMPORTS_REPORTED = 30
+
+
+class StartupProfiler:
+    """
+    Phase times from launch to the first frame.
+    If enabled, the time of each module import is recorded too,
+    by wrapping the import statement until the first frame.
+    """
+
+    def __init__(self):
+        """ Constructor """
+
+        self._start = time.perf_counter()
+        self._enabled = False
+        self._phases = []
+        self._imports = []
+        self._stack = []
+        self._original_import = None
+        self._finished = False
+
+    def setup(self, enabled: bool = False):
+        """
+        Setup profiler
+        @param enabled: Record imports and save a report at the first frame
+        @return: self
+        """
+
+        self._enabled = enabled
+
+        if enabled:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+
+        return self
+
+    def _import(self, name, globals_=None, locals_=None, fromlist=(), level=0):
+        """ Import a module and record the time if it wasn't imported before """
+
+        args = (name, globals_, locals_, fromlist, level)
+
+        # Imports of preloader threads would mix up the nesting
+        if name in sys.modules or threading.current_thread() is not threading.main_thread():
+            return self._original_import(*args)
+
+        modules = len(sys.modules)
+        self._stack.append(0.0)
+        start = time.perf_counter()
+
+        try:
+            return self._original_import(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+
+            if self._stack:
+                self._stack[-1] += elapsed
+
+            if len(sys.modules) > modules:
+                self._imports.append({
+                    'module': self.module_name(name, globals_, fromlist, level),
+                    'depth': len(self._stack),
+                    'self_ms': round((elapsed - children) * 1000, 3),
+                    'total_ms': round(elapsed * 1000, 3),
+                })
+
+    @staticmethod
+    def module_name(name: str, globals_: dict | None, fromlist, level: int) -> str:
+        """ Absolute name of an imported module """
+
+        if not level:
+            return name
+
+        package = (globals_ or {}).get('__package__') or ''
+        package = package.rsplit('.', level - 1)[0] if level > 1 else package
+
+        if name:
+            return f"{package}.{name}"
+
+        return f"{package}.{','.join(fromlist or [])}"
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """ Measure a startup phase """
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self._phases.append({
+                'phase': name,
+                'start_ms': round((start - self._start) * 1000, 3),
+                'ms': round((time.perf_counter() - start) * 1000, 3),
+            })
+
+    def finish(self) -> dict | None:
+        """
+        Stop profiling at the first frame
+        @return: The report, None if already finished
+        """
+
+        if self._finished:
+            return None
+
+        self._finished = True
+        elapsed = time.perf_counter() - self._start
+
+        if self._original_import:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+        logging.info(f"First frame after {elapsed * 1000:.0f} ms")
+
+        report = self.report(elapsed)
+
+        if self._enabled:
+            for phase in report['phases']:
+                logging.info(f"Startup {phase['phase']}: {phase['ms']:.1f} ms")
+
+            for module in report['imports'][:10]:
+                logging.info(f"Import {module['module']}: {module['self_ms']:.1f} ms")
+
+        return report
+
+    def report(self, elapsed: float | None = None) -> dict:
+        """ Phase and import times """
+
+        if elapsed is None:
+            elapsed = time.perf_counter() - self._start
+
+        imports = sorted(self._imports, key=lambda module: module['self_ms'], reverse=True)
+
+        return {
+            'first_frame_ms': round(elapsed * 1000, 3),
+            'phases': self._phases,
+            'imports_ms': round(sum(module['self_ms'] for module in self._imports), 3),
+            'imports_count': len(self._imports),
+            'imports': imports[:IMPORTS_REPORTED],
+        }
+
+    @staticmethod
+    def save(report: dict, directory: str) -> str:
+        """
+        Save a report as JSON
+        @param report: The report
+        @param directory: Target directory
+        @return: The filename
+        """
+
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        filename = os.path.join(directory, 'startup-' + time.strftime("%Y%m%d-%H%M%S") + '.json')
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+
+        logging.info(f"Startup profile saved as {filename}")
+
+        return filename
+
+    @property
+    def enabled(self) -> bool:
+        """ Imports are recorded and the report is saved """
+
+        return self._enabled
@@ -0,0 +1,243 @@
+""" Timed subtitles for voiceovers """
+
+import bisect
+import json
+import logging
+import os
+
+import arcade
+
+from app.constants.fonts import FONT_MARKER_FELT
+from app.utils.mp3 import mp3_duration
+from app.utils.string import label_value
+
+SUBTITLES_FILE = 'subtitles.json'
+SUBTITLES_VERSION = 1
+
+SUBTITLES_TEXT_EXTENSION = '.txt'
+SUBTITLES_AUDIO_EXTENSION = '.mp3'
+
+FONT_SIZE_SUBTITLES = 20
+SUBTITLES_WIDTH = 0.8
+SUBTITLES_MARGIN = 40
+SUBTITLES_BACKGROUND = (0, 0, 0, 160)
+
+
+class SubtitleTrack:
+    """
+    Compiles the textNN.txt files next to the voiceovers into timed cues.
+    Every line of a text is a cue, the length of the voiceover is split
+    between the lines by their count of characters.
+    """
+
+    @staticmethod
+    def cues(lines: list, duration: float) -> list:
+        """
+        Split a duration between lines
+        @param lines: Lines of text
+        @param duration: Seconds
+        @return: List of [start, end, text]
+        """
+
+        lines = [line.strip() for line in lines if line.strip()]
+        characters = sum(len(line) for line in lines)
+
+        cues = []
+        start = 0.0
+
+        for line in lines:
+            end = start + duration * len(line) / characters
+            cues.append([round(start, 3), round(end, 3), line])
+            start = end
+
+        return cues
+
+    @staticmethod
+    def build(directory: str) -> str:
+        """
+        Compile the subtitles of a locale
+        @param directory: Speech directory of a locale
+        @return: Path to compiled subtitles
+        """
+
+        track = {}
+
+        for name in sorted(os.listdir(directory)):
+            voiceover, extension = os.path.splitext(name)
+            audio = os.path.join(directory, voiceover + SUBTITLES_AUDIO_EXTENSION)
+
+            if extension != SUBTITLES_TEXT_EXTENSION or not os.path.isfile(audio):
+                continue
+
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+
+            track[voiceover] = SubtitleTrack.cues(lines, mp3_duration(audio))
+
+        path = os.path.join(directory, SUBTITLES_FILE)
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'version': SUBTITLES_VERSION, 'cues': track}, f, ensure_ascii=False, indent=1)
+
+        return path
+
+    @staticmethod
+    def build_all(speech_dir: str) -> list:
+        """ Compile the subtitles of all locales """
+
+        return [
+            SubtitleTrack.build(entry.path)
+            for entry in sorted(os.scandir(speech_dir), key=lambda entry: entry.name)
+            if entry.is_dir()
+        ]
+
+    @staticmethod
+    def load(speech_dir: str, languages: list) -> dict:
+        """
+        Load compiled subtitles
+        @param speech_dir: Speech directory
+        @param languages: Fallback chain, the first language wins
+        @return: Cues by voiceover id
+        """
+
+        track = {}
+
+        for language in reversed(languages):
+            path = os.path.join(speech_dir, language, SUBTITLES_FILE)
+
+            if not os.path.isfile(path):
+                continue
+
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            if data.get('version') != SUBTITLES_VERSION:
+                logging.warning(label_value('Outdated subtitles', path))
+                continue
+
+            track.update(data['cues'])
+
+        return track
+
+
+class Subtitles:
+    """
+    Shows the cue of the playing voiceover.
+    Owned by the window, every cue is rendered to a text sprite once at setup,
+    at playback only the drawn sprite is swapped.
+    """
+
+    def __init__(self):
+        """ Constructor """
+
+        self._camera = None
+        self._sprites = None
+        self._starts = {}
+        self._ends = {}
+        self._cue_sprites = {}
+        self._current = None
+
+    def setup(self, root_dir: str, languages: list):
+        """
+        Lay out all cues
+        @param root_dir: Root directory
+        @param languages: Fallback chain
+        @return: self
+        """
+
+        track = SubtitleTrack.load(os.path.join(root_dir, 'resources', 'speech'), languages)
+        width = arcade.get_window().width
+
+        self._camera = arcade.camera.Camera2D()
+        self._sprites = arcade.SpriteList()
+        self._current = None
+
+        for voiceover, cues in track.items():
+            self._starts[voiceover] = [start for start, _end, _text in cues]
+            self._ends[voiceover] = [end for _start, end, _text in cues]
+            self._cue_sprites[voiceover] = []
+
+            for _start, _end, text in cues:
+                sprite = arcade.create_text_sprite(
+                    text=text,
+                    font_name=FONT_MARKER_FELT,
+                    font_size=FONT_SIZE_SUBTITLES,
+                    width=int(width * SUBTITLES_WIDTH),
+                    align='center',
+                    multiline=True,
+                    background_color=SUBTITLES_BACKGROUND
+                )
+                self.anchor(sprite, width)
+
+                self._cue_sprites[voiceover].append(sprite)
+
+        logging.info(label_value('Subtitle cues', sum(map(len, self._cue_sprites.values()))))
+
+        return self
+
+    @staticmethod
+    def anchor(sprite: arcade.Sprite, width: int) -> None:
+        """ Center a cue sprite at the bottom """
+
+        sprite.center_x = width / 2
+        sprite.bottom = SUBTITLES_MARGIN
+
+    def on_resize(self, width: int, height: int) -> None:
+        """ Re-anchor the rendered cues """
+
+        if not self._camera:
+            return
+
+        self._camera.match_screen(and_position=True)
+
+        for sprites in self._cue_sprites.values():
+            for sprite in sprites:
+                self.anchor(sprite, width)
+
+    def cue(self, voiceover: str | None, media_time: float) -> int | None:
+        """
+        Index of the cue at a media time
+        @param voiceover: Voiceover id
+        @param media_time: Seconds since the voiceover started
+        @return: Index or None
+        """
+
+        if voiceover not in self._starts:
+            return None
+
+        index = bisect.bisect_right(self._starts[voiceover], media_time) - 1
+
+        if index < 0 or media_time >= self._ends[voiceover][index]:
+            return None
+
+        return index
+
+    def update(self, voiceover: str | None, media_time: float) -> None:
+        """
+        Show the cue of the playing voiceover
+        @param voiceover: Voiceover id, None if none is playing
+        @param media_time: Seconds since the voiceover started
+        """
+
+        index = self.cue(voiceover, media_time)
+        sprite = self._cue_sprites[voiceover][index] if index is not None else None
+
+        if sprite is self._current:
+            return
+
+        # Hidden sprites would still be rasterized, so only the current one is in the list
+        self._sprites.clear()
+
+        if sprite:
+            self._sprites.append(sprite)
+
+        self._current = sprite
+
+    def draw(self) -> None:
+        """ Draw the visible cue """
+
+        if not self._current:
+            return
+
+        self._camera.use()
+        self._sprites.draw()
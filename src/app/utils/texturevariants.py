@@ -0,0 +1,173 @@
+""" Downscaled variants of large map images """
+
+import logging
+import os
+from pathlib import Path
+
+import arcade
+import attr
+import PIL.Image
+import pytiled_parser
+
+from app.utils.atlascache import AtlasCache
+from app.utils.mapcache import MapCache
+from app.utils.string import label_value
+
+# Variants are built for these scales, the full size image is tier 1.0
+VARIANT_TIERS = (0.5, 0.25)
+
+# Only images with a side of at least this size get variants
+VARIANT_MIN_SIZE = 512
+
+
+class TextureVariants:
+    """
+    Builds half and quarter size variants of the large tileset images.
+    At runtime the tiles use the tier closest to the map zoom instead
+    of the full size image, and the sprites using it are scaled up
+    so they keep their size in the world.
+    """
+
+    @staticmethod
+    def variant_path(path: str, tier: float) -> str:
+        """ Path of an image variant, e.g. tree01@50.png """
+
+        name, ext = os.path.splitext(path)
+
+        return f"{name}@{round(tier * 100)}{ext}"
+
+    @staticmethod
+    def tier(zoom: float) -> float:
+        """
+        Smallest tier which isn't upscaled at the zoom
+        @param zoom: Scaling of the map
+        @return: The tier
+        """
+
+        tier = 1.0
+
+        for variant_tier in VARIANT_TIERS:
+            if variant_tier >= zoom:
+                tier = variant_tier
+
+        return tier
+
+    @staticmethod
+    def build(path: str) -> list:
+        """
+        Build the image variants of a TMX map
+        @param path: Path to TMX file
+        @return: Paths to the built variants
+        """
+
+        map_dir = os.path.dirname(path)
+        built = []
+
+        for name in AtlasCache.images(MapCache.read(path)):
+            image_file = os.path.join(map_dir, name)
+
+            with PIL.Image.open(image_file) as image:
+                if max(image.size) < VARIANT_MIN_SIZE:
+                    continue
+
+                for tier in VARIANT_TIERS:
+                    size = (max(1, round(image.width * tier)), max(1, round(image.height * tier)))
+                    variant_file = TextureVariants.variant_path(image_file, tier)
+
+                    image.resize(size, PIL.Image.Resampling.LANCZOS).save(variant_file, quality=95, optimize=True)
+                    built.append(variant_file)
+
+                    logging.info(label_value('Variant built', variant_file))
+
+        return built
+
+    @staticmethod
+    def build_all(maps_dir: str) -> list:
+        """ Build the image variants of all TMX maps in a directory """
+
+        built = []
+
+        for file in sorted(os.listdir(maps_dir)):
+            if file.endswith('.tmx'):
+                built += TextureVariants.build(os.path.join(maps_dir, file))
+
+        return built
+
+    @staticmethod
+    def select(tiled_map: pytiled_parser.TiledMap, zoom: float) -> tuple:
+        """
+        Replace large tile images by the variants of the tier for the zoom
+        @param tiled_map: The parsed map
+        @param zoom: Scaling of the map
+        @return: The map and the image variants used
+        """
+
+        tier = TextureVariants.tier(zoom)
+
+        if tier == 1.0:
+            return tiled_map, []
+
+        map_dir = os.path.dirname(str(tiled_map.map_file))
+        tilesets = {}
+        variants = []
+
+        for firstgid, tileset in tiled_map.tilesets.items():
+            tiles = {}
+
+            for tile_id, tile in (tileset.tiles or {}).items():
+                if tile.image:
+                    variant = Path(TextureVariants.variant_path(str(tile.image), tier))
+
+                    if os.path.isfile(os.path.join(map_dir, variant)):
+                        tile = attr.evolve(
+                            tile,
+                            image=variant,
+                            width=round(tile.width * tier),
+                            height=round(tile.height * tier),
+                            image_width=round(tile.image_width * tier),
+                            image_height=round(tile.image_height * tier)
+                        )
+                        variants.append(variant)
+
+                tiles[tile_id] = tile
+
+            tilesets[firstgid] = attr.evolve(tileset, tiles=tiles) if tileset.tiles else tileset
+
+        logging.info(label_value('Texture tier', tier))
+
+        return attr.evolve(tiled_map, tilesets=tilesets), variants
+
+    @staticmethod
+    def apply(tilemap: arcade.TileMap, variants: list, zoom: float) -> None:
+        """
+        Scale up sprites using image variants to their full size
+        @param tilemap: The tilemap
+        @param variants: The image variants used
+        @param zoom: Scaling of the map
+        """
+
+        if not variants:
+            return
+
+        map_dir = os.path.dirname(str(tilemap.tiled_map.map_file))
+        image_data_cache = arcade.texture.default_texture_cache.image_data_cache
+        hashes = set()
+
+        for variant in variants:
+            # Same cache name as the tilemap uses when loading the image file
+            image_data = image_data_cache.get(arcade.Texture.create_image_cache_name(Path(map_dir, variant)))
+
+            if image_data:
+                hashes.add(image_data.hash)
+
+        scale = zoom / TextureVariants.tier(zoom)
+
+        for sprite_list in tilemap.sprite_lists.values():
+            for sprite in sprite_list:
+                if sprite.texture.image_data.hash not in hashes:
+                    continue
+
+                # The tilemap places sprites by their bottom left corner
+                left, bottom = sprite.left, sprite.bottom
+                sprite.scale = scale
+                sprite.left, sprite.bottom = left, bottom
@@ -0,0 +1,125 @@
+""" Load-time classification of tiles into render and collide roles """
+
+import logging
+
+import arcade
+import pytiled_parser
+
+from app.utils.chunkedscene import ChunkedScene
+from app.utils.string import label_value
+
+ROLE_NONE = 0
+ROLE_RENDER = 1
+ROLE_COLLIDE = 2
+ROLE_BOTH = ROLE_RENDER | ROLE_COLLIDE
+
+# Sprites are drawn as quads
+VERTICES_PER_SPRITE = 4
+
+
+class TileClassifier:
+    """
+    Classifies the tiles of static layers as render-only, collide-only or both.
+    Tiles which aren't rendered, because their layer is hidden or their
+    texture is fully transparent, are removed from the drawn sprite lists.
+    Collide-only tiles are kept aside for the collision grid.
+    """
+
+    def __init__(self):
+        """ Constructor """
+
+        self._transparent = {}
+        self.collide_only = {}
+        self.report = {}
+
+    def is_transparent(self, texture: arcade.Texture) -> bool:
+        """ Check if a texture has no visible pixel """
+
+        key = texture.image_data.hash
+
+        if key not in self._transparent:
+            image = texture.image
+
+            if image.mode != 'RGBA':
+                image = image.convert('RGBA')
+
+            self._transparent[key] = image.getextrema()[3][1] == 0
+
+        return self._transparent[key]
+
+    def classify(self, sprite: arcade.Sprite, visible: bool, collides: bool) -> int:
+        """
+        Get the role of a tile
+        @param sprite: The tile sprite
+        @param visible: The layer is visible
+        @param collides: The layer is a collision layer
+        @return: Role flags
+        """
+
+        role = ROLE_NONE
+
+        if visible and not self.is_transparent(sprite.texture):
+            role |= ROLE_RENDER
+
+        if collides:
+            role |= ROLE_COLLIDE
+
+        return role
+
+    def strip(self, tilemap: arcade.TileMap, collide_layers: list, exclude: list | None = None):
+        """
+        Remove tiles which aren't rendered from the sprite lists of a tilemap
+        @param tilemap: The tilemap
+        @param collide_layers: Names of collision layers
+        @param exclude: Names of layers which are left untouched
+        """
+
+        exclude = exclude or []
+        chunk_width = ChunkedScene.chunk_width(tilemap)
+
+        self.collide_only = {}
+        self.report = {}
+
+        for layer in tilemap.tiled_map.layers:
+            if not isinstance(layer, pytiled_parser.TileLayer):
+                continue
+
+            name = layer.name
+            sprite_list = tilemap.sprite_lists.get(name)
+
+            if name in exclude or sprite_list is None:
+                continue
+
+            chunks = {int(sprite.left // chunk_width) for sprite in sprite_list}
+            removed = []
+
+            for sprite in sprite_list:
+                role = self.classify(sprite, layer.visible, name in collide_layers)
+
+                if role & ROLE_RENDER:
+                    continue
+
+                removed.append(sprite)
+
+                if role & ROLE_COLLIDE:
+                    self.collide_only.setdefault(name, []).append(sprite)
+
+            if not removed:
+                continue
+
+            for sprite in removed:
+                sprite_list.remove(sprite)
+
+            remaining = {int(sprite.left // chunk_width) for sprite in sprite_list}
+
+            # Hidden layers were never drawn, but still updated
+            self.report[name] = {
+                'sprites': len(removed),
+                'vertices': len(removed) * VERTICES_PER_SPRITE,
+                'draw_calls': len(chunks - remaining) if layer.visible else 0,
+                'collide_only': len(self.collide_only.get(name, [])),
+            }
+
+            logging.info(label_value(f"Stripped from {name}", self.report[name]))
+
+        return self
@@ -0,0 +1,114 @@
+""" Subsystem timings """
+
+import contextlib
+import time
+from collections import deque
+
+MAX_SAMPLES = 1000
+PERCENTILES = (50, 95, 99)
+
+TIMING_FRAME = 'frame'
+TIMING_LEVEL_UPDATE = 'level.update'
+TIMING_LEVEL_DRAW = 'level.draw'
+TIMING_PHYSICS = 'physics'
+TIMING_SCENE_UPDATE = 'scene.update'
+TIMING_SCENE_DRAW = 'scene.draw'
+TIMING_COLLISIONS = 'collisions'
+TIMING_FADES = 'fades'
+TIMING_SUBTITLES = 'subtitles'
+
+
+class Timings:
+    """ Collects durations per subsystem """
+
+    def __init__(self, max_samples: int = MAX_SAMPLES):
+        """ Constructor """
+
+        self.enabled = False
+        self.max_samples = max_samples
+        self._samples = {}
+
+    def measure(self, name: str):
+        """
+        Measure the duration of a block
+        @param name: The subsystem name
+        @return: Context manager
+        """
+
+        if not self.enabled:
+            return contextlib.nullcontext()
+
+        return self._measure(name)
+
+    @contextlib.contextmanager
+    def _measure(self, name: str):
+        """ Measure the duration of a block """
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """ Record a duration in seconds """
+
+        if name not in self._samples:
+            self._samples[name] = deque(maxlen=self.max_samples)
+
+        self._samples[name].append(seconds)
+
+    def samples(self, name: str) -> list:
+        """ Recorded durations of a subsystem in seconds """
+
+        return list(self._samples.get(name, []))
+
+    def last(self, name: str) -> float | None:
+        """ Latest duration of a subsystem in seconds """
+
+        samples = self._samples.get(name)
+
+        return samples[-1] if samples else None
+
+    def clear(self) -> None:
+        """ Clear all samples """
+
+        self._samples = {}
+
+    @property
+    def names(self) -> list:
+        """ Names of measured subsystems """
+
+        return list(self._samples.keys())
+
+    def report(self, percentiles: tuple = PERCENTILES) -> dict:
+        """
+        Summarize the durations
+        @param percentiles: The percentiles to compute
+        @return: Dictionary of subsystem name to stats in milliseconds
+        """
+
+        # Not needed before the first report, so it's not imported at startup
+        import numpy
+
+        report = {}
+
+        for name, samples in self._samples.items():
+            if not samples:
+                continue
+
+            values = numpy.array(samples) * 1000
+            stats = {
+                'count': len(values),
+                'mean': float(values.mean()),
+            }
+
+            for percentile, value in zip(percentiles, numpy.percentile(values, percentiles)):
+                stats[f"p{percentile}"] = float(value)
+
+            stats['max'] = float(values.max())
+
+            report[name] = stats
+
+        return report
@@ -0,0 +1,83 @@
+""" Spatial index for trigger sprites """
+
+import arcade
+
+
+class TriggerIndex:
+    """ Uniform grid of trigger sprites keyed on the column """
+
+    def __init__(self, cell_width: float):
+        """ Constructor """
+
+        self._cell_width = cell_width
+        self._cells = {}
+        self._count = 0
+
+    def setup(self, scene: arcade.Scene, layers: list):
+        """
+        Build the index
+        @param scene: The scene
+        @param layers: Names of the trigger layers, in order of priority
+        """
+
+        self._cells = {}
+        self._count = 0
+
+        for priority, layer in enumerate(layers):
+            if layer not in scene:
+                continue
+
+            for sprite in scene[layer]:
+                self.add(layer, sprite, priority)
+
+        return self
+
+    def column(self, x: float) -> int:
+        """ Get the column of a position """
+
+        return int(x // self._cell_width)
+
+    def add(self, layer: str, sprite: arcade.Sprite, priority: int = 0) -> None:
+        """ Add a trigger sprite """
+
+        cell = self._cells.setdefault(self.column(sprite.center_x), [])
+        cell.append((priority, layer, sprite))
+        cell.sort(key=lambda entry: entry[0])
+        self._count += 1
+
+    def remove(self, sprite: arcade.Sprite) -> None:
+        """ Remove a trigger sprite before it moves """
+
+        column = self.column(sprite.center_x)
+        cell = self._cells.get(column, [])
+
+        for entry in cell:
+            if entry[2] is sprite:
+                cell.remove(entry)
+                self._count -= 1
+
+                if not cell:
+                    del self._cells[column]
+                return
+
+    def nearby(self, sprite: arcade.Sprite) -> list:
+        """
+        Get triggers in the columns around a sprite
+        @param sprite: The sprite
+        @return: List of (layer, sprite) tuples ordered by priority
+        """
+
+        column = self.column(sprite.center_x)
+        entries = []
+
+        for cell in range(column - 1, column + 2):
+            entries += self._cells.get(cell, [])
+
+        entries.sort(key=lambda entry: entry[0])
+
+        return [(layer, trigger) for _priority, layer, trigger in entries]
+
+    def __len__(self) -> int:
+        """ Count of triggers """
+
+        return self._count
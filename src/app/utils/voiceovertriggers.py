@@ -1,37 +1,55 @@
 """ Voice over trigger handling """
 import logging
-import os
 import random
 
 import arcade
 
-from app.constants.gameinfo import DEFAULT_LOCALE
+from app.constants.audio import AUDIO_SPEECH
 from app.utils.audiovolumes import AudioVolumes
 from app.utils.callbacks import Callbacks
 from app.utils.string import label_value
 
-VOICEOVER_DEFAULT = 'text00.mp3'
+VOICEOVER_DEFAULT = 'text00'
+
+# Seconds between launching a light and its voiceover
+VOICEOVER_DELAY = 2
 
 
 class VoiceOverTiggers:
-    """ Voice over trigger handling """
+    """
+    Voice over trigger handling
+    The delay and the length of a voiceover are counted in fixed update ticks,
+    so a replayed input log triggers the same lights at the same ticks
+    """
 
     def __init__(self):
         """ Voice over trigger handling """
         self.playing = False
         self.randomized_voiceovers = []
         self._media = None
+        self._voiceover = None
         self._callbacks = None
-
-    def setup(self, callbacks: Callbacks):
-        """ Setup """
+        self._tick_rate = 0
+        self._ticks = None
+        self._pending = None
+
+    def setup(self, callbacks: Callbacks, tick_rate: int):
+        """
+        Setup
+        @param callbacks: Callbacks
+        @param tick_rate: Fixed updates per second
+        @return: self
+        """
 
         self._callbacks = callbacks
+        self._tick_rate = tick_rate
+        self._ticks = None
+        self._pending = None
 
         voiceovers = []
 
         for i in range(1, 8):
-            voiceovers.append("text" + str(i).rjust(2, '0') + '.mp3')
+            voiceovers.append("text" + str(i).rjust(2, '0'))
 
         random.shuffle(voiceovers)
 
@@ -39,12 +57,44 @@ class VoiceOverTiggers:
 
         return self
 
+    def schedule(self, voiceover: str, audio_volumes: AudioVolumes) -> None:
+        """
+        Play a voiceover after VOICEOVER_DELAY seconds
+        @param voiceover: Voiceover id
+        @param audio_volumes: Audio volumes
+        """
+
+        self._pending = (voiceover, audio_volumes)
+        self._ticks = round(VOICEOVER_DELAY * self._tick_rate)
+
+    def update_fixed(self) -> None:
+        """ Count down the delay or the length of the playing voiceover by one tick """
+
+        if self._ticks is None:
+            return
+
+        self._ticks -= 1
+
+        if self._ticks > 0:
+            return
+
+        self._ticks = None
+
+        if self._pending:
+            voiceover, audio_volumes = self._pending
+            self._pending = None
+            self.play_voiceover(voiceover, audio_volumes)
+        else:
+            self.on_speech_completed()
+
     def on_speech_completed(self) -> None:
         """ Executed after voice playback is completed """
 
         logging.info('Speech completed')
 
         self._media = None
+        self._voiceover = None
+        self._ticks = None
 
         if not any(self.randomized_voiceovers):
             logging.info('All voiceovers played')
@@ -52,39 +102,30 @@ class VoiceOverTiggers:
 
         self.playing = False
 
-    @staticmethod
-    def voiceover_path(root_dir: str, languages: list, voiceover: str) -> str:
-        """ Get path to voiceover """
-
-        for l in languages:
-            path = os.path.join(root_dir, 'resources', 'speech', l[0], voiceover)
-            if os.path.isfile(path):
-                return path
-
-        return os.path.join(root_dir, 'resources', 'speech', DEFAULT_LOCALE, voiceover)
-
-    def play_voiceover(
-            self,
-            delta_time: float,
-            root_dir: str,
-            voiceover: str,
-            audio_volumes: AudioVolumes
-    ):
+    def play_voiceover(self, voiceover: str, audio_volumes: AudioVolumes):
         """ Play voiceover """
 
         logging.info(label_value('Play speech', voiceover))
 
-        languages = list(map(lambda x: x.split('_'), os.environ['LANG'].split(':')))
+        window = arcade.get_window()
+
+        # Path and length are resolved for all fallback languages at startup
+        path = window.locale.voiceover_path(voiceover)
+
+        if not path:
+            logging.error(label_value('Voiceover not found', voiceover))
+            self.on_speech_completed()
+            return None
 
-        sound = arcade.load_sound(
-            self.voiceover_path(root_dir, languages, voiceover),
-            streaming=audio_volumes.streaming
-        )
+        sound = window.sounds.load(path, AUDIO_SPEECH)
 
         playback = sound.play(volume=audio_volumes.volume_speech)
-        playback.on_player_eos = self.on_speech_completed
+
+        # Completed by tick count instead of the end of stream event of the player
+        self._ticks = max(round(window.locale.voiceover_duration(voiceover) * self._tick_rate), 1)
 
         self._media = playback
+        self._voiceover = voiceover
         return playback
 
     def pop(self, first=False) -> str | None:
@@ -101,3 +142,9 @@ class VoiceOverTiggers:
     @property
     def media(self):
         return self._media
+
+    @property
+    def voiceover(self) -> str | None:
+        """ Id of the playing voiceover """
+
+        return self._voiceover
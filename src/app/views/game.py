@@ -1,5 +1,7 @@
 """ Main game class """
 
+import random
+
 from arcade import FACE_LEFT, FACE_RIGHT
 
 from app.constants.input.controllers import (
@@ -11,7 +13,9 @@ from app.constants.input.controllers import (
     KEY_START
 )
 from app.constants.input.keyboard import KEY_LEFT, KEY_RIGHT, KEY_JUMP, KEY_SPRINT, KEY_ESCAPE
+from app.utils.inputlog import InputFrame, InputLog
 from app.utils.level import Level
+from app.utils.timings import TIMING_LEVEL_UPDATE, TIMING_LEVEL_DRAW
 from app.views.view import View
 
 
@@ -27,6 +31,9 @@ class Game(View):
         self._move_horizontal = None
         self._jump = False
         self._sprint = False
+        self._input_log = None
+        self._input_log_path = None
+        self._replay = None
 
     def setup(self, root_dir: str):
         """ Setup game"""
@@ -37,32 +44,96 @@ class Game(View):
         self._level = Level()
         self.window.set_mouse_visible(False)
 
-    def setup_level(self, map_name: str):
-        """ Setup level """
+    def preload_level(self, map_name: str) -> list:
+        """ Preload level assets on a worker thread """
+
+        return self._level.preload(self._root_dir, map_name)
+
+    def setup_level(self, map_name: str, replay: InputLog | None = None):
+        """
+        Setup level
+        @param map_name: The map
+        @param replay: Input log to simulate instead of the player's input
+        """
+
+        if replay:
+            random.seed(replay.seed)
+            self._replay = iter(replay)
+
+            # The states of the replay are compared with the recorded ones
+            self._input_log = InputLog(map_name, replay.update_rate, replay.seed)
+        elif self.window.record_input:
+            seed = random.randrange(2 ** 32)
+            random.seed(seed)
+            self._input_log = InputLog(map_name, round(1 / self.window.fixed_delta_time), seed)
+
+            # Saved again to the same file on every pause
+            self._input_log_path = InputLog.recording_path()
 
         self._level.setup(self._root_dir, map_name, self.window.audio_volumes)
 
+    def simulate(self, frames) -> None:
+        """
+        Simulate input frames instead of the player's input
+        @param frames: Iterator of InputFrame
+        """
+
+        self._replay = frames
+
+    @property
+    def level(self) -> Level:
+        """ The level """
+
+        return self._level
+
+    @property
+    def input_log(self) -> InputLog | None:
+        """ Input and states recorded so far """
+
+        return self._input_log
+
     def on_update(self, delta_time: float):
         """ On level update """
-        self._level.update(
-            delta_time=delta_time,
-            window=self.window,
-            move_horizontal=self._move_horizontal,
-            jump=self._jump,
-            sprint=self._sprint
-        )
 
-        if self._jump:
-            self._jump = False
+        with self.window.timings.measure(TIMING_LEVEL_UPDATE):
+            self._level.update(delta_time=delta_time, window=self.window)
 
     def on_fixed_update(self, delta_time: float):
-        self._level.update_fixed()
+        """ Simulate one tick with the sampled input """
+
+        frame = self.sample_input()
+
+        if self._input_log is not None:
+            self._input_log.record(frame)
+
+        self._level.update_fixed(
+            move_horizontal=frame.move_horizontal,
+            jump=frame.jump,
+            sprint=frame.sprint
+        )
+
+        if self._input_log is not None:
+            self._input_log.record_state(self._level.player.position, self._level.completed)
+
+    def sample_input(self) -> InputFrame:
+        """ Input frame for the next tick """
+
+        if self._replay:
+            return next(self._replay, InputFrame())
+
+        frame = InputFrame(self._move_horizontal, self._jump, self._sprint)
+        self._jump = False
+
+        return frame
 
     def on_draw(self):
         """ On draw """
 
         self.clear()
-        self._level.draw()
+
+        with self.window.timings.measure(TIMING_LEVEL_DRAW):
+            self._level.draw()
+
         self.window.draw_after()
 
     def on_key_press(self, symbol: int, modifiers: int):
@@ -145,6 +216,12 @@ class Game(View):
     def on_continue(self) -> None:
         self._level.on_continue()
 
+    def on_hide_view(self) -> None:
+        """ Save the input recorded so far """
+
+        if self._input_log_path:
+            self._input_log.save(self._input_log_path)
+
     def unsetup(self) -> None:
         """ Unsetup game """
 
@@ -5,7 +5,7 @@ import random
 import arcade
 import pyglet
 
-from app.views.mainmenu import MainMenu
+from app.utils.preloader import Preloader
 from app.views.view import View
 
 SCENE_LAYER_LOGO = 'Logo'
@@ -57,7 +57,9 @@ class Logo(View):
 
         super().on_update(delta_time)
 
-        if self._phase == PHASE_NEXT:
+        # Switch when the menu assets are preloaded and uploaded
+        if self._phase == PHASE_NEXT and self._preloader.update():
+            from app.views.mainmenu import MainMenu
             self.window.show_view(MainMenu().setup(root_dir=self._root_dir))
 
         if self._phase == PHASE_FADE_IN:
@@ -72,11 +74,14 @@ class Logo(View):
                     'grunt',
                     f'{sound_number:03d}.mp3'
                 )
-                sound = arcade.load_sound(file, streaming=self.window.audio_volumes.streaming)
+                sound = self.window.sounds.load(file)
                 sound.play(volume=self.window.audio_volumes.volume_sound)
 
                 self._phase = PHASE_WAIT
 
+                # Load the menu while the logo is shown
+                self._preloader = Preloader().start(self.preload_main_menu, self._root_dir)
+
                 pyglet.clock.schedule_interval(self.fade_to_main_menu, LOGO_LENGTH)
 
         if self._phase == PHASE_FADE_OUT:
@@ -94,6 +99,15 @@ class Logo(View):
 
         self.window.draw_after()
 
+    @staticmethod
+    def preload_main_menu(root_dir: str) -> list:
+        """ Import and preload the menu on a worker thread """
+
+        # Imported here, so the first frame of the logo doesn't wait for it
+        from app.views.mainmenu import MainMenu
+
+        return MainMenu.preload(root_dir)
+
     def fade_to_main_menu(self, dt: float):
         """ Show StartScreen """
         self._phase = PHASE_FADE_OUT
@@ -2,18 +2,19 @@
 
 import logging
 import os
-import random
-import webbrowser
 
 import arcade
 
+from app.constants.audio import AUDIO_MUSIC
 from app.constants.fonts import FONT_MARKER_FELT, FONT_CONSOLA_MONO
 from app.constants.gameinfo import VERSION_STRING, MAPS
 from app.constants.input.controllers import KEY_START, KEY_BACK
 from app.constants.input.keyboard import KEY_ESCAPE, KEY_CONFIRM
 from app.constants.input.mouse import BUTTON_LEFT_CLICK
 from app.effects.filmgrain import Filmgrain
-from app.views.game import Game
+from app.utils.layout import ANCHOR_LEFT, ANCHOR_RIGHT, ANCHOR_BOTTOM, ANCHOR_TOP, ANCHOR_CENTER
+from app.utils.particlesystem import ParticleSystem
+from app.utils.preloader import Preloader
 from app.views.view import View
 
 BACKGROUND_COLOR = (58, 158, 236, 255)
@@ -28,7 +29,6 @@ MARGIN = 10
 
 SCENE_LAYER_FADEIN = 'fadein'
 SCENE_LAYER_ICON = 'icon'
-SCENE_LAYER_PARTICLES = 'particles'
 SCENE_LAYER_TEXT = 'Text'
 
 PARTICLE_SPEED = 2
@@ -62,6 +62,8 @@ class MainMenu(View):
         self._last_hover = None
 
         self._sound_hover = None
+        self._particles = None
+        self._next_view = None
 
         self._effects = []
 
@@ -78,6 +80,7 @@ class MainMenu(View):
         self.setup_particles()
         self.setup_text()
         self.setup_icons(root_dir)
+        self.setup_layout()
 
         # Play music
         self.setup_music(root_dir)
@@ -85,15 +88,23 @@ class MainMenu(View):
 
         self.on_update(0)
 
-        self._effects = [
-            Filmgrain()
-        ]
-
-        for effect in self._effects:
-            effect.setup(self._scene, None, root_dir)
+        self._effects = self.window.effects.lend([Filmgrain], self._scene, None, root_dir)
 
         return self
 
+    @staticmethod
+    def preload(root_dir: str) -> list:
+        """ Preload menu assets on a worker thread """
+
+        arcade.get_window().sounds.load(
+            os.path.join(root_dir, 'resources', 'sounds', 'common', 'hover.mp3')
+        )
+
+        return Preloader.textures([
+            os.path.join(root_dir, 'resources', 'images', 'ui', 'itch-io.jpg'),
+            os.path.join(root_dir, 'resources', 'images', 'ui', 'exit.jpg'),
+        ])
+
     def setup_text(self):
         """ Setup text """
 
@@ -143,58 +154,47 @@ class MainMenu(View):
         )
         self._scene.add_sprite(SCENE_LAYER_ICON, self._icon_exit)
 
+    def setup_layout(self):
+        """ Anchor text and icons to the window """
+
+        self._layout.add(self._text_start, x=ANCHOR_CENTER, y=ANCHOR_BOTTOM, margin=MARGIN)
+        self._layout.add(self._text_title, x=ANCHOR_CENTER, y=ANCHOR_CENTER)
+        self._layout.add(self._text_version, x=ANCHOR_LEFT, y=ANCHOR_BOTTOM, margin=MARGIN)
+        self._layout.add(self._icon_itch_io, x=ANCHOR_RIGHT, y=ANCHOR_BOTTOM, margin=MARGIN)
+        self._layout.add(self._icon_exit, x=ANCHOR_RIGHT, y=ANCHOR_TOP, margin=MARGIN)
+
     def setup_music(self, root_dir: str):
         """ Play music """
 
-        music = arcade.load_sound(
+        music = self.window.sounds.load(
             os.path.join(root_dir, 'resources', 'music', 'DeepSpace.mp3'),
-            streaming=True
+            AUDIO_MUSIC
         )
         self._music = music.play(loop=True, volume=self.window.audio_volumes.volume_music)
 
     def setup_sounds(self, root_dir: str):
         """ Setup sounds """
 
-        self._sound_hover = arcade.load_sound(
+        self._sound_hover = self.window.sounds.load(
             os.path.join(root_dir, 'resources', 'sounds', 'common', 'hover.mp3'),
         )
 
     def setup_particles(self):
         """ Setup article animation """
 
-        try:
-            self._scene[SCENE_LAYER_PARTICLES].clear()
-        except KeyError:
-            pass
-
-        for i in range(0, PARTICLES_COUNT):
-            sprite = arcade.sprite.SpriteCircle(
-                color=random.choice(PARTICLE_COLORS),
-                soft=True,
-                radius=random.randint(1, PARTICLES_SIZE_RANGE)
-            )
-            sprite.center_x = random.randint(0, self.window.width)
-            sprite.center_y = random.randint(0, self.window.height)
-            self._scene.add_sprite(SCENE_LAYER_PARTICLES, sprite)
+        self._particles = ParticleSystem().setup(
+            count=PARTICLES_COUNT,
+            area=(0, self.window.width, 0, self.window.height),
+            radius=(1, PARTICLES_SIZE_RANGE),
+            colors=PARTICLE_COLORS,
+            velocity=(-PARTICLE_SPEED, 0)
+        )
 
     def on_update(self, delta_time: float):
         """ On update """
 
-        self.on_update_particles()
-        self._text_start.center_x = self.window.width / 2
-        self._text_start.bottom = MARGIN
-
-        self._text_title.center_x = self.window.width / 2
-        self._text_title.center_y = self.window.height / 2
-
-        self._text_version.left = MARGIN
-        self._text_version.bottom = MARGIN
-
-        self._icon_itch_io.right = self.window.width - MARGIN
-        self._icon_itch_io.bottom = MARGIN
-
-        self._icon_exit.right = self.window.width - MARGIN
-        self._icon_exit.top = self.window.height - MARGIN
+        self._particles.update()
+        self.update_layout()
 
         for effect in self._effects:
             effect.update(delta_time)
@@ -210,22 +210,16 @@ class MainMenu(View):
                     self._music.pause()
                     self._music = None
 
-                    view = Game()
-                    view.setup(self._root_dir)
-                    view.setup_level(MAPS[0])
-
-                    self.window.show_view(view)
-
-    def on_update_particles(self):
-        """ Update particles """
+            # Switch when the level assets are preloaded and uploaded
+            if not self._music and self._preloader.update():
+                self._next_view.setup_level(MAPS[0])
+                self.window.show_view(self._next_view)
 
-        particles = self._scene[SCENE_LAYER_PARTICLES]
-        for particle in particles:
-            particle.center_x -= PARTICLE_SPEED
+    def on_resize(self, width: int, height: int):
+        """ Respawn particles at the new right edge """
 
-            if particle.right < 0:
-                particle.center_x = self.window.width + particle.width
-                particle.center_y = random.randint(0, self.window.height)
+        super().on_resize(width, height)
+        self._particles.respawn_x = width
 
     def on_draw(self):
         """ On draw"""
@@ -233,6 +227,9 @@ class MainMenu(View):
         # Clear screen
         self.clear()
 
+        # Particles are in the background
+        self._particles.draw()
+
         # Draw scene
         self._scene.draw()
 
@@ -265,6 +262,7 @@ class MainMenu(View):
             if not self._last_hover.collides_with_point((x, y)):
                 self._last_hover.scale = 1.0
                 self._last_hover = None
+                self._layout.invalidate()
             return
 
         sprites = [
@@ -280,6 +278,7 @@ class MainMenu(View):
 
                 self._last_hover = sprite
                 self._last_hover.scale = 1.02
+                self._layout.invalidate()
                 break
 
     def on_mouse_press(self, x, y, button, modifiers) -> bool | None:
@@ -308,6 +307,10 @@ class MainMenu(View):
     def on_start_game(self) -> None:
         """ On start new game """
 
+        # Already fading out to the game
+        if self._next_view or self._preloader:
+            return
+
         self.window.set_mouse_visible(False)
 
         self._fade_sprite = arcade.sprite.SpriteSolidColor(
@@ -321,14 +324,21 @@ class MainMenu(View):
         self._fade_sprite.alpha = 0
         self._scene.add_sprite(SCENE_LAYER_FADEIN, self._fade_sprite)
 
+        # Load the level while fading out
+        from app.views.game import Game
+        self._next_view = Game()
+        self._next_view.setup(self._root_dir)
+        self._preloader = Preloader().start(self._next_view.preload_level, MAPS[0])
+
     @staticmethod
     def on_itch_io() -> None:
         """ On open itch.io """
 
+        import webbrowser
         webbrowser.open_new_tab(URL_ITCH_IO)
 
-    @staticmethod
-    def on_exit() -> None:
+    def on_exit(self) -> None:
         """ On exit game """
 
-        arcade.exit()
+        # Closing the window writes the pending screenshots before the loop ends
+        self.window.close()
@@ -7,6 +7,8 @@ from app.constants.fonts import FONT_MARKER_FELT
 from app.constants.input.controllers import KEY_START
 from app.constants.input.keyboard import KEY_CONFIRM
 from app.effects.filmgrain import Filmgrain
+from app.utils.layout import ANCHOR_CENTER
+from app.utils.preloader import Preloader
 from app.views.view import View
 
 FONT_SIZE = 60
@@ -50,15 +52,10 @@ class ToBeContinued(View):
         )
 
         self._scene.add_sprite(SCENE_LAYER_TEXT, self._text_completed)
-        self._scene[SCENE_LAYER_TEXT].visible = False
-
-        self._effects = [
-            Filmgrain()
-        ]
-
-        for effect in self._effects:
-            effect.setup(self._scene, None, root_dir)
+        self._layout.add(self._text_completed, x=ANCHOR_CENTER, y=ANCHOR_CENTER)
+        self.update_layout()
 
+        self._effects = self.window.effects.lend([Filmgrain], self._scene, None, root_dir)
 
         return self
 
@@ -69,20 +66,16 @@ class ToBeContinued(View):
             self.on_main_menu()
 
     def on_update(self, delta_time: float):
-        w, h = self.window.get_size()
-        self._text_completed.center_x = w / 2
-        self._text_completed.center_y = h / 2
-        self._scene[SCENE_LAYER_TEXT].visible = True
+        """ On update """
+
+        self.update_layout()
 
         for effect in self._effects:
             effect.update(delta_time)
 
         if SCENE_LAYER_FADE in self._scene:
-            self._fade_sprite.visible = True
-            self._fade_sprite.center_x = w / 2
-            self._fade_sprite.center_y = h / 2
-
-            if self._fade_sprite.alpha >= FADE_MAX:
+            # Switch when the menu assets are preloaded and uploaded
+            if self._fade_sprite.alpha >= FADE_MAX and self._preloader.update():
                 from app.views.mainmenu import MainMenu
                 self.window.show_view(MainMenu().setup(self._root_dir))
 
@@ -114,7 +107,11 @@ class ToBeContinued(View):
             height=self.window.height,
             color=BACKGROUND_COLOR
         )
-        self._fade_sprite.visible = False
         self._fade_sprite.alpha = 0
 
         self._scene.add_sprite(SCENE_LAYER_FADE, self._fade_sprite)
+        self._layout.add(self._fade_sprite, x=ANCHOR_CENTER, y=ANCHOR_CENTER)
+        self.update_layout()
+
+        from app.views.mainmenu import MainMenu
+        self._preloader = Preloader().start(MainMenu.preload, self._root_dir)
@@ -2,6 +2,8 @@
 
 import arcade
 
+from app.utils.layout import Layout
+
 
 class View(arcade.View):
     """ View """
@@ -16,8 +18,21 @@ class View(arcade.View):
         self._fade_sprite = None
         self._phase = None
         self._music = None
+        self._preloader = None
+        self._layout = Layout()
 
     def setup(self, root_dir: str):
         """ Setup view """
         self._root_dir = root_dir
         self._scene = arcade.scene.Scene()
+        self._layout = Layout()
+
+    def on_resize(self, width: int, height: int):
+        """ Position the anchored sprites again """
+
+        self._layout.invalidate()
+
+    def update_layout(self) -> None:
+        """ Position the anchored sprites if the window size or their content changed """
+
+        self._layout.update(*self.window.get_size())
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+""" Headless benchmark """
+import os
+import sys
+
+# No GPU or display needed
+os.environ.setdefault('ARCADE_HEADLESS', '1')
+
+import pyglet
+
+pyglet.options['debug_gl'] = False
+
+if hasattr(sys, 'frozen'):
+    root_dir = os.path.dirname(os.path.abspath(sys.executable))
+else:
+    root_dir = os.path.dirname(os.path.abspath(__file__))
+
+from app.benchmark import Benchmark
+
+sys.exit(Benchmark().setup(root_dir).start())
@@ -13,6 +13,42 @@ def translations(ctx: Context):
     print(ctx.run('pybabel compile -f -d resources/locales --use-fuzzy'))
 
 
+@duty
+def maps(ctx: Context):
+    """ Compile maps """
+
+    from app.utils.mapcache import MapCache
+
+    print(ctx.run(MapCache.compile_all, args=['resources/maps']))
+
+
+@duty
+def atlases(ctx: Context):
+    """ Build texture atlas pages for maps """
+
+    from app.utils.atlascache import AtlasCache
+
+    print(ctx.run(AtlasCache.build_all, args=['resources/maps']))
+
+
+@duty
+def variants(ctx: Context):
+    """ Build downscaled variants of large map images """
+
+    from app.utils.texturevariants import TextureVariants
+
+    print(ctx.run(TextureVariants.build_all, args=['resources/maps']))
+
+
+@duty
+def subtitles(ctx: Context):
+    """ Compile timed subtitles of the voiceovers """
+
+    from app.utils.subtitles import SubtitleTrack
+
+    print(ctx.run(SubtitleTrack.build_all, args=['resources/speech']))
+
+
 @duty
 def optimize(ctx: Context):
     """ Optimize images """''
@@ -0,0 +1,36 @@
+""" Test setup """
+
+import gettext
+import os
+
+import pytest
+
+# Arcade opens a window on import unless it runs headless
+os.environ.setdefault('ARCADE_HEADLESS', '1')
+
+gettext.install('messages')
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAPS_DIR = os.path.join(ROOT_DIR, 'resources', 'maps')
+SPEECH_DIR = os.path.join(ROOT_DIR, 'resources', 'speech')
+
+
+@pytest.fixture(scope='session')
+def window():
+    """ Hidden benchmark window with silent audio """
+
+    import arcade
+
+    from app.benchmark import BenchmarkWindow, SilentSound
+    from app.utils.audiovolumes import AudioVolumes
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(arcade, 'load_sound', SilentSound)
+        monkeypatch.setattr(arcade, 'stop_sound', lambda player: player.delete())
+
+        game_window = BenchmarkWindow(width=1280, height=720, visible=False, vsync=False, antialiasing=False)
+        game_window.setup(ROOT_DIR, AudioVolumes(0, 0, 0, 0, streaming=False))
+
+        yield game_window
+
+        game_window.close()
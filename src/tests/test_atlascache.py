@@ -0,0 +1,86 @@
+""" Tests for the prepacked atlas pages """
+
+import json
+import os
+import shutil
+
+import pytest
+
+from app.utils.atlascache import AtlasCache, KEY_CHECKSUM, KEY_IMAGES
+from app.utils.mapcache import MapCache
+from app.utils.texturevariants import TextureVariants
+from tests.conftest import MAPS_DIR
+
+
+def test_pack_fits_pages():
+    """ Images are packed into pages without overlapping, oversized ones are left out """
+
+    sizes = {'a': (60, 40), 'b': (50, 50), 'c': (30, 20), 'd': (100, 100), 'huge': (200, 10)}
+    regions = AtlasCache.pack(sizes, page_size=100)
+
+    assert 'huge' not in regions
+
+    for name, (page, x, y, width, height) in regions.items():
+        assert (width, height) == sizes[name]
+        assert x + width <= 100 and y + height <= 100
+
+        for other, (other_page, other_x, other_y, other_width, other_height) in regions.items():
+            if other != name and other_page == page:
+                assert (
+                    x + width <= other_x or other_x + other_width <= x
+                    or y + height <= other_y or other_y + other_height <= y
+                )
+
+
+def test_tier_paths():
+    """ Tiers have their own manifests and pages """
+
+    assert AtlasCache.cache_path('maps/map01.tmx') == 'maps/map01.atlas.json'
+    assert AtlasCache.cache_path('maps/map01.tmx', 0.5) == 'maps/map01@50.atlas.json'
+    assert AtlasCache.page_path('maps/map01.tmx', 1, 0.25) == 'maps/map01@25.atlas1.png'
+
+
+def test_tier_pages_hold_variants():
+    """ The pages of a tier hold its variants instead of the full size images they replace """
+
+    path = os.path.join(MAPS_DIR, 'map01.tmx')
+    tiled_map, variants = TextureVariants.select(MapCache.read(path), 0.5)
+
+    with open(AtlasCache.cache_path(path, 0.5), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    replaced = set(AtlasCache.images(MapCache.read(path))) - set(AtlasCache.images(tiled_map))
+
+    assert variants and replaced
+    assert manifest[KEY_CHECKSUM] == MapCache.checksum(path)
+    # Variants larger than a page like the backdrop are left out
+    assert {str(variant) for variant in variants} & set(manifest[KEY_IMAGES])
+    assert not replaced & set(manifest[KEY_IMAGES])
+
+
+@pytest.fixture
+def map_copy(tmp_path):
+    """ Copy of the map, its atlas pages and images """
+
+    shutil.copytree(MAPS_DIR, tmp_path / 'maps')
+    shutil.copytree(os.path.join(os.path.dirname(MAPS_DIR), 'images'), tmp_path / 'images')
+
+    return str(tmp_path / 'maps' / 'map01.tmx')
+
+
+def test_load_uses_pages(map_copy):
+    """ Unchanged images are taken from the pages """
+
+    assert AtlasCache.load(MapCache.read(map_copy))
+
+
+def test_edited_image_invalidates_pages(map_copy):
+    """ Pages aren't used once a packed image changed """
+
+    with open(AtlasCache.cache_path(map_copy), 'r', encoding='utf-8') as f:
+        name = sorted(json.load(f)[KEY_IMAGES])[0]
+
+    with open(os.path.join(os.path.dirname(map_copy), name), 'ab') as f:
+        f.write(b'\0')
+
+    assert AtlasCache.load(MapCache.read(map_copy)) == 0
@@ -0,0 +1,88 @@
+""" Tests for the MP3 length and the streaming policy """
+
+import struct
+
+import pytest
+
+from app.constants.audio import AUDIO_DECODED_BYTES_PER_SECOND, AUDIO_MUSIC, AUDIO_SFX, AUDIO_ATMO
+from app.utils.audiopolicy import AudioPolicy
+from app.utils.mp3 import mp3_duration
+
+# MPEG 1 layer III, 128 kbit/s, 44.1 kHz, no padding
+FRAME_HEADER = b'\xff\xfb\x90\x00'
+FRAME_SIZE = 144 * 128000 // 44100
+FRAME_SECONDS = 1152 / 44100
+
+
+def write_mp3(path, frames: int, id3: bool = False) -> str:
+    """ Write an MP3 file of silent frames """
+
+    data = b''
+
+    if id3:
+        # ID3v2 tag with a size of 200 as synchsafe integer
+        data += b'ID3\x03\x00\x00' + struct.pack('>4B', 0, 0, 1, 72) + b'\0' * 200
+
+    data += (FRAME_HEADER + b'\0' * (FRAME_SIZE - len(FRAME_HEADER))) * frames
+    path.write_bytes(data)
+
+    return str(path)
+
+
+@pytest.mark.parametrize('id3', [False, True])
+def test_mp3_duration(tmp_path, id3):
+    """ The length is summed up from the frame headers """
+
+    path = write_mp3(tmp_path / 'sound.mp3', 100, id3=id3)
+
+    assert mp3_duration(path) == pytest.approx(100 * FRAME_SECONDS)
+
+
+def test_mp3_duration_of_other_file(tmp_path):
+    """ Files without frames have no length """
+
+    path = tmp_path / 'sound.mp3'
+    path.write_bytes(b'RIFF' + b'\0' * 100)
+
+    assert mp3_duration(str(path)) == 0
+
+
+def test_short_sounds_are_decoded(tmp_path):
+    """ Sounds are streamed if they decode to more than the limit of their category """
+
+    policy = AudioPolicy().setup(streaming=True)
+    short = write_mp3(tmp_path / 'short.mp3', 10)
+    long = write_mp3(tmp_path / 'long.mp3', 1000)
+
+    assert policy.decoded_size(short) == int(10 * FRAME_SECONDS * AUDIO_DECODED_BYTES_PER_SECOND)
+    assert not policy.streaming(short, AUDIO_SFX)
+    assert policy.streaming(long, AUDIO_SFX)
+    assert policy.streaming(short, AUDIO_MUSIC)
+    assert policy.streaming(str(tmp_path / 'missing.mp3'), AUDIO_SFX)
+
+
+def test_without_streaming_everything_is_decoded(tmp_path):
+    """ Disabled streaming decodes all sounds and only the cache budget applies """
+
+    policy = AudioPolicy().setup(streaming=False)
+
+    assert not policy.streaming(write_mp3(tmp_path / 'long.mp3', 1000), AUDIO_MUSIC)
+    assert policy.budget(AUDIO_SFX) is None
+
+
+def test_preload_skips_streamed_sounds(tmp_path):
+    """ Only sounds which are decoded are preloaded """
+
+    sounds_dir = tmp_path / 'resources' / 'sounds'
+    sounds_dir.mkdir(parents=True)
+
+    policies = {
+        AUDIO_ATMO: {'max_decoded_per_sound': 0, 'max_decoded': 0, 'preload': ['sounds/{map_name}.mp3']},
+        AUDIO_SFX: {'max_decoded_per_sound': 1024 * 1024, 'max_decoded': 0, 'preload': ['sounds/sfx.mp3']},
+    }
+    write_mp3(sounds_dir / 'map01.mp3', 10)
+    sfx = write_mp3(sounds_dir / 'sfx.mp3', 10)
+
+    preload = AudioPolicy().setup(streaming=True, policies=policies).preload(str(tmp_path), map_name='map01')
+
+    assert preload == [(sfx, AUDIO_SFX)]
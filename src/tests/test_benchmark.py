@@ -0,0 +1,64 @@
+""" Tests for the benchmark input scripts """
+
+import json
+
+import pytest
+
+from app.benchmark import Benchmark, DEFAULT_SCRIPT, MOVE_LEFT, MOVE_RIGHT
+
+
+def write_script(tmp_path, script) -> str:
+    """ Write a script file """
+
+    path = tmp_path / 'script.json'
+    path.write_text(json.dumps(script), encoding='utf-8')
+
+    return str(path)
+
+
+def test_expand_script_one_frame_per_tick():
+    """ Steps are repeated for their ticks and the script loops until the end """
+
+    script = [
+        {'ticks': 2, 'move': MOVE_RIGHT, 'jump': True},
+        {'ticks': 1, 'move': MOVE_LEFT, 'sprint': True},
+    ]
+
+    assert list(Benchmark.expand_script(script, 5)) == [
+        (MOVE_RIGHT, True, False),
+        (MOVE_RIGHT, False, False),
+        (MOVE_LEFT, False, True),
+        (MOVE_RIGHT, True, False),
+        (MOVE_RIGHT, False, False),
+    ]
+
+
+def test_expand_script_jump_every():
+    """ Jumps are pressed on the last tick of every interval """
+
+    frames = Benchmark.expand_script([{'ticks': 6, 'jump_every': 3}], 6)
+
+    assert [jump for _move, jump, _sprint in frames] == [False, False, True, False, False, True]
+
+
+@pytest.mark.parametrize('script', [[], [{'ticks': 0}]])
+def test_expand_script_without_ticks_ends(script):
+    """ A script which never advances yields nothing instead of hanging """
+
+    assert list(Benchmark.expand_script(script, 10)) == []
+
+
+def test_load_default_script():
+    assert Benchmark.load_script(None) is DEFAULT_SCRIPT
+
+
+def test_load_script(tmp_path):
+    script = [{'ticks': 10, 'move': MOVE_RIGHT}]
+
+    assert Benchmark.load_script(write_script(tmp_path, script)) == script
+
+
+@pytest.mark.parametrize('script', [[], {'ticks': 10}, [{'ticks': 10}, {'ticks': 0}], [10]])
+def test_load_script_rejects_scripts_which_never_advance(tmp_path, script):
+    with pytest.raises(ValueError):
+        Benchmark.load_script(write_script(tmp_path, script))
@@ -0,0 +1,99 @@
+""" Tests for the chunked scene """
+
+import arcade
+
+from app.utils.chunkedscene import ChunkedScene
+
+CHUNK_WIDTH = 100
+TILE_WIDTH = 50
+LAYER = 'Ground'
+
+
+def tile_at(left: float, width: float = TILE_WIDTH) -> arcade.Sprite:
+    """ Tile with its left edge at x """
+
+    sprite = arcade.SpriteSolidColor(width, TILE_WIDTH, color=arcade.color.WHITE)
+    sprite.left = left
+
+    return sprite
+
+
+def chunked_scene(tiles: list) -> ChunkedScene:
+    """ Scene with one chunked layer """
+
+    scene = ChunkedScene()
+    scene._chunk_width = CHUNK_WIDTH
+    scene.add_sprite_list(LAYER, sprite_list=arcade.SpriteList())
+
+    for tile in tiles:
+        scene.add_sprite(LAYER, tile)
+
+    scene.chunk_layer(LAYER)
+
+    return scene
+
+
+def camera_between(left: float, right: float) -> arcade.camera.Camera2D:
+    """ Camera seeing the horizontal range """
+
+    width = right - left
+
+    return arcade.camera.Camera2D(
+        position=(left + width / 2, 0),
+        projection=arcade.LRBT(-width / 2, width / 2, -100, 100)
+    )
+
+
+def visible_tiles(scene: ChunkedScene) -> list:
+    """ Left edges of the tiles in the visible chunks """
+
+    return sorted(
+        sprite.left
+        for chunk in scene._visible[LAYER]
+        for sprite in chunk.sprite_list
+    )
+
+
+def test_cull_keeps_chunks_at_view_edges(window):
+    """ Chunks partially in view on both sides are drawn, others are culled """
+
+    scene = chunked_scene([tile_at(x) for x in range(0, 1000, TILE_WIDTH)])
+
+    scene.cull(camera_between(250, 550))
+
+    assert visible_tiles(scene) == list(range(200, 600, TILE_WIDTH))
+
+
+def test_cull_keeps_chunk_touching_view_edge(window):
+    """ Chunks ending or starting exactly at a view edge are still visible """
+
+    scene = chunked_scene([tile_at(x) for x in range(0, 1000, TILE_WIDTH)])
+
+    scene.cull(camera_between(200, 300))
+
+    assert visible_tiles(scene) == list(range(100, 400, TILE_WIDTH))
+
+
+def test_cull_keeps_wide_sprite_reaching_into_view(window):
+    """ A sprite wider than a chunk is drawn although its chunk starts before the view """
+
+    wide = tile_at(0, width=4 * CHUNK_WIDTH)
+    scene = chunked_scene([wide, tile_at(900)])
+
+    scene.cull(camera_between(350, 450))
+
+    assert visible_tiles(scene) == [0]
+
+
+def test_update_skips_culled_chunks(window):
+    """ Only sprites in visible chunks are updated """
+
+    near, far = tile_at(0), tile_at(900)
+    near.change_x = far.change_x = 1
+    scene = chunked_scene([near, far])
+
+    scene.cull(camera_between(0, 300))
+    scene.update(1 / 60)
+
+    assert near.left == 1
+    assert far.left == 900
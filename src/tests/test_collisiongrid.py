@@ -0,0 +1,115 @@
+""" Tests for the collision grid """
+
+from types import SimpleNamespace
+
+import arcade
+import numpy
+import pytiled_parser
+
+from app.utils.collisiongrid import CollisionGrid
+
+TILE_SIZE = 32
+LAYER = 'Walls'
+
+# Row 0 is the top row, 1 is a full tile, 2 a flipped full tile
+DATA = [
+    [0, 0, 0, 0],
+    [1, 1, 0, 0],
+    [1, 1, 0, 1 | 0x80000000],
+]
+
+
+def tilemap(data: list | None) -> SimpleNamespace:
+    """ Tilemap with one wall layer and one tileset of full tiles """
+
+    tileset = SimpleNamespace(image='tiles.png', tile_width=TILE_SIZE, tile_height=TILE_SIZE, tile_count=1)
+
+    return SimpleNamespace(
+        tile_width=TILE_SIZE,
+        scaling=1.0,
+        tiled_map=SimpleNamespace(
+            layers=[pytiled_parser.LayerGroup(name='Group', layers=[pytiled_parser.TileLayer(name=LAYER, data=data)])],
+            tilesets={1: tileset},
+            tile_size=(TILE_SIZE, TILE_SIZE)
+        )
+    )
+
+
+def tile(column: int, row: int, rows: int = len(DATA), width: int = TILE_SIZE, height: int = TILE_SIZE):
+    """ Sprite of a tile in a cell """
+
+    sprite = arcade.SpriteSolidColor(width, height, color=arcade.color.WHITE)
+    sprite.left = column * TILE_SIZE
+    sprite.bottom = (rows - 1 - row) * TILE_SIZE
+
+    return sprite
+
+
+def test_merge_joins_equal_runs_of_rows():
+    """ Equal runs of adjacent rows become one rectangle """
+
+    solid = numpy.array([
+        [1, 1, 0, 1],
+        [1, 1, 0, 1],
+        [1, 1, 1, 1],
+    ], dtype=bool)
+
+    assert sorted(CollisionGrid.merge(solid)) == [(0, 0, 2, 2), (0, 2, 4, 1), (3, 0, 1, 2)]
+
+
+def test_merge_empty_grid():
+    assert CollisionGrid.merge(numpy.zeros((2, 3), dtype=bool)) == []
+
+
+def test_setup_builds_walls_from_merged_cells(window):
+    """ Full tiles become merged rectangles, irregular tiles keep their sprite """
+
+    stool = tile(2, 2, height=TILE_SIZE // 2)
+    sprites = [tile(0, 1), tile(1, 1), tile(0, 2), tile(1, 2), tile(3, 2), stool]
+
+    grid = CollisionGrid().setup(tilemap(DATA), LAYER, sprites)
+    bounds = sorted((wall.left, wall.bottom, wall.width, wall.height) for wall in grid.walls)
+
+    assert bounds == [(0, 0, 64, 64), (64, 0, 32, 16), (96, 0, 32, 32)]
+    assert stool in grid.walls
+
+
+def test_is_solid(window):
+    grid = CollisionGrid().setup(tilemap(DATA), LAYER)
+
+    assert grid.is_solid(10, 10)
+    assert grid.is_solid(40, 50)
+    assert not grid.is_solid(70, 10)
+    assert not grid.is_solid(10, 70)
+    assert not grid.is_solid(-10, 10)
+    assert not grid.is_solid(10, 500)
+
+
+def test_any_solid_ignores_touching_cells(window):
+    """ Cells only touching the rectangle edges don't count """
+
+    grid = CollisionGrid().setup(tilemap(DATA), LAYER)
+
+    # Standing on top of the block
+    assert not grid.any_solid(0, 64, 32, 96)
+    assert grid.any_solid(0, 59, 32, 64)
+
+    # Next to the block and the single tile
+    assert not grid.any_solid(64, 0, 96, 32)
+    assert grid.any_solid(60, 0, 100, 32)
+
+    # Outside of the map
+    assert not grid.any_solid(-100, -100, -50, -50)
+    assert grid.any_solid(-100, -100, 10, 10)
+
+
+def test_layer_without_data_uses_sprites(window):
+    """ Infinite maps have no tile data, all layer sprites collide """
+
+    sprites = [tile(0, 0), tile(5, 0)]
+
+    grid = CollisionGrid().setup(tilemap(None), LAYER, sprites)
+
+    assert list(grid.walls) == sprites
+    assert not grid.is_solid(10, 10)
+    assert not grid.any_solid(0, 0, 1000, 1000)
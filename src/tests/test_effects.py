@@ -0,0 +1,117 @@
+""" Tests for the level effects """
+
+from types import SimpleNamespace
+
+import arcade
+import pytest
+
+from app.constants.layers import LAYER_BUSH, LAYER_CLOUD, LAYER_PLAYER
+from app.effects.bushes import Bushes, ALPHA_MAX, ALPHA_MIN, FADE_SPEED
+from app.effects.cloudanimation import CloudAnimation, CLOUD_SPEED
+from app.utils.chunkedscene import ChunkedScene
+
+# Map of 10 tiles of 32 pixels
+TILEMAP = SimpleNamespace(width=10, tile_width=32)
+
+
+def sprite_at(x: float, y: float = 0, width: int = 32, alpha: int = 255) -> arcade.Sprite:
+    """ Sprite centered at a position """
+
+    sprite = arcade.SpriteSolidColor(width, 32, color=arcade.color.WHITE)
+    sprite.position = x, y
+    sprite.alpha = alpha
+
+    return sprite
+
+
+def scene_with(player: arcade.Sprite, bushes: list | None) -> ChunkedScene:
+    """ Scene with a player and optionally a bush layer """
+
+    scene = ChunkedScene()
+    scene.add_sprite(LAYER_PLAYER, player)
+
+    if bushes is not None:
+        scene.add_sprite_list(LAYER_BUSH, sprite_list=arcade.SpriteList())
+
+        for bush in bushes:
+            scene.add_sprite(LAYER_BUSH, bush)
+
+    return scene
+
+
+@pytest.fixture
+def player():
+    return sprite_at(0)
+
+
+def test_bushes_near_player_fade_out(window, player):
+    """ Near bushes fade to the minimum, far ones stay opaque """
+
+    near, far = sprite_at(40), sprite_at(500)
+    bushes = Bushes()
+    bushes.setup(scene_with(player, [far, near]), TILEMAP, '')
+
+    for _i in range(300):
+        bushes.update(1 / 60)
+
+    assert near.alpha == int(ALPHA_MIN)
+    assert far.alpha == ALPHA_MAX
+
+
+def test_bushes_fade_in_when_player_leaves(window, player):
+    """ Bushes fade back in step by step once the player is gone """
+
+    bush = sprite_at(0, alpha=200)
+    bushes = Bushes()
+    bushes.setup(scene_with(player, [bush]), TILEMAP, '')
+
+    player.center_x = 1000
+    bushes.update(1 / 60)
+
+    assert bush.alpha == 200 + FADE_SPEED
+
+    for _i in range(100):
+        bushes.update(1 / 60)
+
+    assert bush.alpha == ALPHA_MAX
+
+
+def test_bushes_without_layer(window, player):
+    bushes = Bushes()
+    bushes.setup(scene_with(player, None), TILEMAP, '')
+
+    bushes.update(1 / 60)
+
+
+def test_clouds_scroll_and_wrap(window, player):
+    """ Clouds are scrolled as a layer and wrap around at the map width """
+
+    scene = scene_with(player, None)
+    scene.add_sprite(LAYER_CLOUD, sprite_at(100))
+    width = TILEMAP.width * TILEMAP.tile_width
+
+    clouds = CloudAnimation()
+    clouds.setup(scene, TILEMAP, '')
+
+    clouds.update(1 / 60)
+
+    assert scene._scroll[LAYER_CLOUD] == (CLOUD_SPEED, width)
+
+    for _i in range(int(width / CLOUD_SPEED)):
+        clouds.update(1 / 60)
+
+    assert scene._scroll[LAYER_CLOUD] == pytest.approx((CLOUD_SPEED, width))
+    assert scene[LAYER_CLOUD][0].center_x == 100
+
+
+def test_clouds_restart_on_setup(window, player):
+    scene = scene_with(player, None)
+    scene.add_sprite(LAYER_CLOUD, sprite_at(100))
+
+    clouds = CloudAnimation()
+    clouds.setup(scene, TILEMAP, '')
+    clouds.update(1 / 60)
+    clouds.setup(scene, TILEMAP, '')
+    clouds.update(1 / 60)
+
+    assert scene._scroll[LAYER_CLOUD][0] == CLOUD_SPEED
@@ -0,0 +1,95 @@
+""" Tests for the HUD text """
+
+import arcade
+import pytest
+
+from app.utils.hudtext import HudText
+
+
+@pytest.fixture
+def hud(window):
+    return HudText().setup(glyphs='0123456789:.ab')
+
+
+def visible(hud: HudText, field: int) -> list:
+    """ Visible sprites of a field """
+
+    return [sprite for sprite in hud._fields[field][2] if sprite.visible]
+
+
+def test_glyphs_are_laid_out_by_advance(hud):
+    """ Glyphs are placed next to each other from the field origin """
+
+    field = hud.add(100, 50, 8)
+    hud.set(field, '12:3')
+
+    sprites = visible(hud, field)
+    widths = [hud._glyphs[glyph].width for glyph in '12:3']
+
+    assert [sprite.left for sprite in sprites] == [100 + sum(widths[:i]) for i in range(4)]
+    assert all(sprite.bottom == 50 for sprite in sprites)
+    assert [sprite.texture for sprite in sprites] == [hud._glyphs[glyph] for glyph in '12:3']
+
+
+def test_digits_are_monospaced(hud):
+    assert {hud._glyphs[digit].width for digit in '0123456789'} == {hud.advance}
+    assert hud.advance > 0
+    assert hud.height > 0
+
+
+def test_unknown_glyphs_are_skipped_and_text_is_cut(hud):
+    field = hud.add(0, 0, 3)
+
+    hud.set(field, 'a?b12')
+
+    assert [sprite.texture for sprite in visible(hud, field)] == [hud._glyphs[glyph] for glyph in 'ab1']
+    assert hud.text(field) == 'a?b12'
+
+
+def test_shorter_text_hides_sprites(hud):
+    field = hud.add(0, 0, 5)
+
+    hud.set(field, '12345')
+    hud.set(field, '9')
+
+    assert len(visible(hud, field)) == 1
+    assert len(hud._sprites) == 5
+
+
+def test_move_lays_out_again(hud):
+    field = hud.add(0, 0, 4)
+    hud.set(field, '10')
+
+    hud.move(field, 20, 30)
+
+    sprites = visible(hud, field)
+
+    assert (sprites[0].left, sprites[0].bottom) == (20, 30)
+    assert sprites[1].left == 20 + hud.advance
+    assert hud.text(field) == '10'
+
+
+def test_set_creates_no_textures(hud, monkeypatch):
+    """ Changing a text only swaps the textures of existing sprites """
+
+    field = hud.add(0, 0, 6)
+
+    def create(*_args, **_kwargs):
+        raise AssertionError('Texture created after setup')
+
+    monkeypatch.setattr(arcade.Texture, 'create_empty', create)
+    monkeypatch.setattr(arcade, 'Text', create)
+
+    for value in range(100):
+        hud.set(field, f"{value / 10:.1f}")
+
+    assert hud.text(field) == '9.9'
+
+
+def test_setup_again_reuses_glyphs(hud):
+    glyph = hud._glyphs['0']
+
+    hud.setup(glyphs='0123456789:.ab')
+
+    assert hud._glyphs['0'].atlas_name == glyph.atlas_name
+    assert hud._fields == []
@@ -0,0 +1,156 @@
+""" Tests for the input log """
+
+import pytest
+from arcade import FACE_LEFT, FACE_RIGHT
+
+from app.utils.inputlog import InputFrame, InputLog, RUN, RUN_MAX, HEADER, RESULT, CHECKPOINT_INTERVAL
+from app.views.game import Game
+
+# The player falls slowly at the start and lands after about 1300 ticks
+REPLAY_TICKS = 40 * CHECKPOINT_INTERVAL
+
+
+def frames(count: int) -> list:
+    """ Walk right and jump from time to time, then walk left """
+
+    return [
+        InputFrame(FACE_RIGHT if tick < count * 2 // 3 else FACE_LEFT, tick % 45 == 0, tick > count // 3)
+        for tick in range(count)
+    ]
+
+
+def recorded(frame_list: list, **kwargs) -> InputLog:
+    """ Log of input frames """
+
+    log = InputLog(**kwargs)
+
+    for frame in frame_list:
+        log.record(frame)
+
+    return log
+
+
+@pytest.mark.parametrize('frame', [
+    InputFrame(),
+    InputFrame(FACE_LEFT),
+    InputFrame(FACE_RIGHT, jump=True),
+    InputFrame(FACE_LEFT, jump=True, sprint=True),
+    InputFrame(sprint=True),
+])
+def test_frame_flags_round_trip(frame):
+    """ Input frames survive encoding as flags """
+
+    assert InputFrame.from_flags(frame.to_flags()) == frame
+
+
+def test_encode_decode_round_trip():
+    """ A decoded log equals the encoded one """
+
+    log = InputLog('map01', 60, 1234)
+
+    for tick, frame in enumerate(frames(500), start=1):
+        log.record(frame)
+        log.record_state((tick * 1.5, tick / 3), completed=tick >= 400)
+
+    decoded = InputLog.decode(log.encode())
+
+    assert (decoded.map_name, decoded.update_rate, decoded.seed) == ('map01', 60, 1234)
+    assert list(decoded) == list(log)
+    assert decoded.checkpoints == log.checkpoints
+    assert decoded.completed_tick == 400
+    assert log.matches(decoded)
+
+
+def test_runs_are_length_encoded():
+    """ Repeated input is stored as runs which are split at the maximum run length """
+
+    log = recorded([InputFrame(FACE_RIGHT)] * (RUN_MAX + 10) + [InputFrame()] * 5)
+    runs = list(RUN.iter_unpack(log.encode()[HEADER.size + RESULT.size:]))
+
+    assert runs == [(RUN_MAX, 2), (10, 2), (5, 0)]
+    assert len(InputLog.decode(log.encode())) == RUN_MAX + 15
+
+
+def test_decode_version_1():
+    """ Logs without states are still read """
+
+    log = recorded(frames(10), map_name='map01', update_rate=60, seed=1)
+    data = bytearray(log.encode())
+    data[4] = 1
+    del data[HEADER.size:HEADER.size + RESULT.size]
+
+    decoded = InputLog.decode(bytes(data))
+
+    assert list(decoded) == list(log)
+    assert decoded.checkpoints == []
+    assert decoded.completed_tick is None
+
+
+def test_decode_rejects_unknown_logs():
+    """ Other files aren't decoded """
+
+    with pytest.raises(ValueError):
+        InputLog.decode(b'\0' * HEADER.size)
+
+
+def test_matches_detects_divergence():
+    """ A replay with other positions or completion tick doesn't match """
+
+    log = recorded(frames(CHECKPOINT_INTERVAL))
+    log.record_state((1.0, 2.0), completed=False)
+
+    other = recorded(frames(CHECKPOINT_INTERVAL))
+    other.record_state((1.0, 2.5), completed=False)
+
+    completed = recorded(frames(CHECKPOINT_INTERVAL))
+    completed.record_state((1.0, 2.0), completed=True)
+
+    assert not log.matches(other)
+    assert not log.matches(completed)
+
+
+def replay(window, log: InputLog, updates_per_tick: int = 1) -> InputLog:
+    """
+    Simulate a level with the input of a log
+    @param updates_per_tick: Frames drawn per tick
+    @return: Input and states of the simulation
+    """
+
+    view = Game()
+    view.setup(window.root_dir)
+    view.setup_level(log.map_name, replay=log)
+    window.show_view(view)
+
+    # Like the benchmark loop
+    for _tick in range(len(log)):
+        for _update in range(updates_per_tick):
+            view.on_update(window.fixed_delta_time / updates_per_tick)
+
+        view.on_fixed_update(window.fixed_delta_time)
+
+    view.unsetup()
+
+    return view.input_log
+
+
+def test_replay_is_deterministic(window, tmp_path):
+    """ A saved session replays to the same player positions """
+
+    session = replay(window, recorded(frames(REPLAY_TICKS), map_name='map01', update_rate=60, seed=7))
+    path = session.save(str(tmp_path / 'session.input'))
+
+    loaded = InputLog.load(path)
+    again = replay(window, loaded)
+
+    assert len(loaded.checkpoints) == REPLAY_TICKS // CHECKPOINT_INTERVAL
+    assert list(again) == list(loaded)
+    assert loaded.matches(again)
+
+
+def test_replay_is_independent_of_frame_rate(window):
+    """ A session replays to the same states when more frames are drawn per tick """
+
+    session = replay(window, recorded(frames(REPLAY_TICKS), map_name='map01', update_rate=60, seed=7))
+    again = replay(window, session, updates_per_tick=2)
+
+    assert session.matches(again)
@@ -0,0 +1,56 @@
+""" Tests for the anchored layout """
+
+import arcade
+
+from app.utils.layout import Layout, ANCHOR_LEFT, ANCHOR_RIGHT, ANCHOR_TOP, ANCHOR_BOTTOM
+
+
+def box() -> arcade.Sprite:
+    """ A 20 x 10 sprite at the origin """
+
+    return arcade.SpriteSolidColor(20, 10, center_x=0, center_y=0, color=arcade.color.WHITE)
+
+
+def test_anchors():
+    """ Sprites are placed at their edges and the center """
+
+    layout = Layout()
+    top_right = layout.add(box(), x=ANCHOR_RIGHT, y=ANCHOR_TOP, margin=5)
+    bottom_left = layout.add(box(), x=ANCHOR_LEFT, y=ANCHOR_BOTTOM, margin=5)
+    center = layout.add(box())
+
+    assert layout.update(800, 600)
+
+    assert (top_right.right, top_right.top) == (795, 595)
+    assert (bottom_left.left, bottom_left.bottom) == (5, 5)
+    assert (center.center_x, center.center_y) == (400, 300)
+
+
+def test_update_only_on_change():
+    """ Sprites are only placed again after a resize or an invalidation """
+
+    layout = Layout()
+    sprite = layout.add(box(), x=ANCHOR_RIGHT)
+
+    assert layout.update(800, 600)
+    assert not layout.update(800, 600)
+
+    sprite.width = 40
+    layout.invalidate()
+
+    assert layout.update(800, 600)
+    assert sprite.right == 800
+
+    assert layout.update(1024, 768)
+    assert sprite.right == 1024
+
+
+def test_remove():
+    """ Removed sprites aren't placed anymore """
+
+    layout = Layout()
+    sprite = layout.add(box())
+    layout.remove(sprite)
+    layout.update(800, 600)
+
+    assert (sprite.center_x, sprite.center_y) == (0, 0)
@@ -0,0 +1,97 @@
+""" Tests for the locale service """
+
+import os
+import shutil
+
+import pytest
+
+from app.constants.gameinfo import DEFAULT_LOCALE
+from app.utils.localeservice import LocaleService
+from app.utils.mp3 import mp3_duration
+from tests.conftest import ROOT_DIR, SPEECH_DIR
+
+
+@pytest.fixture
+def root_dir(tmp_path):
+    """
+    Root with the real catalogs and a voiceover missing in English
+    text00 is only spoken in the default locale, text01 in both
+    """
+
+    shutil.copytree(os.path.join(ROOT_DIR, 'resources', 'locales'), tmp_path / 'resources' / 'locales')
+
+    for locale, voiceovers in ((DEFAULT_LOCALE, ['text00', 'text01']), ('en', ['text01'])):
+        directory = tmp_path / 'resources' / 'speech' / locale
+        directory.mkdir(parents=True)
+
+        for voiceover in voiceovers:
+            shutil.copy(os.path.join(SPEECH_DIR, locale, f"{voiceover}.mp3"), directory)
+
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize('language, chain', [
+    ('en', ['en', DEFAULT_LOCALE]),
+    ('en_US.UTF-8', ['en_US', 'en', DEFAULT_LOCALE]),
+    ('fr_CA:en@euro', ['fr_CA', 'fr', 'en', DEFAULT_LOCALE]),
+    (DEFAULT_LOCALE, [DEFAULT_LOCALE]),
+    ('', [DEFAULT_LOCALE]),
+    (None, [DEFAULT_LOCALE]),
+])
+def test_fallback_chain(language, chain):
+    assert LocaleService.fallback_chain(language) == chain
+
+
+def test_fallback_chain_without_default():
+    assert LocaleService.fallback_chain('en_US', default=False) == ['en_US', 'en']
+    assert LocaleService.fallback_chain('', default=False) == [DEFAULT_LOCALE]
+
+
+def test_resolve_first_language_wins():
+    available = {'en': {'a': 'en/a'}, 'de': {'a': 'de/a', 'b': 'de/b'}}
+
+    assert LocaleService.resolve(available, ['en', 'de']) == {'a': 'en/a', 'b': 'de/b'}
+    assert LocaleService.resolve(available, ['fr']) == {}
+
+
+def test_missing_voiceover_falls_back_to_default_locale(root_dir):
+    locale = LocaleService().setup(root_dir, 'en_GB')
+    speech_dir = os.path.join(root_dir, 'resources', 'speech')
+
+    assert locale.language == 'en_GB'
+    assert locale.voiceover_path('text00') == os.path.join(speech_dir, DEFAULT_LOCALE, 'text00.mp3')
+    assert locale.voiceover_path('text01') == os.path.join(speech_dir, 'en', 'text01.mp3')
+    assert locale.voiceover_path('text01', DEFAULT_LOCALE) == os.path.join(speech_dir, DEFAULT_LOCALE, 'text01.mp3')
+    assert locale.voiceover_path('text00', 'en') == os.path.join(speech_dir, DEFAULT_LOCALE, 'text00.mp3')
+    assert locale.voiceover_path('text02') is None
+
+
+def test_voiceover_durations_are_resolved_at_setup(root_dir):
+    locale = LocaleService().setup(root_dir, 'en')
+
+    for voiceover, path in locale.voiceovers.items():
+        assert locale.voiceover_duration(voiceover) == mp3_duration(path) > 0
+
+    assert locale.voiceover_duration('text02') is None
+
+
+def test_unknown_language_uses_default_voiceovers_and_source_text(root_dir):
+    """ Voiceovers fall back to the default locale, messages to the English source """
+
+    locale = LocaleService().setup(root_dir, 'xx')
+
+    assert set(locale.voiceovers) == {'text00', 'text01'}
+    assert locale._translation.gettext('Continue') == 'Continue'
+
+
+def test_translation_of_language(root_dir):
+    locale = LocaleService().setup(root_dir, 'de_AT')
+
+    assert locale._translation.gettext('Continue') == 'Fortsetzen'
+
+
+def test_without_speech_directory(tmp_path):
+    locale = LocaleService().setup(str(tmp_path), 'en')
+
+    assert locale.voiceovers == {}
+    assert locale.voiceover_path('text00') is None
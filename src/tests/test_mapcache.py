@@ -0,0 +1,78 @@
+""" Tests for the precompiled map cache """
+
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+import pytest
+import pytiled_parser
+
+from app.utils.mapcache import MapCache
+from tests.conftest import MAPS_DIR
+
+
+@pytest.fixture
+def map_file(tmp_path):
+    """ Copy of a map whose tileset paths still resolve """
+
+    path = tmp_path / 'maps' / 'map01.tmx'
+    path.parent.mkdir()
+    shutil.copy(os.path.join(MAPS_DIR, 'map01.tmx'), path)
+
+    # Tilesets and images are referenced relative to the maps directory
+    for entry in os.listdir(os.path.dirname(MAPS_DIR)):
+        if entry != 'maps':
+            (tmp_path / entry).symlink_to(os.path.join(os.path.dirname(MAPS_DIR), entry))
+
+    return str(path)
+
+
+def test_round_trip_equals_parse(map_file):
+    """ A compiled map loads equal to the parsed TMX """
+
+    MapCache.compile(map_file)
+
+    assert MapCache.load(map_file) == pytiled_parser.parse_map(Path(map_file).resolve())
+
+
+def test_outdated_cache_is_ignored(map_file):
+    """ A cache of another TMX version isn't used """
+
+    MapCache.compile(map_file)
+
+    with open(map_file, 'a', encoding='utf-8') as f:
+        f.write('\n')
+
+    assert MapCache.load(map_file) is None
+
+
+def test_read_without_cache_parses(map_file):
+    """ Without a cache the TMX is parsed """
+
+    assert not os.path.exists(MapCache.cache_path(map_file))
+    assert MapCache.read(map_file) == pytiled_parser.parse_map(Path(map_file).resolve())
+
+
+def test_cache_of_other_parser_version_is_ignored(map_file, monkeypatch):
+    """ Pickles written by another pytiled_parser version aren't read """
+
+    MapCache.compile(map_file)
+    monkeypatch.setattr(MapCache, 'parser_version', staticmethod(lambda: '0.0.0'))
+
+    assert MapCache.load(map_file) is None
+
+
+@pytest.mark.parametrize('error', [AttributeError, TypeError, ModuleNotFoundError])
+def test_unreadable_pickle_falls_back_to_parse(map_file, monkeypatch, error):
+    """ A pickle which doesn't match the current classes is parsed again """
+
+    MapCache.compile(map_file)
+
+    def loads(_data):
+        raise error('changed class')
+
+    monkeypatch.setattr(pickle, 'loads', loads)
+
+    assert MapCache.load(map_file) is None
+    assert MapCache.read(map_file) == pytiled_parser.parse_map(Path(map_file).resolve())
@@ -0,0 +1,80 @@
+""" Tests for the vectorized particle system """
+
+import numpy
+
+from app.utils.particlesystem import ParticleSystem, COLUMN_X, COLUMN_Y, COLUMN_RADIUS, COLUMNS_COLOR
+
+AREA = (0, 1000, 100, 200)
+RESPAWN_Y = (500, 600)
+COLORS = [(255, 255, 255, 80), (255, 0, 0, 255)]
+
+
+def particles(count: int = 200, velocity: tuple = (-5.0, 0.0)) -> ParticleSystem:
+    """ Particle system spawned in the test area """
+
+    return ParticleSystem().setup(
+        count=count,
+        area=AREA,
+        radius=(1, 6),
+        colors=COLORS,
+        velocity=velocity,
+        respawn_y=RESPAWN_Y
+    )
+
+
+def test_spawn_in_area(window):
+    """ Particles start inside the area with a radius and color from the ranges """
+
+    system = particles()
+    data = system._data
+    left, right, bottom, top = AREA
+
+    assert len(system) == 200
+    assert numpy.all((data[:, COLUMN_X] >= left) & (data[:, COLUMN_X] <= right))
+    assert numpy.all((data[:, COLUMN_Y] >= bottom) & (data[:, COLUMN_Y] <= top))
+    assert numpy.all((data[:, COLUMN_RADIUS] >= 1) & (data[:, COLUMN_RADIUS] <= 6))
+
+    colors = {tuple(color) for color in numpy.rint(data[:, COLUMNS_COLOR] * 255).astype(int)}
+
+    assert colors <= set(COLORS)
+
+
+def test_update_moves_all_particles(window):
+    """ Every particle moves by the velocity """
+
+    system = particles(velocity=(-1.0, 2.0))
+    system._data[:, COLUMN_X] = 500
+    before = system._data.copy()
+
+    system.update()
+
+    assert numpy.all(system._data[:, COLUMN_X] == before[:, COLUMN_X] - 1)
+    assert numpy.all(system._data[:, COLUMN_Y] == before[:, COLUMN_Y] + 2)
+
+
+def test_particles_leaving_left_respawn_right(window):
+    """ Particles fully past the left edge reappear at the respawn position """
+
+    system = particles(count=3)
+    system._data[:, COLUMN_RADIUS] = 2
+    system._data[:, COLUMN_X] = (1, 6, 500)
+    system.respawn_x = 800
+
+    system.update()
+
+    x, y = system._data[:, COLUMN_X], system._data[:, COLUMN_Y]
+
+    assert list(x) == [802, 1, 495]
+    assert RESPAWN_Y[0] <= y[0] <= RESPAWN_Y[1]
+
+
+def test_setup_again_keeps_buffer(window):
+    """ Setting up the same count again reuses the GPU buffer """
+
+    system = particles()
+    buffer = system._buffer
+
+    system.setup(count=200, area=AREA, radius=(1, 6), colors=COLORS)
+    system.draw()
+
+    assert system._buffer is buffer
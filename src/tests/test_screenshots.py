@@ -0,0 +1,60 @@
+""" Tests for the screenshot worker """
+
+import os
+import time
+
+import pytest
+
+from app.constants.settings import SETTINGS_DEFAULT_SCREENSHOT_FORMAT
+from app.utils.screenshots import Screenshots
+
+SIZE = (4, 2)
+PIXELS = bytes(SIZE[0] * SIZE[1] * 3)
+
+
+@pytest.fixture
+def screenshots(tmp_path):
+    screenshots = Screenshots().setup(str(tmp_path), queue_size=2)
+    yield screenshots
+    screenshots.unsetup()
+
+
+def queue_job(screenshots: Screenshots, filename: str, data: bytes = PIXELS) -> None:
+    """ Queue a capture like the main thread does """
+
+    screenshots._queue.put((filename, SIZE, data, time.time()), timeout=1)
+
+
+def test_unknown_format_falls_back_to_default(tmp_path):
+    screenshots = Screenshots().setup(str(tmp_path), image_format='bmp')
+
+    assert screenshots._image_format == SETTINGS_DEFAULT_SCREENSHOT_FORMAT
+
+    screenshots.unsetup()
+
+
+def test_broken_job_keeps_worker_alive(screenshots, tmp_path):
+    """ A failing encode is logged, later screenshots are still written """
+
+    queue_job(screenshots, str(tmp_path / 'broken.jpg'), data=b'')
+    queue_job(screenshots, str(tmp_path / 'good.jpg'))
+
+    screenshots.unsetup()
+
+    assert not os.path.exists(tmp_path / 'broken.jpg')
+    assert os.path.exists(tmp_path / 'good.jpg')
+
+
+def test_unsetup_returns_with_dead_worker(screenshots, tmp_path):
+    """ Shutdown doesn't block on a full queue when the worker is gone """
+
+    screenshots._queue.put(None)
+    screenshots._worker.join(timeout=1)
+
+    queue_job(screenshots, str(tmp_path / 'a.jpg'))
+    queue_job(screenshots, str(tmp_path / 'b.jpg'))
+
+    start = time.time()
+    screenshots.unsetup()
+
+    assert time.time() - start < 1
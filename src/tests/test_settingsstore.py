@@ -0,0 +1,81 @@
+""" Tests for the settings store """
+
+import json
+
+from app.utils.settingsstore import SettingsStore, SETTINGS_STORE_VERSION
+
+
+def test_defaults_are_stored(tmp_path):
+    """ Missing settings get their defaults and are saved """
+
+    path = str(tmp_path / 'settings.json')
+    store = SettingsStore().setup(path)
+
+    assert store.defaults({'fullscreen': True, 'size': '1280x720'}) == {'fullscreen': True, 'size': '1280x720'}
+    assert store.save()
+
+    assert SettingsStore().setup(path).get('size') == '1280x720'
+
+
+def test_set_and_reload(tmp_path):
+    """ Saved settings are read again """
+
+    path = str(tmp_path / 'config' / 'settings.json')
+    store = SettingsStore().setup(path)
+    store.set('volume_music', 40)
+    store.save()
+
+    assert SettingsStore().setup(path).defaults({'volume_music': 80}) == {'volume_music': 40}
+
+
+def test_invalid_type_falls_back_to_default(tmp_path):
+    """ Settings of another type than their default are ignored """
+
+    path = tmp_path / 'settings.json'
+    path.write_text(json.dumps({'version': SETTINGS_STORE_VERSION, 'settings': {'volume_music': 'loud'}}))
+
+    assert SettingsStore().setup(str(path)).get('volume_music', 80) == 80
+
+
+def test_unreadable_file_is_replaced(tmp_path):
+    """ A broken or outdated file is read as empty """
+
+    path = tmp_path / 'settings.json'
+    path.write_text('{')
+
+    store = SettingsStore().setup(str(path))
+
+    assert store.get('size') is None
+
+    path.write_text(json.dumps({'version': SETTINGS_STORE_VERSION + 1, 'settings': {'size': '800x600'}}))
+
+    assert SettingsStore().setup(str(path)).get('size') is None
+
+
+def test_probes_are_bound_to_fingerprint(tmp_path):
+    """ Probes made on another system aren't used """
+
+    path = str(tmp_path / 'settings.json')
+    store = SettingsStore().setup(path, fingerprint='gpu-a')
+    store.probes = {'update_rate': 144}
+    store.save()
+
+    assert SettingsStore().setup(path, fingerprint='gpu-a').probes == {'update_rate': 144}
+    assert SettingsStore().setup(path, fingerprint='gpu-b').probes == {}
+
+
+def test_save_is_skipped_without_changes(tmp_path):
+    """ An unchanged store doesn't write """
+
+    path = tmp_path / 'settings.json'
+    store = SettingsStore().setup(str(path))
+    store.set('size', '1280x720')
+    store.save()
+    mtime = path.stat().st_mtime_ns
+
+    store.set('size', '1280x720')
+    store.save()
+
+    assert SettingsStore().setup(str(path)).save()
+    assert path.stat().st_mtime_ns == mtime
+    assert not list(tmp_path.glob('*.tmp'))
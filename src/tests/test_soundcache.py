@@ -0,0 +1,111 @@
+""" Tests for the sound cache """
+
+from types import SimpleNamespace
+
+import arcade
+import pytest
+
+from app.constants.audio import AUDIO_SFX, AUDIO_ATMO
+from app.utils.soundcache import SoundCache, MEGABYTE
+
+# Decoded sizes of the fake sounds in megabytes
+SIZES = {}
+
+
+class FakeSound:
+    """ Decoded sound of a given size """
+
+    def __init__(self, path: str, streaming: bool = False):
+        """ Constructor """
+
+        self.path = path
+        self.streaming = streaming
+        self.source = SimpleNamespace(
+            duration=SIZES.get(path, 0),
+            audio_format=SimpleNamespace(bytes_per_second=MEGABYTE)
+        )
+
+
+@pytest.fixture(autouse=True)
+def fake_sounds(monkeypatch):
+    """ Sounds are sized by SIZES in megabytes instead of decoded """
+
+    monkeypatch.setattr(arcade, 'load_sound', FakeSound)
+    SIZES.clear()
+
+
+def cache(budget: int = 64 * MEGABYTE, streaming: bool = False) -> SoundCache:
+    """ Sound cache which decides by the category of the sounds only """
+
+    sounds = SoundCache(budget)
+    sounds.policy.setup(streaming=streaming)
+
+    return sounds
+
+
+def test_load_reuses_sound():
+    """ A static sound is decoded once """
+
+    sounds = cache()
+    SIZES['a.mp3'] = 1
+
+    assert sounds.load('a.mp3', streaming=False) is sounds.load('a.mp3', streaming=False)
+    assert len(sounds) == 1
+    assert sounds.size == MEGABYTE
+
+
+def test_streaming_sounds_are_not_cached():
+    """ Every load of a streaming sound opens it again """
+
+    sounds = cache()
+
+    assert sounds.load('a.mp3', streaming=True) is not sounds.load('a.mp3', streaming=True)
+    assert len(sounds) == 0
+
+
+def test_least_recently_used_is_evicted():
+    """ The least recently used sound is evicted when the budget is exceeded """
+
+    sounds = cache(budget=5 * MEGABYTE)
+    SIZES.update({'a.mp3': 2, 'b.mp3': 2, 'c.mp3': 2})
+
+    a = sounds.load('a.mp3', streaming=False)
+    sounds.load('b.mp3', streaming=False)
+    assert sounds.load('a.mp3', streaming=False) is a
+
+    sounds.load('c.mp3', streaming=False)
+
+    assert len(sounds) == 2
+    assert sounds.size == 4 * MEGABYTE
+    assert sounds.load('a.mp3', streaming=False) is a
+
+
+def test_category_budget(monkeypatch):
+    """ Sounds of a category are evicted when they exceed its budget only """
+
+    sounds = cache(streaming=True)
+    monkeypatch.setattr(sounds.policy, 'streaming', lambda path, category: False)
+    SIZES.update({'sfx1.mp3': 3, 'sfx2.mp3': 3, 'sfx3.mp3': 3, 'atmo.mp3': 4})
+
+    for path in ('sfx1.mp3', 'sfx2.mp3', 'sfx3.mp3'):
+        sounds.load(path, AUDIO_SFX)
+
+    sounds.load('atmo.mp3', AUDIO_ATMO)
+
+    assert sounds.category_size(AUDIO_SFX) <= sounds.policy.budget(AUDIO_SFX)
+    assert sounds.category_size(AUDIO_SFX) == 6 * MEGABYTE
+    assert sounds.category_size(AUDIO_ATMO) == 4 * MEGABYTE
+    assert sounds.size == 10 * MEGABYTE
+
+
+def test_clear():
+    """ Clearing empties the cache """
+
+    sounds = cache()
+    SIZES['a.mp3'] = 1
+    sounds.load('a.mp3', streaming=False)
+
+    sounds.clear()
+
+    assert len(sounds) == 0
+    assert sounds.size == 0
@@ -0,0 +1,130 @@
+""" Tests for the startup profiler """
+
+import builtins
+import importlib
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.utils.startupprofiler import StartupProfiler
+from tests.conftest import ROOT_DIR
+
+# Modules imported where they are first used, not at startup
+DEFERRED_MODULES = [
+    'psutil',
+    'sounddevice',
+    'webbrowser',
+    'numpy',
+    'app.benchmark',
+    'app.budgetcheck',
+    'app.views.game',
+    'app.views.mainmenu',
+]
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    """ Two new modules, the outer one imports the inner one """
+
+    (tmp_path / 'profiled_inner.py').write_text('VALUE = 1\n', encoding='utf-8')
+    (tmp_path / 'profiled_outer.py').write_text('import profiled_inner\n', encoding='utf-8')
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    importlib.invalidate_caches()
+
+    yield
+
+    for name in ('profiled_inner', 'profiled_outer'):
+        sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def profiler():
+    profiler = StartupProfiler().setup(enabled=True)
+
+    yield profiler
+
+    profiler.finish()
+
+
+def test_imports_are_recorded_with_nesting(modules, profiler):
+    """ New modules are reported with their own time and their depth """
+
+    import profiled_outer  # noqa: F401
+    import json  # noqa: F401,F811
+
+    imports = {module['module']: module for module in profiler.report()['imports']}
+
+    assert set(imports) == {'profiled_outer', 'profiled_inner'}
+    assert imports['profiled_outer']['depth'] == 0
+    assert imports['profiled_inner']['depth'] == 1
+    assert imports['profiled_outer']['total_ms'] >= imports['profiled_inner']['total_ms']
+    assert imports['profiled_outer']['self_ms'] <= imports['profiled_outer']['total_ms']
+
+
+def test_finish_restores_import(modules):
+    """ After the first frame imports aren't recorded anymore """
+
+    original = builtins.__import__
+    profiler = StartupProfiler().setup(enabled=True)
+
+    assert builtins.__import__ is not original
+
+    report = profiler.finish()
+
+    assert builtins.__import__ is original
+    assert profiler.finish() is None
+
+    import profiled_outer  # noqa: F401
+
+    assert profiler.report()['imports_count'] == report['imports_count'] == 0
+
+
+def test_disabled_profiler_records_phases_only(modules):
+    profiler = StartupProfiler().setup()
+
+    with profiler.phase('window'):
+        import profiled_outer  # noqa: F401
+
+    report = profiler.finish()
+
+    assert [phase['phase'] for phase in report['phases']] == ['window']
+    assert report['imports'] == []
+
+
+@pytest.mark.parametrize('name, package, fromlist, level, module', [
+    ('os', None, (), 0, 'os'),
+    ('string', 'app.utils', (), 1, 'app.utils.string'),
+    ('layers', 'app.utils', (), 2, 'app.layers'),
+    ('', 'app.utils', ('string', 'level'), 1, 'app.utils.string,level'),
+])
+def test_module_name(name, package, fromlist, level, module):
+    assert StartupProfiler.module_name(name, {'__package__': package}, fromlist, level) == module
+
+
+def test_save(tmp_path):
+    report = StartupProfiler().report()
+
+    filename = StartupProfiler.save(report, str(tmp_path / 'reports'))
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        assert json.load(f) == report
+
+
+def test_startup_defers_imports():
+    """ Importing the startup module doesn't load the deferred modules """
+
+    code = f"import sys, app.startup; print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=ROOT_DIR,
+        env={**os.environ, 'ARCADE_HEADLESS': '1'},
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    assert result.stdout.strip() == ''
@@ -0,0 +1,94 @@
+""" Tests for the subtitles """
+
+import json
+import os
+import shutil
+
+import arcade
+import pytest
+
+from app.utils.subtitles import SubtitleTrack, Subtitles, SUBTITLES_FILE, SUBTITLES_VERSION
+from tests.conftest import ROOT_DIR, SPEECH_DIR
+
+
+def test_cues_split_duration_by_characters():
+    """ Every line gets a share of the duration by its length """
+
+    cues = SubtitleTrack.cues(['aaa', '', ' b ', 'cccc'], 8.0)
+
+    assert cues == [[0.0, 3.0, 'aaa'], [3.0, 4.0, 'b'], [4.0, 8.0, 'cccc']]
+
+
+def test_build_and_load(tmp_path):
+    """ Compiled cues end at the length of the voiceover """
+
+    directory = tmp_path / 'de'
+    directory.mkdir()
+
+    for name in ('text00.txt', 'text00.mp3'):
+        shutil.copy(os.path.join(SPEECH_DIR, 'de', name), directory / name)
+
+    # Texts without voiceover are skipped
+    (directory / 'text99.txt').write_text('Nothing to say', encoding='utf-8')
+
+    SubtitleTrack.build(str(directory))
+    track = SubtitleTrack.load(str(tmp_path), ['de'])
+
+    assert list(track) == ['text00']
+    assert track['text00'][-1][1] == pytest.approx(20.7, abs=0.1)
+
+
+def test_load_falls_back_by_language(tmp_path):
+    """ The first language of the chain wins, outdated files are skipped """
+
+    for language, cues in (('en', {'a': [[0, 1, 'en']], 'b': [[0, 1, 'en']]}), ('de', {'a': [[0, 1, 'de']]})):
+        (tmp_path / language).mkdir()
+        (tmp_path / language / SUBTITLES_FILE).write_text(
+            json.dumps({'version': SUBTITLES_VERSION, 'cues': cues}),
+            encoding='utf-8'
+        )
+
+    (tmp_path / 'fr').mkdir()
+    (tmp_path / 'fr' / SUBTITLES_FILE).write_text(
+        json.dumps({'version': SUBTITLES_VERSION - 1, 'cues': {'a': [[0, 1, 'fr']]}}),
+        encoding='utf-8'
+    )
+
+    track = SubtitleTrack.load(str(tmp_path), ['fr', 'de', 'en'])
+
+    assert track == {'a': [[0, 1, 'de']], 'b': [[0, 1, 'en']]}
+
+
+def test_cue_at_media_time(window):
+    """ The cue shown at a media time, none in gaps and after the end """
+
+    subtitles = Subtitles().setup(ROOT_DIR, ['de'])
+    end = SubtitleTrack.load(SPEECH_DIR, ['de'])['text00'][-1][1]
+
+    assert subtitles.cue('text00', 0.0) == 0
+    assert subtitles.cue('text00', 5.0) == 1
+    assert subtitles.cue('text00', end) is None
+    assert subtitles.cue('unknown', 1.0) is None
+    assert subtitles.cue(None, 1.0) is None
+
+
+def test_cues_are_rendered_at_setup(window, monkeypatch):
+    """ Playback only swaps the prerendered sprites, a resize re-anchors them """
+
+    subtitles = Subtitles().setup(ROOT_DIR, ['de'])
+
+    def render(*_args, **_kwargs):
+        raise AssertionError('Rendered during playback')
+
+    monkeypatch.setattr(arcade, 'create_text_sprite', render)
+
+    subtitles.update('text00', 5.0)
+    sprite = subtitles._current
+    subtitles.update(None, 0.0)
+    subtitles.update('text00', 5.0)
+
+    assert subtitles._current is sprite
+
+    subtitles.on_resize(1920, 1080)
+
+    assert sprite.center_x == 960
@@ -0,0 +1,75 @@
+""" Tests for the tile classifier """
+
+import os
+
+import arcade
+import PIL.Image
+import pytest
+
+from app.constants.layers import LAYER_BUSH, LAYER_WALL, LAYERS_DYNAMIC
+from app.utils.mapcache import MapCache
+from app.utils.tileclassifier import TileClassifier, ROLE_NONE, ROLE_RENDER, ROLE_COLLIDE, ROLE_BOTH
+from tests.conftest import MAPS_DIR
+
+
+@pytest.fixture
+def tilemap(window):
+    """ Freshly loaded first map, stripping changes its sprite lists """
+
+    return arcade.TileMap(tiled_map=MapCache.read(os.path.join(MAPS_DIR, 'map01.tmx')), lazy=True)
+
+
+def sprite_with_alpha(alpha: int) -> arcade.Sprite:
+    """ Tile sprite with a uniform alpha """
+
+    image = PIL.Image.new('RGBA', (4, 4), (255, 255, 255, alpha))
+
+    return arcade.Sprite(arcade.Texture(image, hash=f"alpha-{alpha}"))
+
+
+@pytest.mark.parametrize('alpha, visible, collides, role', [
+    (255, True, False, ROLE_RENDER),
+    (255, True, True, ROLE_BOTH),
+    (255, False, True, ROLE_COLLIDE),
+    (0, True, True, ROLE_COLLIDE),
+    (0, True, False, ROLE_NONE),
+])
+def test_classify(window, alpha, visible, collides, role):
+    assert TileClassifier().classify(sprite_with_alpha(alpha), visible, collides) == role
+
+
+def test_strip_keeps_excluded_hidden_bushes(tilemap):
+    """ The hidden bush layer is faded in by its effect and must survive stripping """
+
+    bushes = list(tilemap.sprite_lists[LAYER_BUSH])
+
+    classifier = TileClassifier().strip(tilemap, collide_layers=[LAYER_WALL], exclude=[*LAYERS_DYNAMIC, LAYER_BUSH])
+
+    assert bushes
+    assert list(tilemap.sprite_lists[LAYER_BUSH]) == bushes
+    assert LAYER_BUSH not in classifier.report
+
+
+def test_strip_removes_hidden_layer(tilemap):
+    """ A hidden layer which isn't excluded loses all sprites without saving draw calls """
+
+    count = len(tilemap.sprite_lists[LAYER_BUSH])
+
+    classifier = TileClassifier().strip(tilemap, collide_layers=[LAYER_WALL], exclude=LAYERS_DYNAMIC)
+
+    assert len(tilemap.sprite_lists[LAYER_BUSH]) == 0
+    assert classifier.report[LAYER_BUSH]['sprites'] == count
+    assert classifier.report[LAYER_BUSH]['draw_calls'] == 0
+
+
+def test_strip_keeps_collide_only_walls(tilemap):
+    """ Wall tiles which aren't drawn are kept aside for collisions """
+
+    walls = set(tilemap.sprite_lists[LAYER_WALL])
+
+    classifier = TileClassifier().strip(tilemap, collide_layers=[LAYER_WALL], exclude=LAYERS_DYNAMIC)
+    remaining = set(tilemap.sprite_lists[LAYER_WALL])
+    collide_only = set(classifier.collide_only.get(LAYER_WALL, []))
+
+    assert remaining | collide_only == walls
+    assert not remaining & collide_only
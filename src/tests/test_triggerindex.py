@@ -0,0 +1,58 @@
+""" Tests for the trigger index """
+
+import arcade
+
+from app.utils.triggerindex import TriggerIndex
+
+CELL_WIDTH = 100
+
+
+def sprite_at(x: float) -> arcade.Sprite:
+    """ Sprite centered at x """
+
+    sprite = arcade.SpriteSolidColor(10, 10, color=arcade.color.WHITE)
+    sprite.center_x = x
+
+    return sprite
+
+
+def test_nearby_returns_adjacent_columns_only():
+    """ Triggers in the column of the sprite and its neighbours are found """
+
+    index = TriggerIndex(CELL_WIDTH)
+    near = [sprite_at(x) for x in (50, 150, 250)]
+    far = sprite_at(450)
+
+    for sprite in [*near, far]:
+        index.add('light', sprite)
+
+    found = [trigger for _layer, trigger in index.nearby(sprite_at(150))]
+
+    assert found == near
+    assert len(index) == 4
+
+
+def test_nearby_orders_by_priority():
+    """ Triggers of layers with a lower priority come first """
+
+    index = TriggerIndex(CELL_WIDTH)
+    first = sprite_at(160)
+    second = sprite_at(140)
+
+    index.add('random', second, priority=1)
+    index.add('first', first, priority=0)
+
+    assert index.nearby(sprite_at(150)) == [('first', first), ('random', second)]
+
+
+def test_remove():
+    """ Removed triggers aren't found anymore """
+
+    index = TriggerIndex(CELL_WIDTH)
+    sprite = sprite_at(150)
+
+    index.add('light', sprite)
+    index.remove(sprite)
+
+    assert not index.nearby(sprite)
+    assert len(index) == 0